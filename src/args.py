@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import sys
 from typing import List, Optional, Tuple
 
@@ -719,6 +720,18 @@ def build_root_parser() -> Tuple[argparse.ArgumentParser, argparse._SubParsersAc
     return parser, subparsers
 
 
+@functools.lru_cache(maxsize=1)
+def _get_root_parser() -> argparse.ArgumentParser:
+    """Return the root parser, building it only once per process.
+
+    argparse parsers are not mutated by parse_args, so the grammar can be shared
+    across calls. Callers that need to customize a parser should use
+    build_root_parser() to get a fresh instance.
+    """
+    parser, _ = build_root_parser()
+    return parser
+
+
 def _is_legacy_invocation(argv: List[str]) -> bool:
     """Return True when args look like the legacy form (no action, options first)."""
     if not argv:
@@ -740,7 +753,7 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     """
     if argv is None:
         argv = sys.argv[1:]
-    parser, _ = build_root_parser()
+    parser = _get_root_parser()
 
     legacy = _is_legacy_invocation(argv)
     if legacy:
@@ -0,0 +1,133 @@
+"""Shared helpers for parsing manifest and lockfile files.
+
+Scanners import these instead of each carrying its own copy of the optional
+JSON/XML accelerator fallbacks or the stat-keyed parse cache.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import IO, Any, Callable, Iterator, Optional, Sequence, Tuple, TypeVar, Union
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional accelerator; stdlib json is always available
+    _orjson = None
+
+try:
+    import jiter as _jiter
+except ImportError:  # optional accelerator; stdlib json is always available
+    _jiter = None
+
+try:  # Optional faster XML parser; the stdlib ElementTree is used when absent
+    from lxml import etree as _lxml_etree
+except ImportError:  # pragma: no cover - depends on environment
+    _lxml_etree = None
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON document from raw bytes.
+
+    Prefers orjson, then jiter (package names repeat heavily as keys in
+    lockfiles, so its key cache cuts allocations), then json.loads. Both
+    accelerators take bytes directly, so no separate UTF-8 decode is needed.
+    All of them raise ValueError on malformed input.
+    """
+    if _orjson is not None:
+        return _orjson.loads(data)
+    if _jiter is not None:
+        return _jiter.from_json(data, cache_mode="keys")
+    return json.loads(data)
+
+
+def iterparse_xml(
+    source: Union[str, IO[bytes]], events: Sequence[str], tag: Optional[str] = None
+) -> Iterator[Tuple[str, Any]]:
+    """Stream (event, element) pairs for an XML file path or binary file object.
+
+    Uses lxml when it is installed (entity resolution and network access
+    disabled) and falls back to ElementTree otherwise. lxml syntax errors are
+    re-raised as ET.ParseError so callers handle a single exception type.
+
+    Args:
+        source: File path or binary file object
+        events: iterparse events to report, e.g. ("start", "end")
+        tag: Optional local name; lxml then only reports matching elements
+            (in any namespace). ElementTree reports every element, so callers
+            still check tags themselves.
+    """
+    if _lxml_etree is not None:
+        kwargs = {"tag": "{*}" + tag} if tag else {}
+        try:
+            yield from _lxml_etree.iterparse(
+                source, events=events, resolve_entities=False, no_network=True, **kwargs
+            )
+        except _lxml_etree.XMLSyntaxError as e:
+            raise ET.ParseError(str(e)) from e
+        return
+    yield from ET.iterparse(source, events=events)
+
+
+def stat_cached(maxsize: int = 256, open_file: bool = False) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Memoize a file parser ``fn(path, *args)`` per (absolute path, st_mtime_ns, st_size, args).
+
+    The path is made absolute first, so relative and absolute spellings of one
+    file share an entry and a later chdir cannot alias another file. An edited
+    file is re-parsed, while long-lived processes (MCP server) skip unchanged
+    ones. The path is stat'ed on every call and an OSError from that
+    propagates. Exceptions raised by the parser are never cached, so a broken
+    file is re-read and reported each time. Cached results are shared between
+    callers and must be treated as read-only (return tuples, not lists). The
+    least recently used entry is evicted past *maxsize*.
+
+    With ``open_file=True`` the file is opened once in binary mode and fstat'ed
+    for the key; on a miss ``fn`` receives that open handle instead of the
+    path, so it is not opened twice. File objects passed in have no stable
+    identity to key on and go straight to ``fn``.
+    """
+    def decorate(fn: Callable[..., T]) -> Callable[..., T]:
+        cache: "OrderedDict[tuple, T]" = OrderedDict()
+        lock = threading.Lock()
+
+        def lookup(key: tuple) -> Any:
+            with lock:
+                result = cache.get(key, _MISSING)
+                if result is not _MISSING:
+                    cache.move_to_end(key)
+            return result
+
+        def store(key: tuple, result: T) -> T:
+            with lock:
+                cache[key] = result
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return result
+
+        @functools.wraps(fn)
+        def wrapper(path: Union[str, IO[bytes]], *args: Any) -> T:
+            if open_file and hasattr(path, "read"):
+                return fn(path, *args)
+            path = os.path.abspath(path)
+            if not open_file:
+                st = os.stat(path)
+                key = (path, st.st_mtime_ns, st.st_size, args)
+                result = lookup(key)
+                return store(key, fn(path, *args)) if result is _MISSING else result
+            with open(path, "rb") as f:
+                st = os.fstat(f.fileno())
+                key = (path, st.st_mtime_ns, st.st_size, args)
+                result = lookup(key)
+                return store(key, fn(f, *args)) if result is _MISSING else result
+
+        wrapper.cache_clear = cache.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate
@@ -8,6 +8,29 @@ class MetaPackage:  # pylint: disable=too-many-instance-attributes, too-many-pub
     """
     instances = []
 
+    # Fixed per-instance fields live in slots; __dict__ is kept for ad-hoc attributes
+    # attached later (policy_decision, license_id, ...).
+    __slots__ = (
+        "_pkg_name", "_org_id", "_exists", "_pkg_type", "_score", "_timestamp", "_version_count",
+        "_fork_count", "_subs_count", "_star_count", "_contributor_count", "_download_count",
+        "_weekly_downloads", "_issue_count", "_author", "_author_email", "_publisher", "_publisher_email",
+        "_maintainer", "_maintainer_email", "_dependencies", "_risk_missing", "_risk_low_score",
+        "_risk_min_versions", "_risk_too_new", "_risk_score_decrease", "_risk_provenance_regression",
+        "_risk_registry_signature_regression", "_repo_present_in_registry", "_repo_resolved",
+        "_repo_url_normalized", "_repo_host", "_repo_exists", "_repo_last_activity_at", "_repo_stars",
+        "_repo_contributors", "_repo_forks", "_repo_open_issues", "_repo_open_prs", "_repo_last_commit_at",
+        "_repo_last_merged_pr_at", "_repo_last_closed_issue_at", "_repo_version_match", "_provenance",
+        "_repo_errors", "_registry_signature_present", "_previous_registry_signature_present",
+        "_registry_signature_regressed", "_provenance_present", "_provenance_url", "_provenance_source",
+        "_previous_provenance_present", "_provenance_regressed", "_trust_score", "_previous_trust_score",
+        "_trust_score_delta", "_trust_score_decreased", "_release_age_days", "_previous_release_version",
+        "_checksums_present", "_previous_checksums_present", "_requested_spec", "_resolved_version",
+        "_resolution_mode", "_dependency_relation", "_dependency_requirement", "_dependency_scope",
+        "_osm_checked", "_osm_malicious", "_osm_reason", "_osm_threat_count", "_osm_severity",
+        "_unsat_exact_decay",
+        "__dict__",
+    )
+
     def __init__(self, pkgname, pkgtype=None, pkgorg=None):
         self.instances.append(self)  # adding the instance to collective
         # Initialize defaults to ensure attributes are always present
@@ -6,16 +6,24 @@ import os
 import sys
 import logging
 import xml.etree.ElementTree as ET
-from typing import List
+from typing import Iterator, List, Set, Tuple
 
 from constants import ExitCodes, Constants
 from common import http_client
+from common.file_parsing import iterparse_xml, stat_cached
 from common.logging_utils import extra_context, is_debug_enabled, Timer, safe_url
 from .enrich import _enrich_with_repo
 
 
 logger = logging.getLogger(__name__)
 
+_POM_NS = "{http://maven.apache.org/POM/4.0.0}"
+_POM_DEPENDENCIES_TAG = f"{_POM_NS}dependencies"
+_POM_DEPENDENCY_TAG = f"{_POM_NS}dependency"
+# Dependency child tag -> slot in the [groupId, artifactId] pair
+_POM_DEPENDENCY_FIELDS = {f"{_POM_NS}groupId": 0, f"{_POM_NS}artifactId": 1}
+_POM_EVENTS = ("start", "end")
+
 
 def recv_pkg_info(pkgs, url: str = Constants.REGISTRY_URL_MAVEN) -> None:
     """Check the existence of the packages in the Maven registry.
@@ -127,6 +135,42 @@ def recv_pkg_info(pkgs, url: str = Constants.REGISTRY_URL_MAVEN) -> None:
                 pass
 
 
+def _iter_pom_coordinates(pom_path: str) -> Iterator[str]:
+    """Yield "group:artifact" for each dependency declared in a POM file.
+
+    The file is streamed: each <dependency> inside a <dependencies> block is
+    read at its end event and cleared, so memory does not grow with the POM.
+    Dependencies missing a groupId or artifactId (or with empty text) are skipped.
+    """
+    open_sections = 0  # currently open <dependencies> elements
+    for event, elem in iterparse_xml(pom_path, _POM_EVENTS):
+        tag = elem.tag
+        if tag == _POM_DEPENDENCIES_TAG:
+            open_sections += 1 if event == "start" else -1
+            continue
+        if event != "end" or tag != _POM_DEPENDENCY_TAG or not open_sections:
+            continue
+        # Single pass over the dependency's own children; nested
+        # <exclusion> coordinates never stand in for missing fields.
+        fields = [None, None]
+        for child in elem:
+            idx = _POM_DEPENDENCY_FIELDS.get(child.tag)
+            if idx is not None and fields[idx] is None:
+                fields[idx] = child.text
+        elem.clear()
+        group, artifact = fields
+        # The original code tolerated missing nodes; preserve behavior
+        if group is None or artifact is None:
+            continue
+        yield f"{group}:{artifact}"
+
+
+@stat_cached()
+def _pom_coordinates(pom_path: str) -> Tuple[str, ...]:
+    """Return the coordinates declared in a POM; unchanged POMs are served from cache."""
+    return tuple(_iter_pom_coordinates(pom_path))
+
+
 def scan_source(dir_name: str, recursive: bool = False, direct_only: bool = False, require_lockfile: bool = False) -> List[str]:  # pylint: disable=too-many-locals
     """Scan the source directory for pom.xml files.
 
@@ -156,24 +200,10 @@ def scan_source(dir_name: str, recursive: bool = False, direct_only: bool = Fals
                 logging.error("pom.xml not found. Unable to scan.")
                 sys.exit(ExitCodes.FILE_ERROR.value)
 
-        lister: List[str] = []
+        found: Set[str] = set()
         for pom_path in pom_files:
-            tree = ET.parse(pom_path)
-            pom = tree.getroot()
-            ns = ".//{http://maven.apache.org/POM/4.0.0}"
-            for dependencies in pom.findall(f"{ns}dependencies"):
-                for dependency in dependencies.findall(f"{ns}dependency"):
-                    # The original code tolerated missing nodes; preserve behavior
-                    group_node = dependency.find(f"{ns}groupId")
-                    if group_node is None or group_node.text is None:
-                        continue
-                    group = group_node.text
-                    artifact_node = dependency.find(f"{ns}artifactId")
-                    if artifact_node is None or artifact_node.text is None:
-                        continue
-                    artifact = artifact_node.text
-                    lister.append(f"{group}:{artifact}")
-        return list(set(lister))
+            found.update(_pom_coordinates(pom_path))
+        return list(found)
     except (FileNotFoundError, ET.ParseError) as e:
         logging.error("Couldn't import from given path, error: %s", e)
         # Preserve original behavior (no explicit exit here)
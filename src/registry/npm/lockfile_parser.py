@@ -6,15 +6,84 @@ from various npm lockfile formats.
 
 from __future__ import annotations
 
-import json
+import contextlib
+import io
 import logging
+import os
 import re
-from typing import List, Set
+import sys
+from typing import IO, Iterator, List, Set, Tuple, Union
+
+from common.file_parsing import json_loads, stat_cached
+
+# A lockfile location, or an already-open binary file object holding its contents
+LockfileSource = Union[str, os.PathLike[str], IO[bytes]]
+
+try:
+    from yarnlock import yarnlock_parse as _YARNLOCK_PARSE
+except ImportError:  # parse_yarn_lock falls back to _parse_yarn_lock_custom
+    _YARNLOCK_PARSE = None
+
+try:
+    import msgspec as _msgspec
+except ImportError:  # optional; package-lock.json then goes through ijson or a generic decode
+    _msgspec = None
+
+try:
+    import ijson as _ijson  # picks the fastest installed backend (yajl2_c when built)
+except ImportError:  # optional; package-lock.json is then decoded in full
+    _ijson = None
 
 
 logger = logging.getLogger(__name__)
 
 
+if _msgspec is not None:
+    class _PackageEntry(_msgspec.Struct):
+        """A lockfile v2/v3 ``packages`` entry; every other field is skipped while decoding."""
+        name: str | None = None
+
+    class _DependencyEntry(_msgspec.Struct):
+        """A lockfile ``dependencies`` entry (v1 tree, or the v2 compatibility copy)."""
+        version: str | None = None
+        resolved: str | None = None
+        dependencies: dict[str, _DependencyEntry] | None = None
+
+    class _PackageLock(_msgspec.Struct):
+        """Only the parts of package-lock.json that name packages."""
+        lockfileVersion: int = 1
+        packages: dict[str, _PackageEntry] = {}
+        dependencies: dict[str, _DependencyEntry] | None = None
+
+
+# package-lock.json prefix scanned for lockfileVersion before the full parse
+_LOCKFILE_PEEK_BYTES = 512
+_LOCKFILE_VERSION_RE = re.compile(rb'^\s*\{[^{]*?"lockfileVersion"\s*:\s*(\d+)')
+
+# yarn.lock entry header: "package-name@version:" or "@scope/package-name@version:", optionally quoted
+_YARN_ENTRY_RE = re.compile(r'"?(@[^/@"\s]+/[^@"\s]+|[^@"\s][^@"\s]*)@')
+
+# Characters that can change the JSONC comment scanner's state; everything between them is copied as-is
+_JSONC_SPECIAL_RE = re.compile(r'["/]')
+# Remainder of a string literal after its opening quote, stepping over backslash escapes
+_JSON_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Trailing comma before a closing bracket; string-unaware, so only safe when every match spans a newline
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+# A trailing comma with no newline before its bracket: the only kind that could sit inside a
+# string literal, since JSON strings cannot contain a raw newline
+_INLINE_TRAILING_COMMA_RE = re.compile(r',[^\S\n]*[}\]]')
+# A whole string literal (kept via \1) or a trailing comma (dropped, \2 kept); slower, string-aware
+_TRAILING_COMMA_OR_STRING_RE = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*")|,(\s*[}\]])')
+
+
+def _strip_trailing_commas(content: str) -> str:
+    """Drop commas directly before a closing bracket/brace, leaving string values untouched."""
+    if _INLINE_TRAILING_COMMA_RE.search(content):
+        # A ",]" on one line might be inside a string value; step over strings while removing
+        return _TRAILING_COMMA_OR_STRING_RE.sub(r"\1\2", content)
+    return _TRAILING_COMMA_RE.sub(r"\1", content)
+
+
 def _strip_jsonc_comments(content: str) -> str:
     """Strip comments from JSONC (JSON with comments) content.
 
@@ -23,256 +92,407 @@ def _strip_jsonc_comments(content: str) -> str:
     - Multi-line comments (/* ... */)
     - Trailing commas before closing brackets/braces
 
+    Comments are removed in one left-to-right scan that skips string literals
+    whole (including escaped quotes), so comment markers inside strings such as
+    URLs are preserved. Trailing commas then go in a single regex substitution;
+    it only has to step over strings when a comma and its bracket share a line.
+
     Args:
         content: JSONC string content
 
     Returns:
         JSON string with comments removed
     """
-    # Remove single-line comments
-    content = re.sub(r'//.*?$', '', content, flags=re.MULTILINE)
+    if "//" not in content and "/*" not in content:
+        # No comment markers at all (typical for generated bun.lock); skip the scan
+        return _strip_trailing_commas(content)
+
+    out: List[str] = []
+    n = len(content)
+    i = 0
+    copy_from = 0  # start of the span not yet appended to out
+
+    while True:
+        m = _JSONC_SPECIAL_RE.search(content, i)
+        if m is None:
+            break
+        j = m.start()
+        if content[j] == '"':
+            tail = _JSON_STRING_TAIL_RE.match(content, j + 1)
+            i = tail.end() if tail else n
+        elif content.startswith("//", j):
+            out.append(content[copy_from:j])
+            k = content.find("\n", j)
+            i = copy_from = n if k < 0 else k
+        elif content.startswith("/*", j):
+            out.append(content[copy_from:j])
+            k = content.find("*/", j + 2)
+            i = copy_from = n if k < 0 else k + 2
+        else:
+            i = j + 1
+
+    out.append(content[copy_from:])
+    return _strip_trailing_commas("".join(out))
+
+
+def _name_from_lock_path(pkg_path: str) -> str:
+    """Derive a package name from a lockfile ``packages`` key.
+
+    "node_modules/package-name" -> "package-name"
+    "node_modules/a/node_modules/@scope/package-name" -> "@scope/package-name"
+    """
+    # rpartition yields the tail after the last node_modules/ without building a list
+    name = pkg_path.rpartition("node_modules/")[2]
+    if name.count("/") == (1 if name.startswith("@") else 0):
+        return name
+    # Not a node_modules path (e.g. a workspace folder): use the last segment(s)
+    path_parts = pkg_path.split("/")
+    # Check if this is a scoped package (path ends with @scope/package-name)
+    if len(path_parts) >= 2 and path_parts[-2].startswith("@"):
+        return f"{path_parts[-2]}/{path_parts[-1]}"
+    return path_parts[-1]
+
+
+def _extract_from_deps(deps: dict, packages: Set[str], seen: Set | None = None) -> None:
+    """Recursively add package names from a nested ``dependencies`` map to packages.
+
+    seen holds the id() of every nested map already descended into, so a map
+    object reachable from several parents (or from itself) is walked once.
+    Keying on identity rather than name@version keeps npm v1 trees exact:
+    two copies of debug@2.0.0 may carry different nested dependencies.
+    """
+    if not isinstance(deps, dict):
+        return
+    if seen is None:
+        seen = set()
+    for pkg_name, pkg_info in deps.items():
+        if isinstance(pkg_info, dict):
+            packages.add(pkg_name)
+            nested = pkg_info.get("dependencies")
+            if nested is None or id(nested) in seen:
+                continue
+            seen.add(id(nested))
+            # Recurse into nested dependencies
+            _extract_from_deps(nested, packages, seen)
+
+
+def _collect_package_lock(data: dict) -> Set[str]:
+    """Collect package names from an already-decoded package-lock.json document."""
+    packages: Set[str] = set()
+    lockfile_version = data.get("lockfileVersion", 1)
+
+    if lockfile_version == 1:
+        # Version 1: Nested dependencies structure
+        if "dependencies" in data:
+            _extract_from_deps(data["dependencies"], packages)
+
+    elif lockfile_version in (2, 3):
+        # Version 2/3: Flat packages structure
+        if "packages" in data:
+            for pkg_path, pkg_info in data["packages"].items():
+                # Skip root package (empty path)
+                if not pkg_path:
+                    continue
+
+                if isinstance(pkg_info, dict):
+                    # Prefer "name" field if present
+                    if "name" in pkg_info:
+                        packages.add(pkg_info["name"])
+                    else:
+                        packages.add(_name_from_lock_path(pkg_path))
+
+        # Also check dependencies field if present (for backwards compatibility in v2)
+        if "dependencies" in data:
+            _extract_from_deps(data["dependencies"], packages)
+
+    return packages
+
+
+def _extract_from_dep_structs(deps: dict, packages: Set[str], seen: Set) -> None:
+    """_extract_from_deps for msgspec-decoded _DependencyEntry trees."""
+    for pkg_name, entry in deps.items():
+        packages.add(pkg_name)
+        if entry.dependencies is None or id(entry.dependencies) in seen:
+            continue
+        seen.add(id(entry.dependencies))
+        _extract_from_dep_structs(entry.dependencies, packages, seen)
+
+
+def _collect_package_lock_struct(lock: "_PackageLock") -> Set[str]:
+    """_collect_package_lock for a msgspec-decoded _PackageLock."""
+    packages: Set[str] = set()
+    if lock.lockfileVersion not in (1, 2, 3):
+        return packages
+    if lock.lockfileVersion != 1:
+        for pkg_path, entry in lock.packages.items():
+            # Skip root package (empty path)
+            if pkg_path:
+                packages.add(entry.name if entry.name is not None else _name_from_lock_path(pkg_path))
+    if lock.dependencies is not None:
+        _extract_from_dep_structs(lock.dependencies, packages, set())
+    return packages
+
+
+def _stream_package_lock(f) -> Set[str]:
+    """Collect package names from a package-lock.json file object in one streaming pass.
+
+    Walks ijson's basic_parse events with an explicit key stack instead of building
+    the document, so only the ``packages`` keys/``name`` fields and the ``dependencies``
+    tree keys are ever materialized. Produces the same set as _collect_package_lock.
+    """
+    lockfile_version = 1
+    from_packages: Set[str] = set()
+    from_deps: Set[str] = set()
+    # Key (or None for array slots) of every open container, root first
+    path: list = []
+    entry_path = None
+    entry_name = None
+
+    try:
+        for event, value in _ijson.basic_parse(f):
+            if event == "map_key":
+                path[-1] = value
+                continue
+            depth = len(path)
+            if event in ("start_map", "start_array"):
+                if event == "start_map" and depth >= 2 and path[0] is not None:
+                    if depth == 2 and path[0] == "packages" and path[1]:
+                        entry_path, entry_name = path[1], None
+                    elif depth % 2 == 0 and all(k == "dependencies" for k in path[0::2]):
+                        # dependencies.<name>[.dependencies.<name>...] is a package entry
+                        from_deps.add(path[-1])
+                path.append(None)
+            elif event in ("end_map", "end_array"):
+                path.pop()
+                if event == "end_map" and entry_path is not None and len(path) == 2 and path[0] == "packages":
+                    from_packages.add(entry_name if entry_name is not None else _name_from_lock_path(entry_path))
+                    entry_path = None
+            elif depth == 1 and path[0] == "lockfileVersion":
+                lockfile_version = value
+            elif depth == 3 and entry_path is not None and path[2] == "name":
+                entry_name = value
+    except _ijson.JSONError as e:
+        raise ValueError(str(e)) from e
+
+    if lockfile_version == 1:
+        return from_deps
+    if lockfile_version in (2, 3):
+        return from_packages | from_deps
+    return set()
+
+
+@contextlib.contextmanager
+def _open_lockfile(source: LockfileSource, binary: bool = True) -> Iterator[IO]:
+    """Open a lockfile path, or pass through a binary file object without closing it.
+
+    With binary=False a UTF-8 text stream is produced; a file object's bytes are
+    decoded into memory for that.
+    """
+    if hasattr(source, "read"):
+        yield source if binary else io.StringIO(source.read().decode("utf-8"))  # type: ignore[union-attr]
+    elif binary:
+        with open(source, "rb") as f:
+            yield f
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            yield f
+
 
-    # Remove multi-line comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
+_PARSE_CACHE_SIZE = 32
 
-    # Remove trailing commas (simple approach - remove comma before } or ])
-    content = re.sub(r',(\s*[}\]])', r'\1', content)
 
-    return content
+def _intern_names(names: List[str]) -> tuple:
+    """Return names as a tuple of interned strings (anything that is not a str is kept as-is).
+
+    The same packages recur across every lockfile of a multi-project scan, so
+    downstream consumers then share one object per name. str() turns a str
+    subclass, which sys.intern rejects, into a plain str; a plain str passes through.
+    """
+    return tuple(sys.intern(str(name)) if isinstance(name, str) else name for name in names)
 
 
-def parse_package_lock(lockfile_path: str) -> List[str]:
+def parse_package_lock(lockfile_path: LockfileSource) -> List[str]:
     """Extract all dependencies (direct + transitive) from package-lock.json.
 
-    Supports lockfileVersion 1, 2, and 3.
+    Supports lockfileVersion 1, 2, and 3. When msgspec is installed only the
+    fields that name packages are decoded; otherwise, with ijson installed, the
+    file is streamed rather than decoded into a full document.
 
     Args:
-        lockfile_path: Path to package-lock.json file
+        lockfile_path: Path to package-lock.json file, or a seekable binary file object
 
     Returns:
         List of all unique package names (direct + transitive)
     """
     try:
-        with open(lockfile_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        packages: Set[str] = set()
-        lockfile_version = data.get("lockfileVersion", 1)
-
-        if lockfile_version == 1:
-            # Version 1: Nested dependencies structure
-            def _extract_from_deps(deps: dict) -> None:
-                """Recursively extract package names from nested dependencies."""
-                if not isinstance(deps, dict):
-                    return
-                for pkg_name, pkg_info in deps.items():
-                    if isinstance(pkg_info, dict):
-                        packages.add(pkg_name)
-                        # Recurse into nested dependencies
-                        if "dependencies" in pkg_info:
-                            _extract_from_deps(pkg_info["dependencies"])
-
-            if "dependencies" in data:
-                _extract_from_deps(data["dependencies"])
-
-        elif lockfile_version in (2, 3):
-            # Version 2/3: Flat packages structure
-            if "packages" in data:
-                for pkg_path, pkg_info in data["packages"].items():
-                    # Skip root package (empty path)
-                    if not pkg_path:
-                        continue
-
-                    if isinstance(pkg_info, dict):
-                        # Prefer "name" field if present
-                        if "name" in pkg_info:
-                            packages.add(pkg_info["name"])
-                        else:
-                            # Extract package name from path (e.g., "node_modules/package-name" -> "package-name")
-                            # Handle scoped packages (e.g., "node_modules/@scope/package-name" -> "@scope/package-name")
-                            path_parts = pkg_path.split("/")
-                            if path_parts:  # Defensive check for empty list
-                                # Check if this is a scoped package (path ends with @scope/package-name)
-                                if len(path_parts) >= 2 and path_parts[-2].startswith("@"):
-                                    # Scoped package: "@scope/package-name"
-                                    packages.add(f"{path_parts[-2]}/{path_parts[-1]}")
-                                else:
-                                    # Regular package: "package-name"
-                                    packages.add(path_parts[-1])
-
-            # Also check dependencies field if present (for backwards compatibility in v2)
-            if "dependencies" in data:
-                def _extract_from_deps_v2(deps: dict) -> None:
-                    """Extract from v2 dependencies structure."""
-                    if not isinstance(deps, dict):
-                        return
-                    for pkg_name, pkg_info in deps.items():
-                        if isinstance(pkg_info, dict):
-                            packages.add(pkg_name)
-                            if "dependencies" in pkg_info:
-                                _extract_from_deps_v2(pkg_info["dependencies"])
-
-                _extract_from_deps_v2(data["dependencies"])
-
-        return sorted(list(packages))
-
-    except (FileNotFoundError, IOError, json.JSONDecodeError, KeyError) as e:
+        return list(_read_package_lock(lockfile_path))
+    except (FileNotFoundError, IOError, ValueError, KeyError) as e:
         logger.warning("Failed to parse package-lock.json: %s", e)
         return []
 
 
-def parse_yarn_lock(lockfile_path: str, package_json_path: str | None = None) -> List[str]:
+@stat_cached(maxsize=_PARSE_CACHE_SIZE, open_file=True)
+def _read_package_lock(lockfile_path: LockfileSource) -> Tuple[str, ...]:
+    """Body of parse_package_lock; raises instead of logging so failures are not cached."""
+    with _open_lockfile(lockfile_path) as f:
+        start = f.tell()
+        # npm writes lockfileVersion among the first top-level keys; an unsupported
+        # version yields no packages, so skip decoding the rest of the file
+        prefix = f.read(_LOCKFILE_PEEK_BYTES)
+        peeked = _LOCKFILE_VERSION_RE.search(prefix)
+        if peeked and int(peeked.group(1)) not in (1, 2, 3):
+            return ()
+        if _msgspec is not None:
+            data = prefix + f.read()
+            try:
+                packages = _collect_package_lock_struct(_msgspec.json.decode(data, type=_PackageLock))
+            except _msgspec.ValidationError:
+                # Valid JSON with an unexpected shape; let the generic walk skip the odd parts
+                packages = _collect_package_lock(json_loads(data))
+        elif _ijson is not None:
+            f.seek(start)
+            packages = _stream_package_lock(f)
+        else:
+            packages = _collect_package_lock(json_loads(prefix + f.read()))
+
+    return _intern_names(sorted(packages))
+
+
+def parse_yarn_lock(lockfile_path: LockfileSource, package_json_path: str | None = None) -> List[str]:
     """Extract all dependencies (direct + transitive) from yarn.lock.
 
     Uses the yarnlock library if available, falls back to custom parser.
 
     Args:
-        lockfile_path: Path to yarn.lock file
+        lockfile_path: Path to yarn.lock file, or a binary file object
         package_json_path: Optional path to package.json (for identifying direct deps)
 
     Returns:
         List of all unique package names (direct + transitive)
     """
-    try:
-        # Try using yarnlock library first
-        try:
-            from yarnlock import yarnlock_parse
-
-            with open(lockfile_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            parsed = yarnlock_parse(content)
-
-            # Extract all package names from parsed structure
-            packages: Set[str] = set()
-            if isinstance(parsed, dict):
-                for pkg_key, pkg_info in parsed.items():
-                    # Skip empty keys
-                    if not pkg_key or not isinstance(pkg_key, str):
-                        continue
-                    # pkg_key format: "package-name@version" or "@scope/package-name@version"
-                    # Extract package name (handle scoped packages)
-                    if "@" in pkg_key:
-                        # Remove version part
-                        pkg_name = pkg_key.rsplit("@", 1)[0]
-                        if pkg_name:  # Only add non-empty names
-                            packages.add(pkg_name)
-
-            return sorted(list(packages))
-
-        except ImportError:
-            # Fallback to custom parser if yarnlock not available
-            logger.debug("yarnlock library not available, using custom parser")
-            return _parse_yarn_lock_custom(lockfile_path)
+    if _YARNLOCK_PARSE is None:
+        # Fallback to custom parser if yarnlock not available
+        logger.debug("yarnlock library not available, using custom parser")
+        return _parse_yarn_lock_custom(lockfile_path)
 
+    try:
+        return list(_read_yarn_lock(lockfile_path))
     except (FileNotFoundError, IOError, KeyError, Exception) as e:
         logger.warning("Failed to parse yarn.lock: %s", e)
         return []
 
 
-def _parse_yarn_lock_custom(lockfile_path: str) -> List[str]:
+@stat_cached(maxsize=_PARSE_CACHE_SIZE, open_file=True)
+def _read_yarn_lock(lockfile_path: LockfileSource) -> Tuple[str, ...]:
+    """Body of parse_yarn_lock with the yarnlock library; raises so failures are not cached."""
+    with _open_lockfile(lockfile_path, binary=False) as f:
+        content = f.read()
+
+    parsed = _YARNLOCK_PARSE(content)
+
+    # Extract all package names from parsed structure
+    packages: Set[str] = set()
+    if isinstance(parsed, dict):
+        for pkg_key, pkg_info in parsed.items():
+            # Skip empty keys
+            if not pkg_key or not isinstance(pkg_key, str):
+                continue
+            # pkg_key format: "package-name@version" or "@scope/package-name@version"
+            # Extract package name (handle scoped packages)
+            if "@" in pkg_key:
+                # Remove version part
+                pkg_name = pkg_key.rsplit("@", 1)[0]
+                if pkg_name:  # Only add non-empty names
+                    packages.add(pkg_name)
+
+    return _intern_names(sorted(packages))
+
+
+def _parse_yarn_lock_custom(lockfile_path: LockfileSource) -> List[str]:
     """Custom parser for yarn.lock (fallback when yarnlock library unavailable).
 
     Parses Yarn v1 format: package-name@version: version "x.y.z" resolved "url" ...
 
     Args:
-        lockfile_path: Path to yarn.lock file
+        lockfile_path: Path to yarn.lock file, or a binary file object
 
     Returns:
         List of all unique package names
     """
     try:
-        with open(lockfile_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        packages: Set[str] = set()
+        return list(_read_yarn_lock_custom(lockfile_path))
+    except (FileNotFoundError, IOError) as e:
+        logger.warning("Failed to parse yarn.lock with custom parser: %s", e)
+        return []
 
-        # Pattern to match yarn.lock entries: "package-name@version:" or "@scope/package-name@version:"
-        # Entry format: package-name@version:\n  version "x.y.z"\n  resolved "url"\n  ...
-        pattern = r'^([^@\s"][^"\n]*?|@[^/]+/[^"\n]+?)@[^:\n]+:'
 
-        for match in re.finditer(pattern, content, re.MULTILINE):
-            pkg_key = match.group(1)
-            # Extract package name (handle scoped packages like @scope/package)
-            if pkg_key.startswith("@"):
-                # Scoped package: @scope/package
-                packages.add(pkg_key)
-            else:
-                # Regular package: package-name
-                packages.add(pkg_key)
+@stat_cached(maxsize=_PARSE_CACHE_SIZE, open_file=True)
+def _read_yarn_lock_custom(lockfile_path: LockfileSource) -> Tuple[str, ...]:
+    """Body of _parse_yarn_lock_custom; raises so failures are not cached."""
+    packages: Set[str] = set()
 
-        return sorted(list(packages))
+    with _open_lockfile(lockfile_path, binary=False) as f:
+        for line in f:
+            # Entry headers start in column 0; their fields are indented
+            if line[0] in " \t#\r\n":
+                continue
+            match = _YARN_ENTRY_RE.match(line)
+            if match:
+                packages.add(match.group(1))
 
-    except (FileNotFoundError, IOError) as e:
-        logger.warning("Failed to parse yarn.lock with custom parser: %s", e)
-        return []
+    return _intern_names(sorted(packages))
 
 
-def parse_bun_lock(lockfile_path: str) -> List[str]:
+def parse_bun_lock(lockfile_path: LockfileSource) -> List[str]:
     """Extract all dependencies (direct + transitive) from bun.lock.
 
     bun.lock is JSONC format (JSON with comments). This function strips comments
     and parses as JSON.
 
     Args:
-        lockfile_path: Path to bun.lock file
+        lockfile_path: Path to bun.lock file, or a binary file object
 
     Returns:
         List of all unique package names (direct + transitive)
     """
     try:
-        with open(lockfile_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        return list(_read_bun_lock(lockfile_path))
+    except (FileNotFoundError, IOError, ValueError, KeyError) as e:
+        logger.warning("Failed to parse bun.lock: %s", e)
+        return []
 
-        # Strip JSONC comments
-        json_content = _strip_jsonc_comments(content)
 
-        # Parse as JSON
-        data = json.loads(json_content)
+@stat_cached(maxsize=_PARSE_CACHE_SIZE, open_file=True)
+def _read_bun_lock(lockfile_path: LockfileSource) -> Tuple[str, ...]:
+    """Body of parse_bun_lock; raises instead of logging so failures are not cached."""
+    with _open_lockfile(lockfile_path, binary=False) as f:
+        content = f.read()
 
-        packages: Set[str] = set()
+    # Strip JSONC comments
+    json_content = _strip_jsonc_comments(content)
 
-        # bun.lock structure is similar to package-lock.json v2/3
-        # Check for "packages" field (flat structure)
-        if "packages" in data and isinstance(data["packages"], dict):
-            for pkg_path, pkg_info in data["packages"].items():
-                # Skip root package (empty path)
-                if not pkg_path:
-                    continue
+    # Parse as JSON
+    data = json_loads(json_content.encode("utf-8"))
 
-                if isinstance(pkg_info, dict):
-                    # Prefer "name" field if present
-                    if "name" in pkg_info:
-                        packages.add(pkg_info["name"])
-                    else:
-                        # Extract package name from path (e.g., "node_modules/package-name" -> "package-name")
-                        # Handle scoped packages (e.g., "node_modules/@scope/package-name" -> "@scope/package-name")
-                        path_parts = pkg_path.split("/")
-                        if path_parts:  # Defensive check
-                            # Check if this is a scoped package (path ends with @scope/package-name)
-                            if len(path_parts) >= 2 and path_parts[-2].startswith("@"):
-                                # Scoped package: "@scope/package-name"
-                                packages.add(f"{path_parts[-2]}/{path_parts[-1]}")
-                            else:
-                                # Regular package: "package-name"
-                                packages.add(path_parts[-1])
-
-        # Also check for "dependencies" field if present
-        if "dependencies" in data:
-            def _extract_from_deps(deps: dict) -> None:
-                """Recursively extract package names from dependencies."""
-                if not isinstance(deps, dict):
-                    return
-                for pkg_name, pkg_info in deps.items():
-                    if isinstance(pkg_info, dict):
-                        packages.add(pkg_name)
-                        if "dependencies" in pkg_info:
-                            _extract_from_deps(pkg_info["dependencies"])
+    packages: Set[str] = set()
 
-            _extract_from_deps(data["dependencies"])
+    # bun.lock structure is similar to package-lock.json v2/3
+    # Check for "packages" field (flat structure)
+    if "packages" in data and isinstance(data["packages"], dict):
+        for pkg_path, pkg_info in data["packages"].items():
+            # Skip root package (empty path)
+            if not pkg_path:
+                continue
 
-        return sorted(list(packages))
+            if isinstance(pkg_info, dict):
+                # Prefer "name" field if present
+                if "name" in pkg_info:
+                    packages.add(pkg_info["name"])
+                else:
+                    packages.add(_name_from_lock_path(pkg_path))
 
-    except (FileNotFoundError, IOError, json.JSONDecodeError, KeyError) as e:
-        logger.warning("Failed to parse bun.lock: %s", e)
-        return []
+    # Also check for "dependencies" field if present
+    if "dependencies" in data:
+        _extract_from_deps(data["dependencies"], packages)
+
+    return _intern_names(sorted(packages))
@@ -1,15 +1,20 @@
 """NuGet source scanner: scan for .csproj, packages.config, project.json, and Directory.Build.props files."""
 from __future__ import annotations
 
+import io
 import json
 import logging
+import mmap
 import os
+import re
 import sys
 import xml.etree.ElementTree as ET
-from typing import List
-from glob import glob
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from constants import ExitCodes, Constants
+from common.file_parsing import iterparse_xml, json_loads, stat_cached
 from common.logging_utils import (
     log_discovered_files,
     log_selection,
@@ -18,137 +23,295 @@ from common.logging_utils import (
 
 logger = logging.getLogger(__name__)
 
+# Manifest elements (by local name) and the attribute carrying the package id
+_PACKAGE_REFERENCE_TAG = "PackageReference"
+_PACKAGE_REFERENCE_ATTR = "Include"
+_PACKAGES_CONFIG_TAG = "package"
+_PACKAGES_CONFIG_ATTR = "id"
+_XML_EVENTS = ("end",)
+
+# Start tag of each element, optionally prefixed; "package" must not match "<packages"
+_FAST_PKGREF_RE = re.compile(rb"<(?:[\w.-]+:)?PackageReference\b")
+_FAST_PACKAGE_RE = re.compile(rb"<(?:[\w.-]+:)?package\b")
+# The byte markers are ASCII; UTF-16/UTF-32 manifests are transcoded to UTF-8
+# before the marker scan, since the stdlib XML parser rejects multi-byte encodings.
+# UTF-32 BOMs come first as the UTF-16 LE BOM is a prefix of the UTF-32 LE one.
+_UTF16_BOMS = (b"\xff\xfe", b"\xfe\xff")
+_WIDE_ENCODINGS = (
+    ((b"\xff\xfe\x00\x00", b"\x00\x00\xfe\xff"), "utf-32"),
+    (_UTF16_BOMS, "utf-16"),
+    ((b"<\x00\x00\x00",), "utf-32-le"),
+    ((b"\x00\x00\x00<",), "utf-32-be"),
+    ((b"<\x00",), "utf-16-le"),
+    ((b"\x00<",), "utf-16-be"),
+)
+_XML_ENCODING_DECL_RE = re.compile(r"""^(\s*<\?xml\b[^>]*?)\s+encoding\s*=\s*(["'])[^"']*\2""")
 
-def _scan_csproj_files(dir_name: str, recursive: bool) -> List[str]:
-    """Scan .csproj files for PackageReference elements.
+# Manifests at least this large are memory-mapped for the marker scan and
+# parsed straight from the file rather than copied into a bytes object
+_MMAP_MIN_BYTES = 64 * 1024
 
-    Args:
-        dir_name: Directory to scan
-        recursive: Whether to scan recursively
+_CSPROJ_SUFFIX = ".csproj"
+_DIRECTORY_BUILD_PROPS_FILE = "Directory.Build.props"
+_PACKAGES_LOCK_FILE = "packages.lock.json"
 
-    Returns:
-        List of package identifiers
+# Below this many manifests, thread-pool setup costs more than it saves
+_PARALLEL_PARSE_MIN_FILES = 8
+_PARSE_WORKERS = 4
+
+
+def _iter_xml_attr(source: Union[str, IO[bytes]], tag: str, attr: str) -> Iterator[str]:
+    """Stream the non-empty *attr* values of every element named *tag* in an XML file.
+
+    Tags are compared by local name, so MSBuild/NuGet namespaces are ignored.
+    Elements are cleared as soon as they close; no DOM is kept for the file.
     """
-    packages: List[str] = []
-    pattern = "**/*.csproj" if recursive else "*.csproj"
-    csproj_files = glob(os.path.join(dir_name, pattern), recursive=recursive)
+    ns_tag = "}" + tag
+    for _, elem in iterparse_xml(source, _XML_EVENTS, tag=tag):
+        elem_tag = elem.tag
+        if elem_tag == tag or elem_tag.endswith(ns_tag):
+            value = elem.get(attr)
+            if value:
+                yield value
+        elem.clear()
+
+
+def _intern_ids(ids: Iterable[str]) -> Tuple[str, ...]:
+    """Return ids as a tuple of interned strings, so ids repeated across projects share one object."""
+    return tuple(map(sys.intern, ids))
 
-    for csproj_path in csproj_files:
-        try:
-            tree = ET.parse(csproj_path)
-            root = tree.getroot()
-            # Remove namespace for easier parsing
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}')[1]
-
-            # Find PackageReference elements
-            for package_ref in root.findall(".//PackageReference"):
-                include_attr = package_ref.get("Include")
-                if include_attr:
-                    packages.append(include_attr)
-        except (ET.ParseError, IOError) as e:
-            logger.warning("Couldn't parse .csproj file %s: %s", csproj_path, e)
-            continue
 
-    return packages
+def _wide_encoding(head: bytes) -> Optional[str]:
+    """Return the UTF-16/UTF-32 codec a manifest starting with *head* uses, or None if ASCII-compatible."""
+    for prefixes, encoding in _WIDE_ENCODINGS:
+        if head.startswith(prefixes):
+            return encoding
+    return None
+
+
+def _to_utf8(data: bytes, encoding: str) -> bytes:
+    """Transcode a UTF-16/UTF-32 manifest to UTF-8 and drop its encoding declaration."""
+    try:
+        text = data.decode(encoding)
+    except UnicodeDecodeError as e:
+        raise ET.ParseError(f"not valid {encoding}: {e}") from e
+    return _XML_ENCODING_DECL_RE.sub(r"\1", text, count=1).encode("utf-8")
 
 
-def _scan_packages_config(dir_name: str, recursive: bool) -> List[str]:
-    """Scan packages.config files for package elements.
+def _lacks_marker(data: Union[bytes, mmap.mmap], marker: "re.Pattern[bytes]") -> bool:
+    """Whether an ASCII-compatible manifest provably never opens the marker's element.
+
+    Documents starting with a UTF-16 BOM or holding NUL bytes return False,
+    so they always reach the XML parser.
+    """
+    if data[:2] in _UTF16_BOMS or data.find(b"\x00") != -1:
+        return False
+    return marker.search(data) is None
+
+
+@stat_cached()
+def _read_xml_ids(path: str, tag: str, attr: str, marker: "re.Pattern[bytes]") -> Tuple[str, ...]:
+    """Return the *attr* values of *tag* elements in an XML manifest.
+
+    The raw bytes are scanned for the element's start tag first; a manifest
+    that never mentions it (e.g. a props file holding only properties) is
+    answered without running the XML parser. Otherwise the bytes already read
+    are parsed, so well-formedness is still enforced and commented-out
+    references are not picked up. Large files are scanned through mmap and
+    parsed from the open file, so they are never held on the heap in full.
+    UTF-16/UTF-32 manifests are read whole and transcoded to UTF-8 first, so
+    every XML backend accepts them. Results are interned and cached until the
+    file changes; parse errors propagate and are not cached.
+    """
+    with open(path, "rb") as f:
+        encoding = _wide_encoding(f.read(4))
+        f.seek(0)
+        if encoding is None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _lacks_marker(mm, marker):
+                    return ()
+            f.seek(0)
+            return _intern_ids(_iter_xml_attr(f, tag, attr))
+        data = f.read()
+    if encoding is not None:
+        data = _to_utf8(data, encoding)
+    if _lacks_marker(data, marker):
+        return ()
+    # Materialize so a parse error mid-file contributes nothing
+    return _intern_ids(_iter_xml_attr(io.BytesIO(data), tag, attr))
+
+
+def _parse_csproj(path: str) -> List[str]:
+    """Return the PackageReference ids in a .csproj file.
 
     Args:
-        dir_name: Directory to scan
-        recursive: Whether to scan recursively
+        path: Path to the .csproj file
 
     Returns:
-        List of package identifiers
+        List of package identifiers (empty if the file cannot be parsed)
     """
-    packages: List[str] = []
-    pattern = "**/packages.config" if recursive else "packages.config"
-    config_files = glob(os.path.join(dir_name, pattern), recursive=recursive)
+    try:
+        return list(_read_xml_ids(path, _PACKAGE_REFERENCE_TAG, _PACKAGE_REFERENCE_ATTR, _FAST_PKGREF_RE))
+    except (ET.ParseError, IOError) as e:
+        logger.warning("Couldn't parse .csproj file %s: %s", path, e)
+        return []
 
-    for config_path in config_files:
-        try:
-            tree = ET.parse(config_path)
-            root = tree.getroot()
-            # Remove namespace
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}')[1]
-
-            for package in root.findall(".//package"):
-                id_attr = package.get("id")
-                if id_attr:
-                    packages.append(id_attr)
-        except (ET.ParseError, IOError) as e:
-            logger.warning("Couldn't parse packages.config file %s: %s", config_path, e)
-            continue
 
-    return packages
+def _parse_packages_config(path: str) -> List[str]:
+    """Return the package ids in a packages.config file.
+
+    Args:
+        path: Path to the packages.config file
+
+    Returns:
+        List of package identifiers (empty if the file cannot be parsed)
+    """
+    try:
+        return list(_read_xml_ids(path, _PACKAGES_CONFIG_TAG, _PACKAGES_CONFIG_ATTR, _FAST_PACKAGE_RE))
+    except (ET.ParseError, IOError) as e:
+        logger.warning("Couldn't parse packages.config file %s: %s", path, e)
+        return []
 
 
-def _scan_project_json(dir_name: str, recursive: bool) -> List[str]:
-    """Scan project.json files for dependencies.
+def _parse_project_json(path: str) -> List[str]:
+    """Return the dependency names in a project.json file.
 
     Args:
-        dir_name: Directory to scan
-        recursive: Whether to scan recursively
+        path: Path to the project.json file
 
     Returns:
-        List of package identifiers
+        List of package identifiers (empty if the file cannot be parsed)
     """
-    packages: List[str] = []
-    pattern = "**/project.json" if recursive else "project.json"
-    json_files = glob(os.path.join(dir_name, pattern), recursive=recursive)
+    try:
+        return list(_read_project_json_ids(path))
+    except (IOError, ValueError, KeyError) as e:
+        logger.warning("Couldn't parse project.json file %s: %s", path, e)
+    return []
 
-    for json_path in json_files:
-        try:
-            with open(json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                dependencies = data.get("dependencies", {})
-                if isinstance(dependencies, dict):
-                    packages.extend(dependencies.keys())
-        except (IOError, json.JSONDecodeError, KeyError) as e:
-            logger.warning("Couldn't parse project.json file %s: %s", json_path, e)
-            continue
 
-    return packages
+@stat_cached()
+def _read_project_json_ids(path: str) -> Tuple[str, ...]:
+    """Return the top-level dependency names of a project.json; decode errors propagate."""
+    with open(path, "rb") as f:
+        data = json_loads(f.read())
+    # Only the top-level dependency names are needed; nothing deeper is walked
+    dependencies = data.get("dependencies", {})
+    if isinstance(dependencies, dict):
+        return _intern_ids(dependencies.keys())
+    return ()
 
 
-def _scan_directory_build_props(dir_name: str, recursive: bool) -> List[str]:
-    """Scan Directory.Build.props files for PackageReference elements.
+def _parse_directory_build_props(path: str) -> List[str]:
+    """Return the PackageReference ids in a Directory.Build.props file.
 
     Args:
-        dir_name: Directory to scan
-        recursive: Whether to scan recursively
+        path: Path to the Directory.Build.props file
 
     Returns:
-        List of package identifiers
+        List of package identifiers (empty if the file cannot be parsed)
     """
-    packages: List[str] = []
-    pattern = "**/Directory.Build.props" if recursive else "Directory.Build.props"
-    props_files = glob(os.path.join(dir_name, pattern), recursive=recursive)
+    try:
+        return list(_read_xml_ids(path, _PACKAGE_REFERENCE_TAG, _PACKAGE_REFERENCE_ATTR, _FAST_PKGREF_RE))
+    except (ET.ParseError, IOError) as e:
+        logger.warning("Couldn't parse Directory.Build.props file %s: %s", path, e)
+        return []
+
+
+# Fixed manifest file names -> parser; *.csproj is matched by suffix
+_MANIFEST_PARSERS: Dict[str, Callable[[str], List[str]]] = {
+    Constants.PACKAGES_CONFIG_FILE: _parse_packages_config,
+    Constants.PROJECT_JSON_FILE: _parse_project_json,
+    _DIRECTORY_BUILD_PROPS_FILE: _parse_directory_build_props,
+}
+
 
-    for props_path in props_files:
+def _walk_files(dir_name: str, recursive: bool, skip_hidden: bool = True) -> Iterator[Tuple[os.DirEntry, bool]]:
+    """Yield (entry, hidden) for the files under *dir_name* using os.scandir.
+
+    hidden is True when the file or any directory between it and *dir_name* is
+    dot-prefixed. Symlinked directories are descended into, as glob's "**"
+    did; each directory is stat'ed once so a (st_dev, st_ino) already walked
+    (a link loop, or two links to one tree) is not walked again. Files cost
+    no extra stat calls. Directories that cannot be listed are skipped.
+
+    Args:
+        dir_name: Directory to walk
+        recursive: Whether to descend into subdirectories
+        skip_hidden: Skip hidden files and directories entirely, as glob patterns do
+    """
+    visited = set()
+    try:
+        st = os.stat(dir_name)
+        visited.add((st.st_dev, st.st_ino))
+    except OSError:
+        pass  # scandir below reports nothing for a missing root
+    pending = deque([(dir_name, False)])
+    while pending:
+        current, current_hidden = pending.popleft()
         try:
-            tree = ET.parse(props_path)
-            root = tree.getroot()
-            # Remove namespace
-            for elem in root.iter():
-                if '}' in elem.tag:
-                    elem.tag = elem.tag.split('}')[1]
-
-            # Find PackageReference elements
-            for package_ref in root.findall(".//PackageReference"):
-                include_attr = package_ref.get("Include")
-                if include_attr:
-                    packages.append(include_attr)
-        except (ET.ParseError, IOError) as e:
-            logger.warning("Couldn't parse Directory.Build.props file %s: %s", props_path, e)
+            entries = os.scandir(current)
+        except OSError:
+            # Missing or unreadable directories are skipped, as os.walk and glob did
             continue
+        with entries:
+            for entry in entries:
+                hidden = current_hidden or entry.name.startswith(".")
+                if hidden and skip_hidden:
+                    continue
+                if entry.is_dir():
+                    if recursive:
+                        try:
+                            st = entry.stat()
+                        except OSError:
+                            continue
+                        key = (st.st_dev, st.st_ino)
+                        if key not in visited:
+                            visited.add(key)
+                            pending.append((entry.path, hidden))
+                    continue
+                yield entry, hidden
+
+
+def _discover(
+    dir_name: str, recursive: bool, find_lockfile: bool = False
+) -> Tuple[List[Tuple[str, Callable[[str], List[str]]]], bool]:
+    """Collect NuGet manifests and look for packages.lock.json in one directory pass.
+
+    Manifests under hidden directories are ignored, as the former glob patterns
+    did; the lockfile counts anywhere. Hidden directories are only walked when
+    *find_lockfile* is set.
 
-    return packages
+    Returns:
+        ([(path, parser), ...], lockfile_found)
+    """
+    manifests: List[Tuple[str, Callable[[str], List[str]]]] = []
+    lockfile_found = False
+    for entry, hidden in _walk_files(dir_name, recursive, skip_hidden=not find_lockfile):
+        name = entry.name
+        if name == _PACKAGES_LOCK_FILE:
+            lockfile_found = True
+        if hidden:
+            continue
+        if name.endswith(_CSPROJ_SUFFIX):
+            manifests.append((entry.path, _parse_csproj))
+            continue
+        parser = _MANIFEST_PARSERS.get(name)
+        if parser is not None:
+            manifests.append((entry.path, parser))
+    return manifests, lockfile_found
+
+
+def _parse_manifests(manifests: List[Tuple[str, Callable[[str], List[str]]]]) -> List[List[str]]:
+    """Run each manifest's parser, fanning out to a thread pool for larger trees.
+
+    Files are independent and file reads release the GIL, so threads overlap
+    the I/O; results come back in input order either way. Unchanged manifests
+    are answered from the parsers' stat-keyed cache.
+    """
+    if len(manifests) < _PARALLEL_PARSE_MIN_FILES:
+        return [parser(path) for path, parser in manifests]
+    with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as pool:
+        return list(pool.map(lambda item: item[1](item[0]), manifests))
 
 
 def scan_source(dir_name: str, recursive: bool = False, direct_only: bool = False, require_lockfile: bool = False) -> List[str]:
@@ -167,69 +330,36 @@ def scan_source(dir_name: str, recursive: bool = False, direct_only: bool = Fals
         logging.info("NuGet scanner engaged.")
         all_packages: List[str] = []
 
+        # Single directory pass: manifests plus, if required, the lockfile
+        manifests, lockfile_found = _discover(dir_name, recursive, find_lockfile=require_lockfile)
+
         # Check for lockfile if required
-        if require_lockfile:
-            lockfile_name = "packages.lock.json"
+        if require_lockfile and not lockfile_found:
             if recursive:
-                # For recursive scans, check if any lockfile exists
-                lockfile_found = False
-                for root, _, files in os.walk(dir_name):
-                    if lockfile_name in files:
-                        lockfile_found = True
-                        break
-                if not lockfile_found:
-                    logger.error(
-                        "Lockfile required but not found in '%s' or subdirectories. Expected: %s",
-                        dir_name,
-                        lockfile_name,
-                    )
-                    sys.exit(ExitCodes.FILE_ERROR.value)
+                logger.error(
+                    "Lockfile required but not found in '%s' or subdirectories. Expected: %s",
+                    dir_name,
+                    _PACKAGES_LOCK_FILE,
+                )
             else:
-                # For non-recursive scans, check in the directory
-                lockfile_path = os.path.join(dir_name, lockfile_name)
-                if not os.path.isfile(lockfile_path):
-                    logger.error(
-                        "Lockfile required but not found in '%s'. Expected: %s",
-                        dir_name,
-                        lockfile_name,
-                    )
-                    sys.exit(ExitCodes.FILE_ERROR.value)
+                logger.error(
+                    "Lockfile required but not found in '%s'. Expected: %s",
+                    dir_name,
+                    _PACKAGES_LOCK_FILE,
+                )
+            sys.exit(ExitCodes.FILE_ERROR.value)
 
         if recursive:
             if is_debug_enabled(logger):
                 discovered = {"manifest": [], "lockfile": []}
                 log_discovered_files(logger, "nuget", discovered)
 
-        # Scan .csproj files
-        csproj_packages = _scan_csproj_files(dir_name, recursive)
-        all_packages.extend(csproj_packages)
-
-        # Scan packages.config files
-        config_packages = _scan_packages_config(dir_name, recursive)
-        all_packages.extend(config_packages)
-
-        # Scan project.json files
-        json_packages = _scan_project_json(dir_name, recursive)
-        all_packages.extend(json_packages)
-
-        # Scan Directory.Build.props files
-        props_packages = _scan_directory_build_props(dir_name, recursive)
-        all_packages.extend(props_packages)
+        # Each manifest goes to its format's parser
+        has_files = bool(manifests)
+        for packages in _parse_manifests(manifests):
+            all_packages.extend(packages)
 
         if not all_packages and not recursive:
-            # Check if any NuGet files exist
-            csproj_path = os.path.join(dir_name, "*.csproj")
-            config_path = os.path.join(dir_name, Constants.PACKAGES_CONFIG_FILE)
-            json_path = os.path.join(dir_name, Constants.PROJECT_JSON_FILE)
-            props_path = os.path.join(dir_name, "Directory.Build.props")
-
-            has_files = (
-                bool(glob(csproj_path)) or
-                os.path.isfile(config_path) or
-                os.path.isfile(json_path) or
-                os.path.isfile(props_path)
-            )
-
             if not has_files:
                 logging.error("No NuGet project files found (.csproj, packages.config, project.json, or Directory.Build.props). Unable to scan.")
                 sys.exit(ExitCodes.FILE_ERROR.value)
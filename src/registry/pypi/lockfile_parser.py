@@ -9,6 +9,14 @@ from __future__ import annotations
 import logging
 from typing import List, Set
 
+try:
+    import tomllib as toml  # type: ignore
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as toml  # type: ignore
+    except ImportError:
+        toml = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,13 +33,10 @@ def parse_uv_lock(lockfile_path: str) -> List[str]:
         List of all unique package names (direct + transitive)
     """
     try:
-        try:
-            import tomllib as toml  # type: ignore
-        except Exception:  # pylint: disable=broad-exception-caught
-            import tomli as toml  # type: ignore
-
+        if toml is None:
+            raise ImportError("tomllib/tomli is required to parse TOML lockfiles")
         with open(lockfile_path, "rb") as f:
-            data = toml.load(f) or {}
+            data = toml.loads(f.read().decode("utf-8")) or {}
 
         packages: Set[str] = set()
 
@@ -71,13 +76,10 @@ def parse_poetry_lock(lockfile_path: str) -> List[str]:
         List of all unique package names (direct + transitive)
     """
     try:
-        try:
-            import tomllib as toml  # type: ignore
-        except Exception:  # pylint: disable=broad-exception-caught
-            import tomli as toml  # type: ignore
-
+        if toml is None:
+            raise ImportError("tomllib/tomli is required to parse TOML lockfiles")
         with open(lockfile_path, "rb") as f:
-            data = toml.load(f) or {}
+            data = toml.loads(f.read().decode("utf-8")) or {}
 
         packages: Set[str] = set()
 
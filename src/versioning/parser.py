@@ -1,8 +1,22 @@
 """Token parsing utilities for package resolution."""
+import copy
 import re
 
-from typing import Optional, Tuple, List, Dict
+from typing import Any, Optional, Tuple, List, Dict
 
+try:
+    import tomllib as _toml  # type: ignore
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as _toml  # type: ignore
+    except ImportError:
+        _toml = None  # type: ignore
+
+# Support being imported as either "src.versioning.parser" or "versioning.parser"
+try:
+    from ..common.file_parsing import stat_cached
+except ImportError:
+    from common.file_parsing import stat_cached
 from .models import (
     Ecosystem,
     PackageRequest,
@@ -227,15 +241,28 @@ def parse_requirements_txt(manifest_path: str) -> Dict[str, DependencyRecord]:
         return results
 
 
+@stat_cached(maxsize=64)
+def _parse_pyproject_cached(manifest_path: str) -> Dict[str, Any]:
+    """Parse pyproject.toml once per (path, mtime, size); only _load_pyproject may see the result."""
+    if _toml is None:
+        raise ImportError("tomllib/tomli is required to parse pyproject.toml")
+    with open(manifest_path, 'rb') as fh:
+        return _toml.loads(fh.read().decode('utf-8')) or {}
+
+
+def _load_pyproject(manifest_path: str) -> Dict[str, Any]:
+    """Return parsed pyproject.toml content, shared by tool detection and dependency parsing.
+
+    Each caller gets its own deep copy of the cached document, so mutating it
+    cannot leak into later reads.
+    """
+    return copy.deepcopy(_parse_pyproject_cached(manifest_path))
+
+
 def parse_pyproject_tools(manifest_path: str) -> Dict[str, bool]:
     """Detect tool sections in pyproject.toml to guide precedence."""
     try:
-        try:
-            import tomllib as toml  # type: ignore
-        except Exception:  # pylint: disable=broad-exception-caught
-            import tomli as toml  # type: ignore
-        with open(manifest_path, 'rb') as fh:
-            data = toml.load(fh) or {}
+        data = _load_pyproject(manifest_path)
         tool = data.get('tool', {}) or {}
         return {
             "tool_uv": bool(tool.get('uv')),
@@ -249,12 +276,7 @@ def parse_pyproject_for_direct_pypi(manifest_path: str) -> Dict[str, DependencyR
     """Parse pyproject.toml for direct dependencies across PEP 621 and Poetry."""
     results: Dict[str, DependencyRecord] = {}
     try:
-        try:
-            import tomllib as toml  # type: ignore
-        except Exception:  # pylint: disable=broad-exception-caught
-            import tomli as toml  # type: ignore
-        with open(manifest_path, 'rb') as fh:
-            data = toml.load(fh) or {}
+        data = _load_pyproject(manifest_path)
 
         # PEP 621
         proj = data.get('project', {}) or {}
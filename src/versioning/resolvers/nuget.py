@@ -1,10 +1,13 @@
 """NuGet version resolver using semantic versioning with V3 API (primary) and V2 API (fallback)."""
 
+import functools
 import re
 import urllib.parse
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import requests
 import semantic_version
+from requests.adapters import HTTPAdapter
 
 # Support being imported as either "src.versioning.resolvers.nuget" or "versioning.resolvers.nuget"
 try:
@@ -17,6 +20,70 @@ except ImportError:
 from ..models import Ecosystem, PackageRequest, ResolutionMode
 from .base import VersionResolver
 
+# One keep-alive session for every NuGet lookup, so back-to-back service index,
+# registration and OData requests reuse pooled connections instead of a fresh
+# TCP/TLS handshake each. Retries stay with the HTTP middleware's policy.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+_JSON_HEADERS = {"Accept": "application/json"}
+
+
+# Strict SemVer 2.0 (no leading zeros, no empty identifiers), matching what
+# semantic_version.Version accepts; build metadata is allowed but not captured.
+_NUM = r"(?:0|[1-9][0-9]*)"
+_PRE_ID = r"(?:0|[1-9][0-9]*|[0-9]*[A-Za-z-][0-9A-Za-z-]*)"
+_SEMVER_RE = re.compile(
+    rf"({_NUM})\.({_NUM})\.({_NUM})"
+    rf"(?:-({_PRE_ID}(?:\.{_PRE_ID})*))?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?"
+)
+# Releases sort above any prerelease of the same major.minor.patch
+_RELEASE = (1,)
+
+
+@functools.lru_cache(maxsize=8192)
+def _version_key(v: str) -> Optional[tuple]:
+    """Return a plain-tuple precedence key for a version string, or None if invalid.
+
+    Orders exactly like semantic_version.Version (build metadata ignored,
+    numeric prerelease identifiers below alphanumeric ones) but compares as
+    ints and strs in C. Strings the regex misses go through Version itself.
+    """
+    m = _SEMVER_RE.fullmatch(v)
+    if m:
+        major, minor, patch, pre = m.groups()
+        pre_ids = pre.split(".") if pre else ()
+    else:
+        try:
+            ver = semantic_version.Version(v)
+        except ValueError:
+            return None
+        major, minor, patch, pre_ids = ver.major, ver.minor, ver.patch, ver.prerelease
+    if not pre_ids:
+        return (int(major), int(minor), int(patch), _RELEASE)
+    pre_key = tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in pre_ids)
+    return (int(major), int(minor), int(patch), (0, pre_key))
+
+
+def _is_prerelease(v: str) -> bool:
+    """Whether a valid candidate string carries a prerelease tag."""
+    key = _version_key(v)
+    return key is not None and key[3] != _RELEASE
+
+
+@functools.lru_cache(maxsize=256)
+def _sorted_versions(candidates: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Return the valid candidate strings, highest version first.
+
+    Cached per candidate tuple, so picking several specs against one package's
+    candidates sorts them only once; pickers then scan from the top and stop
+    at the first acceptable version. Invalid versions are dropped. The sort is
+    stable, so ties resolve exactly as a filter-then-sort would.
+    """
+    valid = [v for v in candidates if _version_key(v) is not None]
+    valid.sort(key=_version_key, reverse=True)
+    return tuple(valid)
+
 
 class NuGetVersionResolver(VersionResolver):
     """Resolver for NuGet packages using semantic versioning."""
@@ -26,6 +93,60 @@ class NuGetVersionResolver(VersionResolver):
         """Return NuGet ecosystem."""
         return Ecosystem.NUGET
 
+    def _registration_base(self) -> Optional[str]:
+        """Return the V3 RegistrationsBaseUrl from the service index.
+
+        The service index is identical for every package, so the resolved base
+        URL is cached (1 hour TTL) and a scan fetches the index once rather than
+        once per package. Failed lookups are not cached.
+
+        Returns:
+            Registration base URL, or None if the service index is unavailable
+        """
+        service_index_url = Constants.REGISTRY_URL_NUGET_V3
+        cache_key = f"nuget-svc-index:{service_index_url}"
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        status_code, _, index_data = get_json(service_index_url, headers=_JSON_HEADERS, session=_SESSION)
+        if status_code != 200 or not index_data:
+            return None
+
+        # Find registration endpoint
+        registration_base = None
+        for resource in index_data.get("resources", []):
+            if resource.get("@type") == "RegistrationsBaseUrl/3.6.0":
+                registration_base = resource.get("@id")
+                break
+
+        if registration_base and self.cache:
+            self.cache.set(cache_key, registration_base, 3600)  # 1 hour TTL
+        return registration_base
+
+    def _iter_registration_versions(self, reg_data: Dict[str, Any]) -> Iterator[str]:
+        """Yield catalog entry versions from a registration index, following page references.
+
+        Small packages inline every page's leaves in the index. Large ones
+        (hundreds of versions) list only page references (@id), which are
+        fetched in index order; a page that fails to load is skipped. Each
+        page's JSON can be dropped once its versions are yielded, but
+        _fetch_v3_versions drains the generator, so every page is fetched
+        before any version is picked.
+        """
+        for page in reg_data.get("items", []):
+            leaves = page.get("items")
+            if leaves is None and page.get("@id"):
+                status_code, _, page_data = get_json(page["@id"], headers=_JSON_HEADERS, session=_SESSION)
+                if status_code != 200 or not page_data:
+                    continue
+                leaves = page_data.get("items", [])
+            for leaf in leaves or []:
+                version = leaf.get("catalogEntry", {}).get("version")
+                if version:
+                    yield version
+
     def _fetch_v3_versions(self, package_id: str) -> List[str]:
         """Fetch versions from NuGet V3 API.
 
@@ -36,42 +157,20 @@ class NuGetVersionResolver(VersionResolver):
             List of version strings, empty if V3 unavailable
         """
         try:
-            # First, get service index
-            service_index_url = Constants.REGISTRY_URL_NUGET_V3
-            status_code, _, index_data = get_json(service_index_url, headers={"Accept": "application/json"})
-            if status_code != 200 or not index_data:
-                return []
-
-            # Find registration endpoint
-            resources = index_data.get("resources", [])
-            registration_base = None
-            for resource in resources:
-                if resource.get("@type") == "RegistrationsBaseUrl/3.6.0":
-                    registration_base = resource.get("@id")
-                    break
-
+            # First, resolve the registration endpoint from the (cached) service index
+            registration_base = self._registration_base()
             if not registration_base:
                 return []
 
             # Fetch registration index
             encoded_id = urllib.parse.quote(package_id.lower(), safe="")
             registration_url = f"{registration_base}{encoded_id}/index.json"
-            status_code, _, reg_data = get_json(registration_url, headers={"Accept": "application/json"})
+            status_code, _, reg_data = get_json(registration_url, headers=_JSON_HEADERS, session=_SESSION)
             if status_code != 200 or not reg_data:
                 return []
 
-            # Extract versions from registration pages
-            versions = []
-            items = reg_data.get("items", [])
-            for item in items:
-                items_in_page = item.get("items", [])
-                for page_item in items_in_page:
-                    catalog_entry = page_item.get("catalogEntry", {})
-                    version = catalog_entry.get("version")
-                    if version:
-                        versions.append(version)
-
-            return versions
+            # Extract versions from registration pages, inline or referenced
+            return list(self._iter_registration_versions(reg_data))
         except Exception:
             return []
 
@@ -91,7 +190,7 @@ class NuGetVersionResolver(VersionResolver):
             query = f"Packages()?$filter=Id eq '{package_id}'&$orderby=Version desc&$select=Version"
             url = f"{base_url}{query}"
             # Request JSON format
-            status_code, _, data = get_json(url, headers={"Accept": "application/json"})
+            status_code, _, data = get_json(url, headers=_JSON_HEADERS, session=_SESSION)
             if status_code == 200 and data and isinstance(data, dict):
                 # OData JSON format
                 results = data.get("d", {}).get("results", [])
@@ -161,22 +260,14 @@ class NuGetVersionResolver(VersionResolver):
         if not candidates:
             return None, 0, "No versions available"
 
-        # Parse versions using semantic_version
-        parsed_versions = []
-        for v in candidates:
-            try:
-                parsed_versions.append(semantic_version.Version(v))
-            except ValueError:
-                continue  # Skip invalid versions
-
-        if not parsed_versions:
+        sorted_versions = _sorted_versions(tuple(candidates))
+        if not sorted_versions:
             return None, len(candidates), "No valid semantic versions found"
 
-        # Exclude prereleases by default for latest mode
-        stable_versions = [ver for ver in parsed_versions if not ver.prerelease]
-        if stable_versions:
-            stable_versions.sort(reverse=True)
-            return str(stable_versions[0]), len(candidates), None
+        # Exclude prereleases by default for latest mode; highest stable comes first
+        for v in sorted_versions:
+            if not _is_prerelease(v):
+                return v, len(candidates), None
 
         # No stable versions available
         return None, len(candidates), "No stable versions available"
@@ -236,13 +327,6 @@ class NuGetVersionResolver(VersionResolver):
             except ValueError as e:
                 return None, f"Invalid semver spec: {str(e)}"
 
-    def _version_from_str(self, v: str) -> Optional[semantic_version.Version]:
-        """Safely parse a semantic version string."""
-        try:
-            return semantic_version.Version(v)
-        except ValueError:
-            return None
-
     def _spec_matches(self, npm_spec, ver: semantic_version.Version) -> bool:
         """Check if a version matches an npm/simple spec, handling API differences."""
         is_match = getattr(npm_spec, "match", None)
@@ -265,21 +349,6 @@ class NuGetVersionResolver(VersionResolver):
                     ok = False
         return ok
 
-    def _filter_matching_versions(
-        self, candidates: List[str], npm_spec, include_prerelease: bool
-    ) -> List[semantic_version.Version]:
-        """Filter candidate strings to versions matching the given spec and prerelease flag."""
-        matches: List[semantic_version.Version] = []
-        for v in candidates:
-            ver = self._version_from_str(v)
-            if not ver:
-                continue
-            if ver.prerelease and not include_prerelease:
-                continue
-            if self._spec_matches(npm_spec, ver):
-                matches.append(ver)
-        return matches
-
     def _pick_range(
         self, spec_str: str, candidates: List[str], include_prerelease: bool
     ) -> Tuple[Optional[str], int, Optional[str]]:
@@ -287,8 +356,12 @@ class NuGetVersionResolver(VersionResolver):
         npm_spec, err = self._parse_semver_spec(spec_str)
         if err or npm_spec is None:
             return None, len(candidates), err
-        matching_versions = self._filter_matching_versions(candidates, npm_spec, include_prerelease)
-        if not matching_versions:
-            return None, len(candidates), f"No versions match spec '{spec_str}'"
-        matching_versions.sort(reverse=True)
-        return str(matching_versions[0]), len(candidates), None
+        # Candidates come highest first, so the first match is the answer; only
+        # the versions actually scanned are built as Version objects
+        for v in _sorted_versions(tuple(candidates)):
+            if not include_prerelease and _is_prerelease(v):
+                continue
+            ver = semantic_version.Version(v)
+            if self._spec_matches(npm_spec, ver):
+                return str(ver), len(candidates), None
+        return None, len(candidates), f"No versions match spec '{spec_str}'"
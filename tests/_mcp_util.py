@@ -0,0 +1,274 @@
+"""Shared stdio helpers for MCP server integration tests."""
+
+import functools
+import itertools
+import json
+import os
+import select
+import subprocess
+import sys
+import time
+import weakref
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ENTRY = ROOT / "src" / "depgate.py"
+
+# Kernel pipe buffer for the server's stdio; large Scan_Project replies fit without stalling the writer
+PIPE_SIZE = 1024 * 1024
+
+INIT_PARAMS = {
+    "protocolVersion": "2024-11-05",
+    "clientInfo": {"name": "pytest", "version": "0.0.0"},
+    "capabilities": {},
+}
+
+# Server environment with fake registries (tests/e2e_mocks/sitecustomize.py) and src importable;
+# built once at import, callers copy it with dict(FAKE_REGISTRY_ENV)
+FAKE_REGISTRY_ENV = {
+    **os.environ,
+    "FAKE_REGISTRY": "1",
+    "PYTHONPATH": f"{ROOT / 'tests' / 'e2e_mocks'}{os.pathsep}{ROOT / 'src'}",
+}
+
+
+def spawn_mcp_stdio(env=None, capture_stderr=None):
+    """Spawn MCP server in stdio mode.
+
+    stderr goes to DEVNULL unless capture_stderr is set (or MCP_TEST_CAPTURE_STDERR is
+    in the environment): an unread stderr pipe can fill up and block the server.
+    """
+    if capture_stderr is None:
+        capture_stderr = bool(os.environ.get("MCP_TEST_CAPTURE_STDERR"))
+    cmd = [sys.executable, "-u", str(ENTRY), "mcp"]
+    proc = subprocess.Popen(
+        cmd,
+        cwd=str(ROOT),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if capture_stderr else subprocess.DEVNULL,
+        text=True,
+        env=env or os.environ.copy(),
+        bufsize=-1,
+        pipesize=PIPE_SIZE,
+    )
+    return proc
+
+
+def rpc_envelope(method, params=None, id_=1):
+    """Create a JSON-RPC 2.0 envelope."""
+    return json.dumps({"jsonrpc": "2.0", "id": id_, "method": method, "params": params or {}}) + "\n"
+
+
+@functools.lru_cache(maxsize=None)
+def initialize_envelope(id_=1):
+    """The initialize request is static apart from its id, so serialize it once per id."""
+    return rpc_envelope("initialize", INIT_PARAMS, id_=id_)
+
+
+def rpc_notification(method, params=None):
+    """Create a JSON-RPC 2.0 notification (no id, so the server sends no response)."""
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params or {}}) + "\n"
+
+
+INITIALIZED_NOTIFICATION = rpc_notification("notifications/initialized")
+
+
+def rpc_batch(envelopes) -> str:
+    """Join JSON-RPC envelopes into one newline-delimited write.
+
+    The MCP stdio transport rejects JSON-RPC batch arrays, so requests are
+    pipelined instead: one write, responses matched back up by id.
+    """
+    return "".join(envelopes)
+
+
+def send_json(proc, payload_str: str) -> None:
+    """Send JSON-RPC message to MCP server."""
+    assert proc.stdin is not None
+    proc.stdin.write(payload_str)
+    proc.stdin.flush()
+
+
+class _JsonRpcReader:
+    """Incrementally decode JSON-RPC messages from a pipe's raw file descriptor.
+
+    Bytes are read in large chunks and every complete message in the buffer is
+    decoded once, so pretty-printed or pipelined payloads are never re-parsed.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.buf = bytearray()
+        self.decoder = json.JSONDecoder()
+        self.eof = False
+
+    def _framed(self):
+        """Pop one LSP-style Content-Length frame; returns (complete, payload bytes)."""
+        sep = self.buf.find(b"\r\n\r\n")
+        sep_len = 4
+        if sep < 0:
+            sep = self.buf.find(b"\n\n")
+            sep_len = 2
+        if sep < 0:
+            return False, None
+        content_len = None
+        for header in bytes(self.buf[:sep]).splitlines():
+            name, _, value = header.partition(b":")
+            if name.strip().lower() == b"content-length":
+                try:
+                    content_len = int(value.strip())
+                except ValueError:
+                    content_len = None
+        start = sep + sep_len
+        if content_len is None:
+            # Malformed header block; drop it and continue with the stream
+            del self.buf[:start]
+            return True, None
+        if len(self.buf) < start + content_len:
+            return False, None
+        payload = bytes(self.buf[start:start + content_len])
+        del self.buf[:start + content_len]
+        return True, payload
+
+    def next_message(self):
+        """Return the next decoded message, or None if the buffer holds no complete one."""
+        while True:
+            del self.buf[:len(self.buf) - len(self.buf.lstrip())]
+            if not self.buf:
+                return None
+            if self.buf[:15].lower() == b"content-length:":
+                complete, payload = self._framed()
+                if not complete:
+                    return None
+                try:
+                    return json.loads(payload) if payload is not None else None
+                except ValueError:
+                    # Invalid JSON in LSP-framed payload; continue reading
+                    continue
+            if self.buf[:1] not in (b"{", b"["):
+                # Not JSON (e.g. a stray log line); skip to the next line
+                nl = self.buf.find(b"\n")
+                if nl < 0:
+                    return None
+                del self.buf[:nl + 1]
+                continue
+            try:
+                text = self.buf.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                # Trailing partial multi-byte sequence; decode what is complete
+                text = self.buf[:exc.start].decode("utf-8", errors="replace")
+            try:
+                obj, end = self.decoder.raw_decode(text)
+            except ValueError:
+                if self.eof:
+                    self.buf.clear()
+                # Incomplete message; wait for more bytes
+                return None
+            del self.buf[:len(text[:end].encode("utf-8"))]
+            return obj
+
+    def fill(self, timeout):
+        """Read whatever is available within timeout; returns False on EOF or timeout."""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        chunk = os.read(self.fd, 65536)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+
+_READERS = weakref.WeakKeyDictionary()
+
+
+def read_json_response(proc, expected_id=None, timeout=30):
+    """Read a JSON-RPC response supporting either line-delimited JSON or LSP-style Content-Length frames."""
+    assert proc.stdout is not None
+    reader = _READERS.get(proc)
+    if reader is None:
+        reader = _READERS[proc] = _JsonRpcReader(proc.stdout.fileno())
+    end = time.time() + timeout
+    while True:
+        obj = reader.next_message()
+        while obj is not None:
+            if expected_id is None or (isinstance(obj, dict) and obj.get("id") == expected_id):
+                return obj
+            obj = reader.next_message()
+        if reader.eof or not reader.fill(end - time.time()):
+            return None
+
+
+def read_json_responses(proc, expected_ids, timeout=30):
+    """Read responses for several pipelined requests; returns {id: response} (missing ids on timeout)."""
+    end = time.time() + timeout
+    responses = {}
+    while len(responses) < len(expected_ids):
+        remaining = end - time.time()
+        if remaining <= 0:
+            break
+        obj = read_json_response(proc, timeout=remaining)
+        if obj is None:
+            break
+        if obj.get("id") in expected_ids:
+            responses[obj["id"]] = obj
+    return responses
+
+
+# Server start plus initialize takes ~2s idle; allow for a loaded machine (pytest -n)
+_INIT_TIMEOUT = 30
+
+
+class McpSession:
+    """One initialized MCP stdio server shared by several tool calls."""
+
+    def __init__(self, env=None):
+        self._ids = itertools.count(1)
+        self.proc = spawn_mcp_stdio(env)
+        # No startup sleep: the initialize response is the readiness signal. The reader
+        # returns as soon as the server answers or closes stdout, so the deadline only
+        # needs to be generous enough for a slow start on a loaded (parallel) run.
+        # initialize and the initialized notification go out in one write; the server
+        # processes the stream in order, so later tools/call requests need no extra round trip
+        init_id = next(self._ids)
+        init_resp = None
+        try:
+            send_json(self.proc, rpc_batch([
+                initialize_envelope(init_id),
+                INITIALIZED_NOTIFICATION,
+            ]))
+            init_resp = read_json_response(self.proc, expected_id=init_id, timeout=_INIT_TIMEOUT)
+        except BrokenPipeError:
+            pass
+        if init_resp is None and self.proc.poll() is not None:
+            _, errs = self.proc.communicate(timeout=2)
+            if errs is None:
+                errs = "<not captured; set MCP_TEST_CAPTURE_STDERR=1>"
+            raise AssertionError(f"MCP server exited immediately. stderr: {errs}")
+        assert init_resp is not None, "No initialize response from MCP server"
+        assert init_resp.get("error") is None, f"Initialize error: {init_resp.get('error')}"
+
+    def request(self, method, params=None, timeout=30):
+        """Send one JSON-RPC request and return its response envelope (or None on timeout)."""
+        id_ = next(self._ids)
+        try:
+            send_json(self.proc, rpc_envelope(method, params, id_=id_))
+        except BrokenPipeError:
+            raise AssertionError(f"MCP stdio not available: server closed pipe on {method}")
+        return read_json_response(self.proc, expected_id=id_, timeout=timeout)
+
+    def call(self, tool, arguments, timeout=30):
+        """Invoke a tool via tools/call and return the response envelope."""
+        return self.request("tools/call", {"name": tool, "arguments": arguments}, timeout=timeout)
+
+    def close(self):
+        try:
+            if self.proc.stdin:
+                self.proc.stdin.close()
+            self.proc.terminate()
+            self.proc.wait(timeout=5)
+        except Exception:
+            # Process may already be terminated; ignore cleanup errors
+            pass
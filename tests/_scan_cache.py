@@ -0,0 +1,57 @@
+"""Test-only memoizer for scanner results keyed by fixture content hash.
+
+Tests that scan semantically identical fixtures share one materialized
+directory and one scan per (ecosystem, content, flags) in each process.
+Production code is untouched; exceptions (e.g. SystemExit) are not cached.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import importlib
+import shutil
+import tempfile
+from pathlib import Path
+
+_SCANNERS = {
+    "maven": "registry.maven.client",
+    "npm": "registry.npm.scan",
+    "pypi": "registry.pypi.scan",
+    "nuget": "registry.nuget.scan",
+}
+
+# content hash -> {relative path: bytes}, registered before the cached scan runs
+_CONTENT = {}
+
+_ROOT = tempfile.mkdtemp(prefix="depgate-scan-cache-")
+atexit.register(shutil.rmtree, _ROOT, True)
+
+
+def content_hash(files) -> bytes:
+    """Stable digest of a {relative path: bytes} fixture mapping."""
+    h = hashlib.sha1()
+    for rel in sorted(files):
+        h.update(rel.encode("utf-8") + b"\0")
+        h.update(files[rel] + b"\0")
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def cached_scan(kind, digest, recursive=False, direct_only=False, require_lockfile=False):
+    """Materialize the fixture for digest on first use and return the scan result as a tuple."""
+    root = Path(_ROOT) / digest.hex()
+    for rel, content in _CONTENT[digest].items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    scan_source = importlib.import_module(_SCANNERS[kind]).scan_source
+    return tuple(scan_source(str(root), recursive=recursive, direct_only=direct_only,
+                             require_lockfile=require_lockfile))
+
+
+def scan_files(kind, files, recursive=False, direct_only=False, require_lockfile=False):
+    """Scan a {relative path: bytes} fixture, reusing results for identical content and flags."""
+    digest = content_hash(files)
+    _CONTENT.setdefault(digest, files)
+    return cached_scan(kind, digest, recursive, direct_only, require_lockfile)
@@ -1,7 +1,59 @@
 # Ensure project root is on sys.path so 'import src.*' works in tests
 import os
 import sys
+from pathlib import Path
+
+import pytest
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
+
+
+def _write_tree(root, files):
+    """Write a {relative path: bytes} mapping under root; None creates an empty directory."""
+    root = Path(root)
+    for rel, content in files.items():
+        path = root / rel
+        if content is None:
+            path.mkdir(parents=True, exist_ok=True)
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+    return root
+
+
+@pytest.fixture(scope="session")
+def write_tree():
+    """Helper that materializes a fixture file mapping in one pass."""
+    return _write_tree
+
+
+@pytest.fixture
+def nuget_pkg():
+    """Fresh NuGet MetaPackage named TestPackage."""
+    from metapackage import MetaPackage
+
+    return MetaPackage("TestPackage", "nuget")
+
+
+@pytest.fixture
+def nuget_pkg_with_version(nuget_pkg):
+    """nuget_pkg with resolved_version preset to 1.0.0."""
+    nuget_pkg.resolved_version = "1.0.0"
+    return nuget_pkg
+
+
+@pytest.fixture(scope="session")
+def mcp_server():
+    """One initialized MCP stdio server per session; tests only issue tools/call."""
+    pytest.importorskip("mcp")
+    from _mcp_util import FAKE_REGISTRY_ENV, McpSession
+
+    # Fake registries keep tool calls off the network
+    env = dict(FAKE_REGISTRY_ENV)
+    session = McpSession(env)
+    try:
+        yield session
+    finally:
+        session.close()
@@ -1,4 +1,6 @@
+import importlib
 import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
@@ -14,162 +16,139 @@ class DummyResponse:
 
 def _make_repo_ref(normalized_url, host, owner, repo, directory=None):
     # Minimal object with attributes used by registry modules
-    class _Ref:
-        def __init__(self):
-            self.normalized_url = normalized_url
-            self.host = host
-            self.owner = owner
-            self.repo = repo
-            self.directory = directory
-    return _Ref()
-
-
-def test_e2e_pypi_rtd_resolution(monkeypatch):
-    # Arrange: fake Warehouse JSON with RTD documentation link
-    pkg_name = "rtdpkg"
-    mp = MetaPackage(pkg_name)
-
-    pypi_json = {
-        "info": {
-            "version": "1.0.0",
-            "project_urls": {"Documentation": f"https://{pkg_name}.readthedocs.io/"},
-            "home_page": "https://example.com"
-        },
-        "releases": {
-            "1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00.000Z"}]
+    return SimpleNamespace(
+        normalized_url=normalized_url,
+        host=host,
+        owner=owner,
+        repo=repo,
+        directory=directory,
+    )
+
+
+PYPI_JSON = {
+    "info": {
+        "version": "1.0.0",
+        "project_urls": {"Documentation": "https://rtdpkg.readthedocs.io/"},
+        "home_page": "https://example.com"
+    },
+    "releases": {
+        "1.0.0": [{"upload_time_iso_8601": "2023-01-01T00:00:00.000Z"}]
+    }
+}
+
+# Packument with repository object including monorepo directory
+NPM_PACKUMENT = {
+    "dist-tags": {"latest": "7.0.0"},
+    "versions": {
+        "7.0.0": {
+            "repository": {
+                "type": "git",
+                "url": "git+https://github.com/babel/babel.git",
+                "directory": "packages/babel-core"
+            },
+            "bugs": "https://github.com/babel/babel/issues"
         }
     }
+}
 
-    # Patch registry.pypi safe_get to return our JSON
-    import registry.pypi as pypi_mod
-    def fake_safe_get(url, context=None, params=None, headers=None):
-        return DummyResponse(200, json.dumps(pypi_json))
-    monkeypatch.setattr(pypi_mod, "safe_get", fake_safe_get)
 
+def _arrange_pypi(monkeypatch, mod):
+    # Patch registry.pypi safe_get to return our JSON
+    body = json.dumps(PYPI_JSON)
+    monkeypatch.setattr(mod, "safe_get", lambda url, context=None, params=None, headers=None: DummyResponse(200, body))
     # Resolve RTD -> repo and normalize
-    monkeypatch.setattr(pypi_mod, "_maybe_resolve_via_rtd", lambda u: "https://github.com/owner/repo")
-    monkeypatch.setattr(pypi_mod, "normalize_repo_url",
+    monkeypatch.setattr(mod, "_maybe_resolve_via_rtd", lambda u: "https://github.com/owner/repo")
+    monkeypatch.setattr(mod, "normalize_repo_url",
                         lambda url: _make_repo_ref("https://github.com/owner/repo", "github", "owner", "repo"))
 
-    # Stub GitHub client and version matcher
-    class GHClientStub:
-        def get_repo(self, owner, repo):
-            return {"stargazers_count": 123, "pushed_at": "2023-02-01T00:00:00Z"}
-        def get_contributors_count(self, owner, repo):
-            return 10
-        def get_releases(self, owner, repo):
-            return [{"name": "v1.0.0", "tag_name": "v1.0.0"}]
-    monkeypatch.setattr(pypi_mod, "GitHubClient", lambda: GHClientStub())
-
-    vm = MagicMock()
-    vm.find_match.return_value = {"matched": True, "match_type": "exact", "artifact": {"name": "v1.0.0"}, "tag_or_release": "v1.0.0"}
-    monkeypatch.setattr(pypi_mod, "VersionMatcher", lambda: vm)
-
-    # Act
-    pypi_mod.recv_pkg_info([mp])
-
-    # Assert
-    assert mp.repo_url_normalized == "https://github.com/owner/repo"
-    assert mp.repo_resolved is True
-    assert mp.repo_exists is True
-    assert mp.repo_version_match and mp.repo_version_match.get("matched") is True
-    # rtd slug should be inferred from docs host
-    assert mp.provenance and mp.provenance.get("rtd_slug") == pkg_name
-
-
-def test_e2e_npm_monorepo_repository_object(monkeypatch):
-    # Arrange: packument with repository object including monorepo directory
-    pkg_name = "babel-core"
-    mp = MetaPackage(pkg_name)
-
-    packument = {
-        "dist-tags": {"latest": "7.0.0"},
-        "versions": {
-            "7.0.0": {
-                "repository": {
-                    "type": "git",
-                    "url": "git+https://github.com/babel/babel.git",
-                    "directory": "packages/babel-core"
-                },
-                "bugs": "https://github.com/babel/babel/issues"
-            }
-        }
-    }
-
-    import registry.npm as npm_mod
-
-    def fake_safe_get(url, context=None, params=None, headers=None):
-        # get_package_details concatenates url + pkg_name; ignore and return packument
-        return DummyResponse(200, json.dumps(packument))
-    monkeypatch.setattr(npm_mod, "safe_get", fake_safe_get)
 
+def _arrange_npm(monkeypatch, mod):
+    # get_package_details concatenates url + pkg_name; ignore and return packument
+    body = json.dumps(NPM_PACKUMENT)
+    monkeypatch.setattr(mod, "safe_get", lambda url, context=None, params=None, headers=None: DummyResponse(200, body))
     # Normalize repo URL; preserve directory hint in object (not used for API)
-    monkeypatch.setattr(npm_mod, "normalize_repo_url",
+    monkeypatch.setattr(mod, "normalize_repo_url",
                         lambda u, d=None: _make_repo_ref("https://github.com/babel/babel", "github", "babel", "babel", d))
 
-    class GHClientStub:
-        def get_repo(self, owner, repo):
-            return {"stargazers_count": 60000, "pushed_at": "2023-04-01T00:00:00Z"}
-        def get_contributors_count(self, owner, repo):
-            return 400
-        def get_releases(self, owner, repo):
-            return [{"name": "7.0.0", "tag_name": "7.0.0"}]
-    monkeypatch.setattr(npm_mod, "GitHubClient", lambda: GHClientStub())
-    vm = MagicMock()
-    vm.find_match.return_value = {"matched": True, "match_type": "exact", "artifact": {"name": "7.0.0"}, "tag_or_release": "7.0.0"}
-    monkeypatch.setattr(npm_mod, "VersionMatcher", lambda: vm)
-
-    # Act
-    npm_mod.get_package_details(mp, url="https://registry.npmjs.org/")
-
-    # Assert
-    assert mp.repo_url_normalized == "https://github.com/babel/babel"
-    assert mp.repo_resolved is True
-    assert mp.repo_exists is True
-    assert mp.repo_version_match and mp.repo_version_match.get("matched") is True
-    # Provenance should capture repository field + directory
-    assert mp.provenance is not None
-    assert mp.provenance.get("npm_repository_field") == "git+https://github.com/babel/babel.git"
-    assert mp.provenance.get("npm_repository_directory") == "packages/babel-core"
-
-
-def test_e2e_maven_parent_scm(monkeypatch):
-    # Arrange: traversal returns wrapper with scm + provenance
-    coords = ("org.apache.commons", "commons-lang3")
-    mp = MetaPackage(f"{coords[0]}:{coords[1]}")
 
-    import registry.maven as maven_mod
-
-    monkeypatch.setattr(maven_mod, "_resolve_latest_version", lambda g, a: "1.2.3")
+def _arrange_maven(monkeypatch, mod):
+    # Traversal returns wrapper with scm + provenance
+    monkeypatch.setattr(mod, "_resolve_latest_version", lambda g, a: "1.2.3")
     def fake_traverse_for_scm(group, artifact, version, provenance, depth=0, max_depth=8):
         return {
             "scm": {"url": "https://github.com/example/project"},
             "provenance": {"maven_pom.scm.url": "https://github.com/example/project"}
         }
-    monkeypatch.setattr(maven_mod, "_traverse_for_scm", fake_traverse_for_scm)
-
+    monkeypatch.setattr(mod, "_traverse_for_scm", fake_traverse_for_scm)
     # Normalize to canonical URL
-    monkeypatch.setattr(maven_mod, "normalize_repo_url",
+    monkeypatch.setattr(mod, "normalize_repo_url",
                         lambda u: _make_repo_ref("https://github.com/example/project", "github", "example", "project"))
 
+
+# (ecosystem, module, package name, arrange, act, repo stub data, release name, expected url, expected provenance)
+CASES = [
+    (
+        "pypi", "registry.pypi", "rtdpkg", _arrange_pypi,
+        lambda mod, mp: mod.recv_pkg_info([mp]),
+        {"stargazers_count": 123, "pushed_at": "2023-02-01T00:00:00Z"}, 10, "v1.0.0",
+        "https://github.com/owner/repo",
+        # rtd slug should be inferred from docs host
+        {"rtd_slug": "rtdpkg"},
+    ),
+    (
+        "npm", "registry.npm", "babel-core", _arrange_npm,
+        lambda mod, mp: mod.get_package_details(mp, url="https://registry.npmjs.org/"),
+        {"stargazers_count": 60000, "pushed_at": "2023-04-01T00:00:00Z"}, 400, "7.0.0",
+        "https://github.com/babel/babel",
+        # Provenance should capture repository field + directory
+        {
+            "npm_repository_field": "git+https://github.com/babel/babel.git",
+            "npm_repository_directory": "packages/babel-core",
+        },
+    ),
+    (
+        "maven", "registry.maven", "org.apache.commons:commons-lang3", _arrange_maven,
+        lambda mod, mp: mod._enrich_with_repo(mp, "org.apache.commons", "commons-lang3", None),
+        {"stargazers_count": 123, "pushed_at": "2023-01-01T00:00:00Z"}, 10, "1.2.3",
+        "https://github.com/example/project",
+        {"maven_pom.scm.url": "https://github.com/example/project"},
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "ecosystem,module,pkg_name,arrange,act,repo_data,contributors,release,expected_url,expected_provenance",
+    CASES,
+    ids=[c[0] for c in CASES],
+)
+def test_e2e_repo_discovery(monkeypatch, ecosystem, module, pkg_name, arrange, act,
+                            repo_data, contributors, release, expected_url, expected_provenance):
+    mod = importlib.import_module(module)
+    mp = MetaPackage(pkg_name)
+    arrange(monkeypatch, mod)
+
+    # Stub GitHub client and version matcher
     class GHClientStub:
         def get_repo(self, owner, repo):
-            return {"stargazers_count": 123, "pushed_at": "2023-01-01T00:00:00Z"}
+            return repo_data
         def get_contributors_count(self, owner, repo):
-            return 10
+            return contributors
         def get_releases(self, owner, repo):
-            return [{"name": "1.2.3", "tag_name": "1.2.3"}]
-    monkeypatch.setattr(maven_mod, "GitHubClient", lambda: GHClientStub())
+            return [{"name": release, "tag_name": release}]
+    monkeypatch.setattr(mod, "GitHubClient", lambda: GHClientStub())
+
     vm = MagicMock()
-    vm.find_match.return_value = {"matched": True, "match_type": "exact", "artifact": {"name": "1.2.3"}, "tag_or_release": "1.2.3"}
-    monkeypatch.setattr(maven_mod, "VersionMatcher", lambda: vm)
+    vm.find_match.return_value = {"matched": True, "match_type": "exact", "artifact": {"name": release}, "tag_or_release": release}
+    monkeypatch.setattr(mod, "VersionMatcher", lambda: vm)
 
     # Act
-    maven_mod._enrich_with_repo(mp, coords[0], coords[1], None)
+    act(mod, mp)
 
     # Assert
-    assert mp.repo_url_normalized == "https://github.com/example/project"
+    assert mp.repo_url_normalized == expected_url
     assert mp.repo_resolved is True
     assert mp.repo_exists is True
     assert mp.repo_version_match and mp.repo_version_match.get("matched") is True
-    assert mp.provenance and mp.provenance.get("maven_pom.scm.url") == "https://github.com/example/project"
+    assert mp.provenance is not None
+    for key, value in expected_provenance.items():
+        assert mp.provenance.get(key) == value
@@ -1,6 +1,8 @@
 import os
 import json
+import time
 from datetime import datetime, timedelta
+from urllib.parse import unquote as _unquote
 
 import requests as _requests
 
@@ -24,11 +26,37 @@ class MockResponse:
     def json(self):
         return json.loads(self.text)
 
+_ISO_OLD = "2015-01-01T00:00:00.000Z"
+
+# [timestamp, formatted] of the last _iso_now() computation; refreshed at most once per second
+_NOW_CACHE = [0.0, ""]
+
 def _iso_now():
-    return datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z")
+    t = time.time()
+    if t - _NOW_CACHE[0] > 1.0:
+        _NOW_CACHE[:] = [t, time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(t))]
+    return _NOW_CACHE[1]
+
+# Serialized npms.io mget responses keyed by the raw POST body
+_MGET_CACHE = {}
+
+_NUGET_REGISTRATION_BASE = "https://api.nuget.org/v3/registration5-gz-semver2/"
 
-def _iso_old():
-    return "2015-01-01T00:00:00.000Z"
+# Canned NuGet package versions (lower-cased ids as they appear in registration URLs)
+_NUGET_PACKAGES = {
+    "newtonsoft.json": ["13.0.1", "13.0.3"],
+    "microsoft.aspnetcore.openapi": ["8.0.0", "8.0.16"],
+    "system.identitymodel.tokens.jwt": ["8.0.0", "8.9.0"],
+    "nlog.web.aspnetcore": ["5.3.0", "5.4.0"],
+    "swashbuckle.aspnetcore": ["8.0.0", "8.1.1"],
+}
+
+def _nuget_registration(package_id, versions):
+    entries = [
+        {"catalogEntry": {"id": package_id, "version": ver, "published": _ISO_OLD}}
+        for ver in versions
+    ]
+    return {"count": 1, "items": [{"count": len(entries), "items": entries}]}
 
 def _maven_doc(timestamp_ms=None, version_count=3):
     if timestamp_ms is None:
@@ -51,8 +79,7 @@ def _fake_get(url, timeout=None, headers=None, params=None, **kwargs):
     if "registry.npmjs.org/" in url:
         pkg = url.rsplit("/", 1)[-1]
         # URL decode if needed
-        import urllib.parse
-        pkg = urllib.parse.unquote(pkg)
+        pkg = _unquote(pkg)
         if pkg == "missing-pkg":
             return MockResponse(404, text="{}")
         versions = {"1.0.0": {}, "1.0.1": {}, "1.3.0": {}}
@@ -87,18 +114,18 @@ def _fake_get(url, timeout=None, headers=None, params=None, **kwargs):
             return MockResponse(404, text="{}")
         releases = {}
         if name == "pypi-short":
-            releases = {"0.0.1": [{"upload_time_iso_8601": _iso_old()}]}
+            releases = {"0.0.1": [{"upload_time_iso_8601": _ISO_OLD}]}
         elif name == "pypi-new":
             # New package: ensure "new" signal (latest is now) without triggering minVersions risk
             releases = {
-                "0.9.0": [{"upload_time_iso_8601": _iso_old()}],
+                "0.9.0": [{"upload_time_iso_8601": _ISO_OLD}],
                 "1.0.0": [{"upload_time_iso_8601": _iso_now()}],
             }
         else:
             releases = {
-                "1.0.0": [{"upload_time_iso_8601": _iso_old()}],
-                "1.1.0": [{"upload_time_iso_8601": _iso_old()}],
-                "2.0.0": [{"upload_time_iso_8601": _iso_old()}],
+                "1.0.0": [{"upload_time_iso_8601": _ISO_OLD}],
+                "1.1.0": [{"upload_time_iso_8601": _ISO_OLD}],
+                "2.0.0": [{"upload_time_iso_8601": _ISO_OLD}],
             }
         data = {"info": {"version": list(releases.keys())[-1]}, "releases": releases}
         return MockResponse(200, data=data)
@@ -121,6 +148,19 @@ def _fake_get(url, timeout=None, headers=None, params=None, **kwargs):
             data = {"response": {"numFound": 0, "docs": []}}
         return MockResponse(200, data=data)
 
+    # NuGet V3 service index and registration index
+    if url.startswith("https://api.nuget.org/v3/index.json"):
+        data = {"version": "3.0.0", "resources": [
+            {"@id": _NUGET_REGISTRATION_BASE, "@type": "RegistrationsBaseUrl/3.6.0"},
+        ]}
+        return MockResponse(200, data=data)
+    if url.startswith(_NUGET_REGISTRATION_BASE) and url.endswith("/index.json"):
+        package_id = _unquote(url[len(_NUGET_REGISTRATION_BASE):-len("/index.json")])
+        versions = _NUGET_PACKAGES.get(package_id)
+        if versions is None:
+            return MockResponse(404, text="{}")
+        return MockResponse(200, data=_nuget_registration(package_id, versions))
+
     # pypistats.org weekly downloads API
     if "pypistats.org/api/packages/" in url and url.endswith("/recent"):
         data = {"data": {"last_week": 50000}}
@@ -142,11 +182,16 @@ def _fake_post(url, data=None, timeout=None, headers=None, **kwargs):
 
     # NPM mget POST
     if "api.npms.io/v2/package/mget" in url:
+        key = data if isinstance(data, (str, bytes)) or data is None else json.dumps(sorted(data))
+        cached = _MGET_CACHE.get(key)
+        if cached is not None:
+            return MockResponse(200, text=cached)
         try:
             names = json.loads(data or "[]")
         except Exception:
             names = []
         mapping = {}
+        time_dependent = False
         for name in names:
             if name == "missing-pkg":
                 # omit to simulate missing
@@ -154,11 +199,16 @@ def _fake_post(url, data=None, timeout=None, headers=None, **kwargs):
             score = 0.9
             if name == "badscore-pkg":
                 score = 0.1
-            date = _iso_old()
+            date = _ISO_OLD
             if name == "newpkg":
                 date = _iso_now()
+                time_dependent = True
             mapping[name] = {"score": {"final": score}, "collected": {"metadata": {"date": date}}}
-        return MockResponse(200, data=mapping)
+        text = json.dumps(mapping)
+        # Responses carrying "now" must stay fresh, so only static mappings are cached
+        if not time_dependent:
+            _MGET_CACHE[key] = text
+        return MockResponse(200, text=text)
 
     return _REAL_POST(url, data=data, timeout=timeout, headers=headers, **kwargs)
 
@@ -4,7 +4,8 @@ import os
 # This script is intended for testing full-cycle from reading Bill of Materials
 # and to push the output as arguments for depgate to evaluate
 
-with open(os.path.join("tests", "package.json"), "r") as file:
-    body = file.read()
-    filex = json.loads(body)
+# json.load decodes straight from the file object; only the top-level
+# "dependencies" key is read, never a same-named key nested elsewhere.
+with open(os.path.join("tests", "package.json"), "rb") as file:
+    filex = json.load(file)
 print(list(filex['dependencies'].keys()))
@@ -19,3 +19,11 @@ def test_parse_policy_preset_args():
     )
     assert ns.POLICY_PRESET == "supply-chain"
     assert ns.POLICY_MIN_RELEASE_AGE_DAYS == 7
+
+
+def test_parse_args_reuses_parser_without_leaking_state():
+    first = parse_args(["scan", "-t", "npm", "-l", "a.txt", "--policy-preset", "supply-chain"])
+    second = parse_args(["scan", "-t", "npm", "-l", "b.txt"])
+    assert first.LIST_FROM_FILE == ["a.txt"]
+    assert second.LIST_FROM_FILE == ["b.txt"]
+    assert second.POLICY_PRESET != "supply-chain"
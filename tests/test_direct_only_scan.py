@@ -1,70 +1,46 @@
 """Tests for direct-only dependency scanning mode."""
 from __future__ import annotations
 
-import os
-import tempfile
 import json
 
-from registry.npm.scan import scan_source as npm_scan_source
-from registry.pypi.scan import scan_source as pypi_scan_source
-from registry.nuget.scan import scan_source as nuget_scan_source
-from registry.maven.client import scan_source as maven_scan_source
+import pytest
 
 
-def test_npm_direct_only_with_lockfile():
-    """Test that direct-only mode uses package.json even when lockfile exists."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create package.json with direct dependencies
-        package_json = {
-            "dependencies": {
-                "express": "^4.18.0",
-                "lodash": "^4.17.21"
-            },
-            "devDependencies": {
-                "jest": "^29.0.0"
-            }
-        }
-        with open(os.path.join(tmpdir, "package.json"), "w") as f:
-            json.dump(package_json, f)
-
-        # Create package-lock.json with transitive dependencies
-        package_lock = {
-            "name": "test",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "dependencies": {
-                "express": {
-                    "version": "4.18.2",
-                    "dependencies": {
-                        "accepts": {"version": "1.3.8"},
-                        "array-flatten": {"version": "1.1.1"}
-                    }
-                },
-                "lodash": {"version": "4.17.21"},
-                "jest": {"version": "29.7.0"}
-            }
-        }
-        with open(os.path.join(tmpdir, "package-lock.json"), "w") as f:
-            json.dump(package_lock, f)
-
-        # Test direct-only mode: should only return direct deps
-        deps_direct = npm_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
-        assert set(deps_direct) == {"express", "lodash", "jest"}
+def _json_bytes(data) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
 
-        # Test normal mode: should return all deps from lockfile
-        deps_all = npm_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "express" in deps_all
-        assert "lodash" in deps_all
-        assert "jest" in deps_all
-        # Should also include transitive deps
-        assert "accepts" in deps_all or "array-flatten" in deps_all
 
+# package.json with direct dependencies
+NPM_PACKAGE_JSON = _json_bytes({
+    "dependencies": {
+        "express": "^4.18.0",
+        "lodash": "^4.17.21"
+    },
+    "devDependencies": {
+        "jest": "^29.0.0"
+    }
+})
 
-def test_pypi_direct_only_with_lockfile():
-    """Test that direct-only mode uses manifest even when lockfile exists."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create pyproject.toml with direct dependencies
-        pyproject_content = """[project]
+# package-lock.json with transitive dependencies
+NPM_PACKAGE_LOCK = _json_bytes({
+    "name": "test",
+    "version": "1.0.0",
+    "lockfileVersion": 2,
+    "dependencies": {
+        "express": {
+            "version": "4.18.2",
+            "dependencies": {
+                "accepts": {"version": "1.3.8"},
+                "array-flatten": {"version": "1.1.1"}
+            }
+        },
+        "lodash": {"version": "4.17.21"},
+        "jest": {"version": "29.7.0"}
+    }
+})
+
+# pyproject.toml with direct dependencies
+PYPROJECT_TOML = b"""[project]
 name = "test"
 dependencies = [
     "requests>=2.28.0",
@@ -73,11 +49,9 @@ dependencies = [
 
 [tool.uv]
 """
-        with open(os.path.join(tmpdir, "pyproject.toml"), "w") as f:
-            f.write(pyproject_content)
 
-        # Create uv.lock with transitive dependencies (simplified)
-        uv_lock_content = """version = 1
+# uv.lock with transitive dependencies (simplified)
+UV_LOCK = b"""version = 1
 [[package]]
 name = "requests"
 version = "2.28.2"
@@ -98,45 +72,16 @@ version = "1.26.14"
 name = "certifi"
 version = "2022.12.7"
 """
-        with open(os.path.join(tmpdir, "uv.lock"), "w") as f:
-            f.write(uv_lock_content)
-
-        # Test direct-only mode: should only return direct deps
-        deps_direct = pypi_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
-        assert set(deps_direct) == {"requests", "click"}
-
-        # Test normal mode: should return all deps from lockfile
-        deps_all = pypi_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "requests" in deps_all
-        assert "click" in deps_all
-        # Should also include transitive deps
-        assert "urllib3" in deps_all or "certifi" in deps_all
-
 
-def test_nuget_direct_only():
-    """Test that direct-only mode works for NuGet (already default behavior)."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a simple .csproj file
-        csproj_content = """<Project Sdk="Microsoft.NET.Sdk">
+CSPROJ = b"""<Project Sdk="Microsoft.NET.Sdk">
   <ItemGroup>
     <PackageReference Include="Newtonsoft.Json" Version="13.0.1" />
     <PackageReference Include="Serilog" Version="2.12.0" />
   </ItemGroup>
 </Project>
 """
-        with open(os.path.join(tmpdir, "test.csproj"), "w") as f:
-            f.write(csproj_content)
-
-        # NuGet always scans direct dependencies only (no lockfile parsing)
-        deps = nuget_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
-        assert set(deps) == {"Newtonsoft.Json", "Serilog"}
-
 
-def test_maven_direct_only():
-    """Test that direct-only mode works for Maven (already default behavior)."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a simple pom.xml
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+POM_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -156,61 +101,112 @@ def test_maven_direct_only():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
 
-        # Maven always scans direct dependencies only
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
-        assert set(deps) == {"junit:junit", "org.mockito:mockito-core"}
+ROOT_PYPROJECT = b"""[project]
+name = "root"
+dependencies = ["requests>=2.28.0"]
+"""
 
+SUB_PYPROJECT = b"""[project]
+name = "sub"
+dependencies = ["click>=8.0.0"]
+"""
 
-def test_npm_direct_only_recursive():
-    """Test direct-only mode with recursive scanning for npm."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create nested project structure
-        subdir = os.path.join(tmpdir, "subproject")
-        os.makedirs(subdir)
+# Expected direct dependency names per ecosystem
+NPM_DIRECT = frozenset({"express", "lodash", "jest"})
+PYPI_DIRECT = frozenset({"requests", "click"})
+NUGET_DIRECT = frozenset({"Newtonsoft.Json", "Serilog"})
+MAVEN_DIRECT = frozenset({"junit:junit", "org.mockito:mockito-core"})
+
+# Read-only scan fixtures: relative file path -> pre-encoded content
+_SCAN_TREE = {
+    "npm_lockfile/package.json": NPM_PACKAGE_JSON,
+    "npm_lockfile/package-lock.json": NPM_PACKAGE_LOCK,
+    "pypi_lockfile/pyproject.toml": PYPROJECT_TOML,
+    "pypi_lockfile/uv.lock": UV_LOCK,
+    "nuget/test.csproj": CSPROJ,
+    "maven/pom.xml": POM_XML,
+    "npm_recursive/package.json": _json_bytes({"dependencies": {"express": "^4.18.0"}}),
+    "npm_recursive/subproject/package.json": _json_bytes({"dependencies": {"lodash": "^4.17.21"}}),
+    "pypi_recursive/pyproject.toml": ROOT_PYPROJECT,
+    "pypi_recursive/subproject/pyproject.toml": SUB_PYPROJECT,
+}
+
+
+@pytest.fixture(scope="session")
+def scan_tree(tmp_path_factory, write_tree):
+    """Materialize every project layout once; scanners only read from it."""
+    return write_tree(tmp_path_factory.mktemp("direct_only"), _SCAN_TREE)
+
+
+def test_npm_direct_only_with_lockfile(scan_tree):
+    """Test that direct-only mode uses package.json even when lockfile exists."""
+    from registry.npm.scan import scan_source as npm_scan_source
 
-        # Root package.json
-        root_package = {"dependencies": {"express": "^4.18.0"}}
-        with open(os.path.join(tmpdir, "package.json"), "w") as f:
-            json.dump(root_package, f)
+    tmpdir = str(scan_tree / "npm_lockfile")
 
-        # Subdirectory package.json
-        sub_package = {"dependencies": {"lodash": "^4.17.21"}}
-        with open(os.path.join(subdir, "package.json"), "w") as f:
-            json.dump(sub_package, f)
+    # Test direct-only mode: should only return direct deps
+    deps_direct = npm_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
+    assert NPM_DIRECT.issubset(deps_direct) and len(set(deps_direct)) == len(NPM_DIRECT)
 
-        # Test direct-only recursive mode
-        deps = npm_scan_source(tmpdir, recursive=True, direct_only=True, require_lockfile=False)
-        assert "express" in deps
-        assert "lodash" in deps
+    # Test normal mode: should return all deps from lockfile
+    deps_all = npm_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+    assert "express" in deps_all
+    assert "lodash" in deps_all
+    assert "jest" in deps_all
+    # Should also include transitive deps
+    assert "accepts" in deps_all or "array-flatten" in deps_all
 
 
-def test_pypi_direct_only_recursive():
-    """Test direct-only mode with recursive scanning for pypi."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create nested project structure
-        subdir = os.path.join(tmpdir, "subproject")
-        os.makedirs(subdir)
+def test_pypi_direct_only_with_lockfile(scan_tree):
+    """Test that direct-only mode uses manifest even when lockfile exists."""
+    from registry.pypi.scan import scan_source as pypi_scan_source
 
-        # Root pyproject.toml
-        root_pyproject = """[project]
-name = "root"
-dependencies = ["requests>=2.28.0"]
-"""
-        with open(os.path.join(tmpdir, "pyproject.toml"), "w") as f:
-            f.write(root_pyproject)
+    tmpdir = str(scan_tree / "pypi_lockfile")
 
-        # Subdirectory pyproject.toml
-        sub_pyproject = """[project]
-name = "sub"
-dependencies = ["click>=8.0.0"]
-"""
-        with open(os.path.join(subdir, "pyproject.toml"), "w") as f:
-            f.write(sub_pyproject)
+    # Test direct-only mode: should only return direct deps
+    deps_direct = pypi_scan_source(tmpdir, recursive=False, direct_only=True, require_lockfile=False)
+    assert PYPI_DIRECT.issubset(deps_direct) and len(set(deps_direct)) == len(PYPI_DIRECT)
+
+    # Test normal mode: should return all deps from lockfile
+    deps_all = pypi_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+    assert "requests" in deps_all
+    assert "click" in deps_all
+    # Should also include transitive deps
+    assert "urllib3" in deps_all or "certifi" in deps_all
+
+
+def test_nuget_direct_only(scan_tree):
+    """Test that direct-only mode works for NuGet (already default behavior)."""
+    from registry.nuget.scan import scan_source as nuget_scan_source
+
+    # NuGet always scans direct dependencies only (no lockfile parsing)
+    deps = nuget_scan_source(str(scan_tree / "nuget"), recursive=False, direct_only=True, require_lockfile=False)
+    assert NUGET_DIRECT.issubset(deps) and len(set(deps)) == len(NUGET_DIRECT)
+
+
+def test_maven_direct_only(scan_tree):
+    """Test that direct-only mode works for Maven (already default behavior)."""
+    from registry.maven.client import scan_source as maven_scan_source
+
+    # Maven always scans direct dependencies only
+    deps = maven_scan_source(str(scan_tree / "maven"), recursive=False, direct_only=True, require_lockfile=False)
+    assert MAVEN_DIRECT.issubset(deps) and len(set(deps)) == len(MAVEN_DIRECT)
+
+
+def test_npm_direct_only_recursive(scan_tree):
+    """Test direct-only mode with recursive scanning for npm."""
+    from registry.npm.scan import scan_source as npm_scan_source
+
+    deps = npm_scan_source(str(scan_tree / "npm_recursive"), recursive=True, direct_only=True, require_lockfile=False)
+    assert "express" in deps
+    assert "lodash" in deps
+
+
+def test_pypi_direct_only_recursive(scan_tree):
+    """Test direct-only mode with recursive scanning for pypi."""
+    from registry.pypi.scan import scan_source as pypi_scan_source
 
-        # Test direct-only recursive mode
-        deps = pypi_scan_source(tmpdir, recursive=True, direct_only=True, require_lockfile=False)
-        assert "requests" in deps
-        assert "click" in deps
+    deps = pypi_scan_source(str(scan_tree / "pypi_recursive"), recursive=True, direct_only=True, require_lockfile=False)
+    assert "requests" in deps
+    assert "click" in deps
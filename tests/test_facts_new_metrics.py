@@ -6,34 +6,51 @@ from metapackage import MetaPackage
 from analysis.facts import FactBuilder
 
 
+# Baseline metric attributes; tests override individual fields via _mp(**kw)
+_BASE = {
+    "weekly_downloads": 50000,
+    "download_count": 1000000,
+    "repo_forks": 25,
+    "repo_open_issues": 10,
+    "repo_open_prs": 3,
+    "repo_last_commit_at": "2023-12-01T10:00:00Z",
+    "repo_last_merged_pr_at": "2023-11-15T10:00:00Z",
+    "repo_last_closed_issue_at": "2023-11-20T10:00:00Z",
+    "release_age_days": 10,
+    "trust_score": 0.75,
+    "previous_trust_score": 0.5,
+    "trust_score_delta": 0.25,
+    "trust_score_decreased": False,
+    "provenance_present": True,
+    "previous_provenance_present": False,
+    "provenance_regressed": False,
+    "registry_signature_present": True,
+    "previous_registry_signature_present": True,
+    "registry_signature_regressed": False,
+    "previous_release_version": "1.0.0",
+}
+
+
+def _mp(**kw):
+    mp = MetaPackage("test-package", "npm")
+    for key, value in {**_BASE, **kw}.items():
+        setattr(mp, key, value)
+    return mp
+
+
+@pytest.fixture(scope="class")
+def builder():
+    """Shared FactBuilder; no test registers extractors, so it stays stateless."""
+    return FactBuilder()
+
+
 class TestFactsBuilderNewMetrics:
     """Test FactBuilder with new metrics."""
 
-    def test_facts_includes_new_metrics(self):
+    def test_facts_includes_new_metrics(self, builder):
         """Test that facts include all new metrics."""
-        mp = MetaPackage("test-package", "npm")
-        mp.weekly_downloads = 50000
-        mp.download_count = 1000000
-        mp.repo_forks = 25
-        mp.repo_open_issues = 10
-        mp.repo_open_prs = 3
-        mp.repo_last_commit_at = "2023-12-01T10:00:00Z"
-        mp.repo_last_merged_pr_at = "2023-11-15T10:00:00Z"
-        mp.repo_last_closed_issue_at = "2023-11-20T10:00:00Z"
-        mp.release_age_days = 10
-        mp.trust_score = 0.75
-        mp.previous_trust_score = 0.5
-        mp.trust_score_delta = 0.25
-        mp.trust_score_decreased = False
-        mp.provenance_present = True
-        mp.previous_provenance_present = False
-        mp.provenance_regressed = False
-        mp.registry_signature_present = True
-        mp.previous_registry_signature_present = True
-        mp.registry_signature_regressed = False
-        mp.previous_release_version = "1.0.0"
-
-        builder = FactBuilder()
+        mp = _mp()
+
         facts = builder.build_facts(mp)
 
         assert facts["weekly_downloads"] == 50000
@@ -56,12 +73,11 @@ class TestFactsBuilderNewMetrics:
         assert facts["registry_signature_regressed"] is False
         assert facts["previous_release_version"] == "1.0.0"
 
-    def test_facts_new_metrics_none(self):
+    def test_facts_new_metrics_none(self, builder):
         """Test that facts handle None values for new metrics."""
         mp = MetaPackage("test-package", "npm")
         # Leave all new metrics as None
 
-        builder = FactBuilder()
         facts = builder.build_facts(mp)
 
         assert facts["weekly_downloads"] is None
@@ -76,25 +92,20 @@ class TestFactsBuilderNewMetrics:
         assert facts["provenance_present"] is None
         assert facts["registry_signature_present"] is None
 
-    def test_facts_all_metrics_present(self):
+    def test_facts_all_metrics_present(self, builder):
         """Test facts with all metrics including new ones."""
-        mp = MetaPackage("test-package", "npm")
-        mp.score = 0.8
-        mp.repo_stars = 1000
-        mp.repo_contributors = 50
-        mp.weekly_downloads = 75000
-        mp.repo_forks = 100
-        mp.repo_open_issues = 5
-        mp.repo_open_prs = 2
-        mp.repo_last_commit_at = "2023-12-01T10:00:00Z"
-        mp.repo_last_merged_pr_at = "2023-11-15T10:00:00Z"
-        mp.repo_last_closed_issue_at = "2023-11-20T10:00:00Z"
-        mp.repo_version_match = {"matched": True}
-        mp.trust_score = 1.0
-        mp.provenance_present = True
-        mp.registry_signature_present = True
-
-        builder = FactBuilder()
+        mp = _mp(
+            score=0.8,
+            repo_stars=1000,
+            repo_contributors=50,
+            weekly_downloads=75000,
+            repo_forks=100,
+            repo_open_issues=5,
+            repo_open_prs=2,
+            repo_version_match={"matched": True},
+            trust_score=1.0,
+        )
+
         facts = builder.build_facts(mp)
 
         # Check all metrics are present
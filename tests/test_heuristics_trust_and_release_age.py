@@ -1,35 +1,37 @@
 """Tests for release-age and trust-regression heuristics."""
 
-import time
-
 from analysis import heuristics as _heur
 from constants import Constants
 from metapackage import MetaPackage
 
+# Frozen "now" (seconds) so release ages are exact and cannot drift mid-test
+_FIXED = 1_700_000_000.0
+
 
 def test_min_release_age_threshold_risk(monkeypatch):
     """Packages newer than configured minimum age should be flagged."""
+    monkeypatch.setattr(_heur.time, "time", lambda: _FIXED)
     mp = MetaPackage("pkg", "npm")
-    mp.timestamp = int((time.time() - 1 * 86400) * 1000)  # 1 day old
+    mp.timestamp = int((_FIXED - 1 * 86400) * 1000)  # 1 day old
     monkeypatch.setattr(Constants, "HEURISTICS_MIN_RELEASE_AGE_DAYS", 3)
 
     _heur.test_timestamp(mp)
 
     assert mp.risk_too_new is True
-    assert isinstance(mp.release_age_days, int)
-    assert mp.release_age_days <= 1
+    assert mp.release_age_days == 1
 
 
 def test_min_release_age_threshold_pass(monkeypatch):
     """Packages older than configured minimum age should pass the new-age check."""
+    monkeypatch.setattr(_heur.time, "time", lambda: _FIXED)
     mp = MetaPackage("pkg", "npm")
-    mp.timestamp = int((time.time() - 5 * 86400) * 1000)  # 5 days old
+    mp.timestamp = int((_FIXED - 5 * 86400) * 1000)  # 5 days old
     monkeypatch.setattr(Constants, "HEURISTICS_MIN_RELEASE_AGE_DAYS", 3)
 
     _heur.test_timestamp(mp)
 
     assert mp.risk_too_new is False
-    assert mp.release_age_days >= 5
+    assert mp.release_age_days == 5
 
 
 def test_trust_regression_flags(monkeypatch):
@@ -2,18 +2,15 @@
 from __future__ import annotations
 
 import os
-import tempfile
+
 import pytest
 
 from constants import ExitCodes
 from registry.maven.client import scan_source as maven_scan_source
+from _scan_cache import scan_files
 
 
-def test_maven_scan_recursive():
-    """Test recursive scanning for Maven."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Root pom.xml
-        root_pom = """<?xml version="1.0" encoding="UTF-8"?>
+ROOT_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -28,13 +25,8 @@ def test_maven_scan_recursive():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(root_pom)
 
-        # Subdirectory pom.xml
-        subdir = os.path.join(tmpdir, "subproject")
-        os.makedirs(subdir)
-        sub_pom = """<?xml version="1.0" encoding="UTF-8"?>
+SUB_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -49,27 +41,8 @@ def test_maven_scan_recursive():
   </dependencies>
 </project>
 """
-        with open(os.path.join(subdir, "pom.xml"), "w") as f:
-            f.write(sub_pom)
-
-        deps = maven_scan_source(tmpdir, recursive=True, direct_only=False, require_lockfile=False)
-        assert "junit:junit" in deps
-        assert "org.mockito:mockito-core" in deps
-
-
-def test_maven_scan_no_pom_xml():
-    """Test error when pom.xml is not found."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Empty directory
-        with pytest.raises(SystemExit) as exc_info:
-            maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert exc_info.value.code == ExitCodes.FILE_ERROR.value
 
-
-def test_maven_scan_missing_groupid():
-    """Test handling of dependency with missing groupId."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+MISSING_GROUPID_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -88,19 +61,8 @@ def test_maven_scan_missing_groupid():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
-
-        # Should skip dependency without groupId
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "junit:junit" not in deps
-        assert "org.mockito:mockito-core" in deps
 
-
-def test_maven_scan_missing_artifactid():
-    """Test handling of dependency with missing artifactId."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+MISSING_ARTIFACTID_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -119,31 +81,8 @@ def test_maven_scan_missing_artifactid():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
-
-        # Should skip dependency without artifactId
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "junit:junit" not in deps
-        assert "org.mockito:mockito-core" in deps
-
-
-def test_maven_scan_invalid_xml():
-    """Test handling of invalid XML in pom.xml."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Invalid XML
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write("<project><Invalid XML>")
-
-        # Should return empty list (preserves original behavior)
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert deps == []
-
 
-def test_maven_scan_require_lockfile_warning():
-    """Test that require_lockfile logs a warning for Maven."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+JUNIT_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -158,18 +97,8 @@ def test_maven_scan_require_lockfile_warning():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
-
-        # Should work but log warning
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=True)
-        assert "junit:junit" in deps
-
 
-def test_maven_scan_empty_dependencies():
-    """Test pom.xml with empty dependencies section."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+EMPTY_DEPENDENCIES_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -179,17 +108,8 @@ def test_maven_scan_empty_dependencies():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
 
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert deps == []
-
-
-def test_maven_scan_multiple_dependencies_sections():
-    """Test pom.xml with multiple dependencies sections."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+MULTIPLE_DEPENDENCIES_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -211,18 +131,8 @@ def test_maven_scan_multiple_dependencies_sections():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
-
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "junit:junit" in deps
-        assert "org.mockito:mockito-core" in deps
-
 
-def test_maven_scan_dependency_with_empty_groupid():
-    """Test handling of dependency with empty groupId text."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+EMPTY_GROUPID_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -242,19 +152,8 @@ def test_maven_scan_dependency_with_empty_groupid():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
 
-        # Should skip dependency with empty groupId
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "junit" not in deps or "junit:junit" not in deps
-        assert "org.mockito:mockito-core" in deps
-
-
-def test_maven_scan_dependency_with_empty_artifactid():
-    """Test handling of dependency with empty artifactId text."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        pom_content = """<?xml version="1.0" encoding="UTF-8"?>
+EMPTY_ARTIFACTID_POM = b"""<?xml version="1.0" encoding="UTF-8"?>
 <project xmlns="http://maven.apache.org/POM/4.0.0">
   <modelVersion>4.0.0</modelVersion>
   <groupId>com.example</groupId>
@@ -274,10 +173,169 @@ def test_maven_scan_dependency_with_empty_artifactid():
   </dependencies>
 </project>
 """
-        with open(os.path.join(tmpdir, "pom.xml"), "w") as f:
-            f.write(pom_content)
 
+INVALID_POM = b"<project><Invalid XML>"
+
+# Read-only scan fixtures: relative file path -> pre-encoded content (None creates an empty directory)
+_POM_TREE = {
+    "recursive/pom.xml": ROOT_POM,
+    "recursive/subproject/pom.xml": SUB_POM,
+    "no_pom": None,
+    "invalid_xml/pom.xml": INVALID_POM,
+    "junit/pom.xml": JUNIT_POM,
+    "multiple_dependencies/pom.xml": MULTIPLE_DEPENDENCIES_POM,
+}
+
+
+@pytest.fixture(scope="session")
+def maven_pom_tree(tmp_path_factory, write_tree):
+    """Materialize every POM variant once; scanners only read from it."""
+    return write_tree(tmp_path_factory.mktemp("maven"), _POM_TREE)
+
+
+def test_maven_scan_recursive(maven_pom_tree):
+    """Test recursive scanning for Maven."""
+    tmpdir = str(maven_pom_tree / "recursive")
+    deps = maven_scan_source(tmpdir, recursive=True, direct_only=False, require_lockfile=False)
+    assert "junit:junit" in deps
+    assert "org.mockito:mockito-core" in deps
+
+
+def test_maven_scan_no_pom_xml(maven_pom_tree):
+    """Test error when pom.xml is not found."""
+    # Empty directory
+    tmpdir = str(maven_pom_tree / "no_pom")
+    with pytest.raises(SystemExit) as exc_info:
+        maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+    assert exc_info.value.code == ExitCodes.FILE_ERROR.value
+
+
+def test_maven_scan_invalid_xml(maven_pom_tree):
+    """Test handling of invalid XML in pom.xml."""
+    # Should return empty list (preserves original behavior)
+    tmpdir = str(maven_pom_tree / "invalid_xml")
+    deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+    assert deps == []
+
+
+def test_maven_scan_require_lockfile_warning(maven_pom_tree):
+    """Test that require_lockfile logs a warning for Maven."""
+    # Should work but log warning
+    tmpdir = str(maven_pom_tree / "junit")
+    deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=True)
+    assert "junit:junit" in deps
+
+
+def test_maven_scan_empty_dependencies():
+    """Test pom.xml with empty dependencies section."""
+    deps = scan_files("maven", {"pom.xml": EMPTY_DEPENDENCIES_POM})
+    assert deps == ()
+
+
+def test_maven_scan_multiple_dependencies_sections():
+    """Test pom.xml with multiple dependencies sections."""
+    deps = scan_files("maven", {"pom.xml": MULTIPLE_DEPENDENCIES_POM})
+    assert "junit:junit" in deps
+    assert "org.mockito:mockito-core" in deps
+
+
+@pytest.mark.parametrize(
+    "pom,present,absent",
+    [
+        # Should skip dependency without groupId
+        (MISSING_GROUPID_POM, {"org.mockito:mockito-core"}, {"junit:junit"}),
+        # Should skip dependency without artifactId
+        (MISSING_ARTIFACTID_POM, {"org.mockito:mockito-core"}, {"junit:junit"}),
+        # Should skip dependency with empty groupId
+        (EMPTY_GROUPID_POM, {"org.mockito:mockito-core"}, {"junit:junit"}),
         # Should skip dependency with empty artifactId
-        deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
-        assert "junit:junit" not in deps
-        assert "org.mockito:mockito-core" in deps
+        (EMPTY_ARTIFACTID_POM, {"org.mockito:mockito-core"}, {"junit:junit"}),
+    ],
+    ids=["missing_groupid", "missing_artifactid", "empty_groupid", "empty_artifactid"],
+)
+def test_maven_scan_filters_incomplete_coordinates(pom, present, absent):
+    """Test that dependencies with missing or empty groupId/artifactId are skipped."""
+    deps = scan_files("maven", {"pom.xml": pom})
+    assert present <= set(deps)
+    assert absent.isdisjoint(deps)
+
+
+@pytest.mark.parametrize("use_lxml", [True, False], ids=["lxml", "stdlib"])
+def test_maven_scan_parser_backends_agree(maven_pom_tree, monkeypatch, use_lxml):
+    """Test that the optional lxml parser and the ElementTree fallback yield the same result."""
+    import common.file_parsing as file_parsing
+    import registry.maven.client as maven_client
+
+    if use_lxml:
+        pytest.importorskip("lxml")
+    else:
+        monkeypatch.setattr(file_parsing, "_lxml_etree", None)
+    # Make sure the selected backend actually parses instead of hitting cached results
+    maven_client._pom_coordinates.cache_clear()
+
+    tmpdir = str(maven_pom_tree / "multiple_dependencies")
+    deps = maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+    assert set(deps) == {"junit:junit", "org.mockito:mockito-core"}
+
+    tmpdir = str(maven_pom_tree / "invalid_xml")
+    assert maven_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False) == []
+
+
+def test_maven_iter_pom_coordinates_streams(maven_pom_tree):
+    """Test that POM coordinates can be consumed lazily, one dependency at a time."""
+    from registry.maven.client import _iter_pom_coordinates
+
+    coords = _iter_pom_coordinates(str(maven_pom_tree / "multiple_dependencies" / "pom.xml"))
+    assert next(coords) == "junit:junit"
+    assert any(c == "org.mockito:mockito-core" for c in coords)
+
+
+def test_maven_pom_parse_cached_until_file_changes(tmp_path):
+    """Test that unchanged POMs reuse cached coordinates and edited POMs are re-parsed."""
+    from registry.maven.client import _pom_coordinates
+
+    pom = tmp_path / "pom.xml"
+    pom.write_bytes(JUNIT_POM)
+    first = _pom_coordinates(str(pom))
+    assert _pom_coordinates(str(pom)) is first
+    assert first == ("junit:junit",)
+
+    pom.write_bytes(MULTIPLE_DEPENDENCIES_POM)
+    deps = maven_scan_source(str(tmp_path), recursive=False, direct_only=False, require_lockfile=False)
+    assert set(deps) == {"junit:junit", "org.mockito:mockito-core"}
+
+
+def test_maven_pom_parse_cache_keys_on_absolute_path(tmp_path, monkeypatch):
+    """Test that relative and absolute spellings of one POM share a cache entry."""
+    from registry.maven.client import _pom_coordinates
+
+    (tmp_path / "pom.xml").write_bytes(JUNIT_POM)
+    monkeypatch.chdir(tmp_path)
+    first = _pom_coordinates("pom.xml")
+    assert _pom_coordinates(str(tmp_path / "pom.xml")) is first
+    assert _pom_coordinates(os.path.join(".", "pom.xml")) is first
+
+
+def test_maven_scan_ignores_exclusion_coordinates(tmp_path):
+    """Test that a dependency missing groupId does not borrow one from its exclusions."""
+    (tmp_path / "pom.xml").write_bytes(b"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <dependencies>
+    <dependency>
+      <exclusions>
+        <exclusion>
+          <groupId>commons-logging</groupId>
+          <artifactId>commons-logging</artifactId>
+        </exclusion>
+      </exclusions>
+      <artifactId>junit</artifactId>
+    </dependency>
+    <dependency>
+      <groupId>org.mockito</groupId>
+      <artifactId>mockito-core</artifactId>
+    </dependency>
+  </dependencies>
+</project>
+""")
+    deps = maven_scan_source(str(tmp_path), recursive=False, direct_only=False, require_lockfile=False)
+    assert deps == ["org.mockito:mockito-core"]
@@ -1,81 +1,70 @@
 """Tests for MCP integration with direct-only and require-lockfile options."""
 from __future__ import annotations
 
-import os
-import tempfile
-import json
 import pytest
 
 from cli_mcp import _build_cli_args_for_project_scan
 from cli_build import build_pkglist
 
+PACKAGE_JSON = '{"dependencies":{"express":"^4.18.0"}}'
 
-def test_mcp_direct_only_mapping():
-    """Test that MCP includeTransitive maps correctly to direct_only and is passed as runtime parameter."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a test package.json
-        package_json = {"dependencies": {"express": "^4.18.0"}}
-        with open(os.path.join(tmpdir, "package.json"), "w") as f:
-            json.dump(package_json, f)
+# package-lock.json with a transitive dependency under express
+PACKAGE_LOCK = (
+    '{"name":"test","version":"1.0.0","lockfileVersion":2,'
+    '"dependencies":{"express":{"version":"4.18.2","dependencies":{"accepts":{"version":"1.3.8"}}}}}'
+)
 
-        # Create package-lock.json with transitive deps
-        package_lock = {
-            "name": "test",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "dependencies": {
-                "express": {
-                    "version": "4.18.2",
-                    "dependencies": {"accepts": {"version": "1.3.8"}}
-                }
-            }
-        }
-        with open(os.path.join(tmpdir, "package-lock.json"), "w") as f:
-            json.dump(package_lock, f)
 
-        # Build args (direct_only/require_lockfile are now runtime params, not in args)
-        args = _build_cli_args_for_project_scan(
-            tmpdir, "npm", "compare", direct_only=None, require_lockfile=None
-        )
+@pytest.fixture
+def npm_project(tmp_path):
+    """npm project with only package.json; returns (project dir, MCP-built CLI args)."""
+    (tmp_path / "package.json").write_text(PACKAGE_JSON)
+    # direct_only/require_lockfile are runtime params, not in args
+    args = _build_cli_args_for_project_scan(
+        str(tmp_path), "npm", "compare", direct_only=None, require_lockfile=None
+    )
+    return tmp_path, args
 
-        # Test that direct_only=True (includeTransitive=False) only gets direct deps
-        pkglist_direct = build_pkglist(args, direct_only=True, require_lockfile=False)
-        assert "express" in pkglist_direct
-        assert "accepts" not in pkglist_direct  # Transitive dependency excluded
 
-        # Test that direct_only=False (includeTransitive=True) gets all deps
-        pkglist_all = build_pkglist(args, direct_only=False, require_lockfile=False)
-        assert "express" in pkglist_all
-        assert "accepts" in pkglist_all  # Transitive dependency included
+@pytest.fixture
+def npm_project_with_lock(npm_project):
+    """npm_project plus a package-lock.json carrying a transitive dependency."""
+    project_dir, args = npm_project
+    (project_dir / "package-lock.json").write_text(PACKAGE_LOCK)
+    return project_dir, args
 
 
-def test_mcp_require_lockfile_mapping():
-    """Test that MCP requireLockfile is passed as runtime parameter."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Create a test package.json
-        package_json = {"dependencies": {"express": "^4.18.0"}}
-        with open(os.path.join(tmpdir, "package.json"), "w") as f:
-            json.dump(package_json, f)
+@pytest.mark.parametrize(
+    "direct_only,expect_transitive",
+    [
+        (True, False),  # includeTransitive=False: direct deps only
+        (False, True),  # includeTransitive=True: lockfile deps included
+    ],
+)
+def test_mcp_direct_only_mapping(npm_project_with_lock, direct_only, expect_transitive):
+    """Test that MCP includeTransitive maps correctly to direct_only and is passed as runtime parameter."""
+    _, args = npm_project_with_lock
 
-        # Build args
-        args = _build_cli_args_for_project_scan(
-            tmpdir, "npm", "compare", direct_only=None, require_lockfile=None
-        )
+    pkglist = build_pkglist(args, direct_only=direct_only, require_lockfile=False)
+    assert "express" in pkglist
+    assert ("accepts" in pkglist) is expect_transitive
 
-        # Test that require_lockfile=True fails when lockfile is missing
-        with pytest.raises(SystemExit):
-            build_pkglist(args, direct_only=False, require_lockfile=True)
 
-        # Create lockfile and test it works
-        package_lock = {
-            "name": "test",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "dependencies": {"express": {"version": "4.18.2"}}
-        }
-        with open(os.path.join(tmpdir, "package-lock.json"), "w") as f:
-            json.dump(package_lock, f)
+@pytest.mark.parametrize(
+    "project,require_lockfile,expect_exit",
+    [
+        ("npm_project", True, True),  # Lockfile required but missing
+        ("npm_project_with_lock", True, False),  # Lockfile required and present
+        ("npm_project", False, False),  # Lockfile optional; manifest is enough
+    ],
+)
+def test_mcp_require_lockfile_mapping(request, project, require_lockfile, expect_exit):
+    """Test that MCP requireLockfile is passed as runtime parameter."""
+    _, args = request.getfixturevalue(project)
 
-        # Should succeed with lockfile present
-        pkglist = build_pkglist(args, direct_only=False, require_lockfile=True)
+    if expect_exit:
+        with pytest.raises(SystemExit):
+            build_pkglist(args, direct_only=False, require_lockfile=require_lockfile)
+    else:
+        pkglist = build_pkglist(args, direct_only=False, require_lockfile=require_lockfile)
         assert "express" in pkglist
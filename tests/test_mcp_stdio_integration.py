@@ -1,113 +1,24 @@
-import json
 import os
-import subprocess
-import sys
-import time
-from pathlib import Path
 
 import pytest
 
+from _mcp_util import (
+    FAKE_REGISTRY_ENV,
+    INITIALIZED_NOTIFICATION,
+    initialize_envelope,
+    read_json_response,
+    read_json_responses,
+    rpc_batch,
+    rpc_envelope,
+    send_json,
+    spawn_mcp_stdio,
+)
 
-ROOT = Path(__file__).resolve().parents[1]
-ENTRY = ROOT / "src" / "depgate.py"
 
-
-def _spawn_mcp_stdio(env=None):
-    cmd = [sys.executable, "-u", str(ENTRY), "mcp"]
-    env_copy = env.copy() if env else os.environ.copy()
-    # Force Python unbuffered output
-    env_copy.setdefault("PYTHONUNBUFFERED", "1")
-    proc = subprocess.Popen(
-        cmd,
-        cwd=str(ROOT),
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        env=env_copy,
-        bufsize=0,  # Unbuffered
-    )
-    return proc
-
-
-def _rpc_envelope(method, params=None, id_=1):
-    return json.dumps({"jsonrpc": "2.0", "id": id_, "method": method, "params": params or {}}) + "\n"
-
-
-def _send_json(proc, payload_str: str) -> None:
-    assert proc.stdin is not None
-    proc.stdin.write(payload_str)
-    proc.stdin.flush()
-
-
-def _read_json_response(proc, expected_id=None, timeout=5):
-    """Read a JSON-RPC response supporting either line-delimited JSON or LSP-style Content-Length frames."""
-    assert proc.stdout is not None
-    end = time.time() + timeout
-    buf = ""
-    content_len = None
-    # First, try to detect LSP-style framing
-    while time.time() < end:
-        line = proc.stdout.readline()
-        if not line:
-            break
-        s = line.strip()
-        if not s:
-            if content_len is not None:
-                # Next chunk should be JSON of content_len bytes
-                payload = proc.stdout.read(content_len)
-                try:
-                    obj = json.loads(payload)
-                    if expected_id is None or obj.get("id") == expected_id:
-                        return obj
-                except Exception:
-                    # Invalid JSON in LSP-framed payload; continue reading
-                    pass
-                content_len = None
-                continue
-            # skip empty line
-            continue
-        if s.lower().startswith("content-length:"):
-            try:
-                content_len = int(s.split(":", 1)[1].strip())
-            except Exception:
-                content_len = None
-            continue
-        # If not framed headers, attempt to parse as a standalone JSON line
-        try:
-            obj = json.loads(s)
-            if expected_id is None or obj.get("id") == expected_id:
-                return obj
-        except Exception:
-            # Accumulate and try again (in case of pretty-printed JSON)
-            buf += s
-            try:
-                obj = json.loads(buf)
-                if expected_id is None or obj.get("id") == expected_id:
-                    return obj
-                else:
-                    buf = ""
-            except Exception:
-                # Invalid JSON when accumulating; continue reading
-                pass
-    return None
-
-
-@pytest.mark.skip(reason=(
-    "This test hangs indefinitely when reading the response from Lookup_Latest_Version. "
-    "The issue appears to be related to FastMCP's async event loop handling of sync tool functions "
-    "that make blocking HTTP calls, even with FAKE_REGISTRY=1 and HTTP mocking in place. "
-    "The functionality itself works correctly when tested manually (see test comments). "
-    "Root cause: The test's readline() call blocks waiting for a response that FastMCP may not "
-    "be sending due to event loop blocking or deadlock. This is a known issue with the integration "
-    "test setup and does not affect actual functionality."
-))
 def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
-    # NOTE: This test is skipped due to hanging issues. Manual testing confirms:
-    # 1. The MCP server starts correctly
-    # 2. Initialize and tools/list work fine
-    # 3. Lookup_Latest_Version works when called directly (see test_lookup_manual_verification below)
-    # 4. The hang occurs specifically when reading the response via stdio in the test harness
+    # NOTE: This test used to hang: stderr was piped but read with a blocking text-mode
+    # read(4096), stalling the harness while the server waited. stderr now goes to
+    # DEVNULL unless MCP_TEST_CAPTURE_STDERR is set, and is drained via os.read.
     #
     # To manually verify functionality:
     #   echo '{"jsonrpc":"2.0","id":1,"method":"tools/call","params":{"name":"Lookup_Latest_Version","arguments":{"name":"left-pad","ecosystem":"npm"}}}' | \
@@ -120,49 +31,32 @@ def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
     except Exception:
         mcp_available = False
 
-    env = os.environ.copy()
-    # Use fake registries to avoid real network. Ensure src and e2e_mocks are on PYTHONPATH.
-    env.update({
-        "FAKE_REGISTRY": "1",
-        "PYTHONPATH": f"{ROOT / 'tests' / 'e2e_mocks'}:{ROOT / 'src'}",
-    })
+    # Use fake registries to avoid real network; src and e2e_mocks are on PYTHONPATH.
+    env = dict(FAKE_REGISTRY_ENV)
 
-    proc = _spawn_mcp_stdio(env)
+    # stderr is only needed to check the graceful-failure message when the SDK is missing
+    proc = spawn_mcp_stdio(env, capture_stderr=True if not mcp_available else None)
     try:
-        # If server exited immediately (e.g., fastmcp missing), assert graceful error
-        time.sleep(0.2)
+        # If MCP SDK is missing the server exits on its own; assert graceful error.
+        # Otherwise no startup sleep: a crashed server surfaces as EOF on the first read.
         if not mcp_available or proc.poll() is not None:
             outs, errs = proc.communicate(timeout=2)
             assert proc.returncode != 0
             assert "MCP server not available" in (errs or "")
             return
 
-        # Initialize first per MCP
+        # Initialize first per MCP, pipelining the initialized notification and tools/list in the same write
         assert proc.stdin is not None and proc.stdout is not None
-        init_req = _rpc_envelope(
-            "initialize",
-            {
-                "protocolVersion": "2024-11-05",
-                "clientInfo": {"name": "pytest", "version": "0.0.0"},
-                "capabilities": {},
-            },
-            id_=11,
-        )
+        init_req = initialize_envelope(11)
+        list_req = rpc_envelope("tools/list", {}, id_=1)
         try:
-            _send_json(proc, init_req)
+            send_json(proc, rpc_batch([init_req, INITIALIZED_NOTIFICATION, list_req]))
         except BrokenPipeError:
             # Server closed pipe unexpectedly; treat as failure of transport
             raise AssertionError("MCP stdio not available: server closed pipe on initialize")
-        # Some servers may not send a direct response to initialize; continue to tools/list
-        _ = _read_json_response(proc, expected_id=11, timeout=1)
-
-        # List tools next
-        list_req = _rpc_envelope("tools/list", {}, id_=1)
-        try:
-            _send_json(proc, list_req)
-        except BrokenPipeError:
-            raise AssertionError("MCP stdio not available: server closed pipe on tools/list")
-        response = _read_json_response(proc, expected_id=1, timeout=5)
+        # Some servers may not send a direct response to initialize; only tools/list is required.
+        # Returns as soon as both arrive; the deadline only covers a slow start under load.
+        response = read_json_responses(proc, {11, 1}, timeout=30).get(1)
         stderr_tail = ""
         if proc.stderr is not None:
             try:
@@ -174,7 +68,7 @@ def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
                         import select
                         r, _, _ = select.select([proc.stderr], [], [], 0.05)
                         if r:
-                            stderr_tail = proc.stderr.read(4096) or ""
+                            stderr_tail = os.read(proc.stderr.fileno(), 4096).decode("utf-8", "replace")
                     except Exception:
                         # select may not be available on all platforms; ignore and continue
                         stderr_tail = ""
@@ -189,7 +83,7 @@ def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
         assert {"Lookup_Latest_Version", "Scan_Project", "Scan_Dependency"}.issubset(tool_names)
 
         # Call Lookup_Latest_Version via tools/call envelope
-        call = _rpc_envelope(
+        call = rpc_envelope(
             "tools/call",
             {
                 "name": "Lookup_Latest_Version",
@@ -198,12 +92,12 @@ def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
             id_=2,
         )
         try:
-            _send_json(proc, call)
+            send_json(proc, call)
         except BrokenPipeError:
             raise AssertionError("MCP stdio not available: server closed pipe on tools/call")
 
         # Read result with timeout handling
-        lookup_resp = _read_json_response(proc, expected_id=2, timeout=15)
+        lookup_resp = read_json_response(proc, expected_id=2, timeout=15)
 
         stderr_tail = ""
         if proc.stderr is not None:
@@ -215,7 +109,7 @@ def test_mcp_stdio_initialize_and_lookup_latest_version_smoke(monkeypatch):
                         import select
                         r, _, _ = select.select([proc.stderr], [], [], 0.05)
                         if r:
-                            stderr_tail = proc.stderr.read(4096) or ""
+                            stderr_tail = os.read(proc.stderr.fileno(), 4096).decode("utf-8", "replace")
                     except Exception:
                         # select may not be available on all platforms; ignore and continue
                         stderr_tail = ""
@@ -256,6 +150,4 @@ def test_lookup_manual_verification():
     Expected output includes: "latestVersion": "1.3.0", "candidates": 3
     """
     # This test documents manual verification - the actual stdio test confirms functionality
-    # The hanging issue in test_mcp_stdio_initialize_and_lookup_latest_version_smoke
-    # is a test harness issue, not a functionality issue.
     assert True  # Placeholder - actual verification is done manually via stdio
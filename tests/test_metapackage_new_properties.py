@@ -139,3 +139,14 @@ class TestMetaPackageNewProperties:
         assert mp.trust_score_decreased is False
         assert mp.previous_release_version == "1.2.2"
         assert mp.release_age_days == 30
+
+    def test_fields_live_in_slots(self):
+        """Test that constructor and property-backed fields are slot-stored, not in __dict__."""
+        mp = MetaPackage("test-package", "npm")
+        mp.weekly_downloads = 50000
+        mp.repo_forks = 25
+        mp.trust_score = 0.75
+        mp.release_age_days = 10
+
+        # __dict__ remains only for ad-hoc enrichment attributes (license_id, policy_decision, ...)
+        assert vars(mp) == {}
@@ -1,8 +1,8 @@
 """Tests for npm lockfile parsers (package-lock.json, yarn.lock, bun.lock)."""
 
+import io
 import json
-import tempfile
-from pathlib import Path
+import logging
 
 import pytest
 
@@ -14,169 +14,126 @@ from registry.npm.lockfile_parser import (
 )
 
 
-class TestPackageLockParser:
-    """Test package-lock.json parser."""
+def _write_json(path, content) -> None:
+    """Write content as compact JSON; the parsers do not depend on formatting."""
+    path.write_bytes(json.dumps(content, separators=(",", ":")).encode())
 
-    def test_parse_package_lock_v1(self, tmp_path):
-        """Test parsing package-lock.json with lockfileVersion 1."""
-        lockfile_content = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 1,
-            "dependencies": {
-                "lodash": {
-                    "version": "4.17.21",
-                    "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
-                    "dependencies": {
-                        "underscore": {
-                            "version": "1.13.0",
-                            "resolved": "https://registry.npmjs.org/underscore/-/underscore-1.13.0.tgz",
-                        }
-                    }
-                },
-                "express": {
-                    "version": "4.18.2",
-                    "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz",
-                }
-            }
-        }
 
-        lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
+@pytest.fixture
+def no_yarnlock(monkeypatch):
+    """Act as if the yarnlock library is not installed so parse_yarn_lock uses its custom parser."""
+    monkeypatch.setattr("registry.npm.lockfile_parser._YARNLOCK_PARSE", None)
 
-        result = parse_package_lock(str(lockfile_path))
 
-        assert "lodash" in result
-        assert "express" in result
-        assert "underscore" in result
-        assert len(result) == 3
+class TestPackageLockParser:
+    """Test package-lock.json parser."""
 
-    def test_parse_package_lock_v2(self, tmp_path):
-        """Test parsing package-lock.json with lockfileVersion 2."""
-        lockfile_content = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {
+    @pytest.mark.parametrize(
+        "lockfile_content,expected",
+        [
+            (
+                {
                     "name": "test-package",
-                    "version": "1.0.0"
-                },
-                "node_modules/lodash": {
-                    "version": "4.17.21",
-                    "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz"
-                },
-                "node_modules/express": {
-                    "version": "4.18.2",
-                    "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz"
+                    "version": "1.0.0",
+                    "lockfileVersion": 1,
+                    "dependencies": {
+                        "lodash": {
+                            "version": "4.17.21",
+                            "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
+                            "dependencies": {
+                                "underscore": {
+                                    "version": "1.13.0",
+                                    "resolved": "https://registry.npmjs.org/underscore/-/underscore-1.13.0.tgz",
+                                }
+                            },
+                        },
+                        "express": {
+                            "version": "4.18.2",
+                            "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz",
+                        },
+                    },
                 },
-                "node_modules/@types/node": {
-                    "version": "18.0.0",
-                    "resolved": "https://registry.npmjs.org/@types/node/-/node-18.0.0.tgz"
-                }
-            }
-        }
-
-        lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
-
-        result = parse_package_lock(str(lockfile_path))
-
-        assert "lodash" in result
-        assert "express" in result
-        assert "@types/node" in result
-        assert len(result) == 3  # Root package excluded
-
-    def test_parse_package_lock_v3(self, tmp_path):
-        """Test parsing package-lock.json with lockfileVersion 3."""
-        lockfile_content = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 3,
-            "packages": {
-                "": {
+                ["express", "lodash", "underscore"],
+            ),
+            (
+                {
                     "name": "test-package",
-                    "version": "1.0.0"
-                },
-                "node_modules/lodash": {
-                    "name": "lodash",
-                    "version": "4.17.21",
-                    "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz"
+                    "version": "1.0.0",
+                    "lockfileVersion": 2,
+                    "packages": {
+                        "": {"name": "test-package", "version": "1.0.0"},
+                        "node_modules/lodash": {
+                            "version": "4.17.21",
+                            "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
+                        },
+                        "node_modules/express": {
+                            "version": "4.18.2",
+                            "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz",
+                        },
+                        "node_modules/@types/node": {
+                            "version": "18.0.0",
+                            "resolved": "https://registry.npmjs.org/@types/node/-/node-18.0.0.tgz",
+                        },
+                    },
                 },
-                "node_modules/express": {
-                    "name": "express",
-                    "version": "4.18.2",
-                    "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz"
-                }
-            }
-        }
-
-        lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
-
-        result = parse_package_lock(str(lockfile_path))
-
-        assert "lodash" in result
-        assert "express" in result
-        assert len(result) == 2
-
-    def test_parse_package_lock_v2_scoped_packages(self, tmp_path):
-        """Test parsing scoped packages in v2 format."""
-        lockfile_content = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {
+                ["@types/node", "express", "lodash"],  # Root package excluded
+            ),
+            (
+                {
                     "name": "test-package",
-                    "version": "1.0.0"
-                },
-                "node_modules/@types/node": {
-                    "version": "18.0.0"
+                    "version": "1.0.0",
+                    "lockfileVersion": 3,
+                    "packages": {
+                        "": {"name": "test-package", "version": "1.0.0"},
+                        "node_modules/lodash": {
+                            "name": "lodash",
+                            "version": "4.17.21",
+                            "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
+                        },
+                        "node_modules/express": {
+                            "name": "express",
+                            "version": "4.18.2",
+                            "resolved": "https://registry.npmjs.org/express/-/express-4.18.2.tgz",
+                        },
+                    },
                 },
-                "node_modules/@scope/package": {
-                    "version": "1.0.0"
-                }
-            }
-        }
-
-        lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
-
-        result = parse_package_lock(str(lockfile_path))
-
-        assert "@types/node" in result
-        assert "@scope/package" in result
-        assert len(result) == 2
-
-    def test_parse_package_lock_v2_without_name_field(self, tmp_path):
-        """Test parsing v2 when packages don't have 'name' field (extract from path)."""
-        lockfile_content = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {
+                ["express", "lodash"],
+            ),
+            (
+                {
                     "name": "test-package",
-                    "version": "1.0.0"
+                    "version": "1.0.0",
+                    "lockfileVersion": 2,
+                    "packages": {
+                        "": {"name": "test-package", "version": "1.0.0"},
+                        "node_modules/@types/node": {"version": "18.0.0"},
+                        "node_modules/@scope/package": {"version": "1.0.0"},
+                    },
                 },
-                "node_modules/axios": {
-                    "version": "1.0.0"
+                ["@scope/package", "@types/node"],
+            ),
+            (
+                # No "name" field on entries: names come from the path
+                {
+                    "name": "test-package",
+                    "version": "1.0.0",
+                    "lockfileVersion": 2,
+                    "packages": {
+                        "": {"name": "test-package", "version": "1.0.0"},
+                        "node_modules/axios": {"version": "1.0.0"},
+                        "node_modules/@types/node": {"version": "18.0.0"},
+                    },
                 },
-                "node_modules/@types/node": {
-                    "version": "18.0.0"
-                }
-            }
-        }
-
-        lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
-
-        result = parse_package_lock(str(lockfile_path))
+                ["@types/node", "axios"],
+            ),
+        ],
+        ids=["v1", "v2", "v3", "v2_scoped_packages", "v2_without_name_field"],
+    )
+    def test_parse_package_lock(self, lockfile_content, expected):
+        """Test parsing package-lock.json across lockfile versions and name sources."""
+        source = io.BytesIO(json.dumps(lockfile_content, separators=(",", ":")).encode())
 
-        assert "axios" in result
-        assert "@types/node" in result
-        assert len(result) == 2
+        assert parse_package_lock(source) == expected
 
     def test_parse_package_lock_missing_file(self, tmp_path):
         """Test parsing non-existent file returns empty list."""
@@ -201,7 +158,7 @@ class TestPackageLockParser:
         }
 
         lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
+        _write_json(lockfile_path, lockfile_content)
 
         result = parse_package_lock(str(lockfile_path))
         # Should return empty list or handle gracefully
@@ -230,7 +187,7 @@ class TestPackageLockParser:
         }
 
         lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
+        _write_json(lockfile_path, lockfile_content)
 
         result = parse_package_lock(str(lockfile_path))
 
@@ -254,12 +211,125 @@ class TestPackageLockParser:
         }
 
         lockfile_path = tmp_path / "package-lock.json"
-        lockfile_path.write_text(json.dumps(lockfile_content, indent=2))
+        _write_json(lockfile_path, lockfile_content)
 
         result = parse_package_lock(str(lockfile_path))
         # Should still extract from packages field
         assert "lodash" in result
 
+    def test_extract_from_deps_walks_repeated_subtrees_once(self):
+        """Test the dependencies walker skips subtrees it has already descended into."""
+        from registry.npm.lockfile_parser import _extract_from_deps
+
+        # Same debug@2.6.9 subtree under two parents, plus a self-referencing unversioned map
+        debug = {"version": "2.6.9", "dependencies": {"ms": {"version": "2.0.0"}}}
+        cyclic = {"loop": {}}
+        cyclic["loop"]["dependencies"] = cyclic
+        deps = {
+            "express": {"version": "4.18.2", "dependencies": {"debug": debug}},
+            "send": {"version": "0.18.0", "dependencies": {"debug": debug}},
+            "loop": cyclic["loop"],
+        }
+
+        packages, seen = set(), set()
+        _extract_from_deps(deps, packages, seen)
+
+        assert packages == {"express", "send", "debug", "ms", "loop"}
+        assert id(debug["dependencies"]) in seen
+
+    def test_parse_package_lock_v1_same_version_different_subtrees(self, tmp_path, monkeypatch):
+        """Test two copies of one name@version with different nested deps are both walked."""
+        import registry.npm.lockfile_parser as lockfile_parser
+
+        # Whatever optional decoder is installed, the generic walk must agree with it
+        monkeypatch.setattr(lockfile_parser, "_msgspec", None)
+        monkeypatch.setattr(lockfile_parser, "_ijson", None)
+        lockfile_path = tmp_path / "package-lock.json"
+        _write_json(lockfile_path, {
+            "lockfileVersion": 1,
+            "dependencies": {
+                "x": {"version": "1.0.0", "dependencies": {
+                    "debug": {"version": "2.0.0", "dependencies": {"ms": {"version": "2.0.0"}}},
+                }},
+                "y": {"version": "1.0.0", "dependencies": {
+                    "debug": {"version": "2.0.0", "dependencies": {"hidden": {"version": "1.0.0"}}},
+                }},
+            },
+        })
+
+        assert parse_package_lock(str(lockfile_path)) == ["debug", "hidden", "ms", "x", "y"]
+
+    @pytest.mark.parametrize("lockfile_version", [1, 2, 3, 4])
+    def test_stream_package_lock_matches_full_decode(self, lockfile_version):
+        """Test the ijson streaming pass collects the same names as decoding the whole file."""
+        pytest.importorskip("ijson")
+        from registry.npm.lockfile_parser import _collect_package_lock, _stream_package_lock
+
+        lockfile_content = {
+            "lockfileVersion": lockfile_version,
+            "packages": {
+                "": {"name": "test-package", "version": "1.0.0"},
+                "node_modules/lodash": {"version": "4.17.21", "dependencies": {"name": "not-a-package"}},
+                "node_modules/@types/node": {"version": "18.0.0"},
+                "node_modules/a/node_modules/aliased": {"name": "real-name"},
+            },
+            "dependencies": {
+                "express": {
+                    "version": "4.18.2",
+                    "requires": {"accepts": "1.3.8"},
+                    "dependencies": {
+                        "body-parser": {"version": "1.19.0"},
+                        "debug": {"version": "2.0.0", "dependencies": {"ms": {"version": "2.0.0"}}},
+                    },
+                },
+                # Same debug@2.0.0 with a different subtree must still be walked
+                "send": {"dependencies": {
+                    "debug": {"version": "2.0.0", "dependencies": {"hidden": {"version": "1.0.0"}}},
+                }},
+            },
+        }
+        data = json.dumps(lockfile_content).encode()
+
+        assert _stream_package_lock(io.BytesIO(data)) == _collect_package_lock(json.loads(data))
+
+    @pytest.mark.parametrize("lockfile_version", [1, 2, 3, 4])
+    def test_msgspec_decode_matches_full_decode(self, lockfile_version):
+        """Test the msgspec typed decode collects the same names as the generic walk."""
+        msgspec = pytest.importorskip("msgspec")
+        from registry.npm.lockfile_parser import (
+            _PackageLock,
+            _collect_package_lock,
+            _collect_package_lock_struct,
+        )
+
+        lockfile_content = {
+            "lockfileVersion": lockfile_version,
+            "packages": {
+                "": {"name": "test-package", "version": "1.0.0"},
+                "node_modules/lodash": {"version": "4.17.21", "dependencies": {"ms": "2.0.0"}},
+                "node_modules/@types/node": {"version": "18.0.0"},
+                "node_modules/a/node_modules/aliased": {"name": "real-name"},
+            },
+            "dependencies": {
+                "express": {
+                    "version": "4.18.2",
+                    "requires": {"accepts": "1.3.8"},
+                    "dependencies": {
+                        "body-parser": {"version": "1.19.0"},
+                        "debug": {"version": "2.0.0", "dependencies": {"ms": {"version": "2.0.0"}}},
+                    },
+                },
+                # Same debug@2.0.0 with a different subtree must still be walked
+                "send": {"dependencies": {
+                    "debug": {"version": "2.0.0", "dependencies": {"hidden": {"version": "1.0.0"}}},
+                }},
+            },
+        }
+        data = json.dumps(lockfile_content).encode()
+
+        lock = msgspec.json.decode(data, type=_PackageLock)
+        assert _collect_package_lock_struct(lock) == _collect_package_lock(json.loads(data))
+
 
 class TestYarnLockParser:
     """Test yarn.lock parser."""
@@ -295,8 +365,7 @@ __metadata:
         def mock_yarnlock_parse(content):
             return mock_parsed
 
-        # Mock the import inside the function
-        monkeypatch.setattr("yarnlock.yarnlock_parse", mock_yarnlock_parse)
+        monkeypatch.setattr("registry.npm.lockfile_parser._YARNLOCK_PARSE", mock_yarnlock_parse)
 
         result = parse_yarn_lock(str(lockfile_path))
 
@@ -374,7 +443,7 @@ express@^4.18.0:
         def mock_yarnlock_parse(content):
             return mock_parsed
 
-        monkeypatch.setattr("yarnlock.yarnlock_parse", mock_yarnlock_parse)
+        monkeypatch.setattr("registry.npm.lockfile_parser._YARNLOCK_PARSE", mock_yarnlock_parse)
 
         lockfile_path = tmp_path / "yarn.lock"
         lockfile_path.write_text("# yarn.lock\n")
@@ -386,9 +455,11 @@ express@^4.18.0:
         assert "" not in result
         assert len(result) == 1
 
-    def test_parse_yarn_lock_custom_parser_path(self, tmp_path, monkeypatch):
-        """Test that custom parser is used when yarnlock library raises ImportError."""
-        yarn_lock_content = """# yarn.lock
+    @pytest.mark.parametrize(
+        "yarn_lock_content,expected",
+        [
+            (
+                """# yarn.lock
 
 lodash@^4.17.0:
   version "4.17.21"
@@ -397,91 +468,51 @@ lodash@^4.17.0:
 express@^4.18.0:
   version "4.18.2"
   resolved "https://registry.yarnpkg.com/express/-/express-4.18.2.tgz#def456"
-"""
-        lockfile_path = tmp_path / "yarn.lock"
-        lockfile_path.write_text(yarn_lock_content)
-
-        # Mock ImportError when trying to import yarnlock
-        original_import = __import__
-        def mock_import(name, *args, **kwargs):
-            if name == "yarnlock":
-                raise ImportError("No module named 'yarnlock'")
-            return original_import(name, *args, **kwargs)
-
-        monkeypatch.setattr("builtins.__import__", mock_import)
-
-        result = parse_yarn_lock(str(lockfile_path))
-
-        # Should use custom parser and extract packages
-        assert "lodash" in result
-        assert "express" in result
-        assert len(result) == 2
-
-    def test_parse_yarn_lock_custom_parser_non_scoped_package(self, tmp_path, monkeypatch):
-        """Test custom parser handles non-scoped packages correctly."""
-        yarn_lock_content = """# yarn.lock
+""",
+                ["express", "lodash"],
+            ),
+            (
+                """# yarn.lock
 
 lodash@^4.17.0:
   version "4.17.21"
   resolved "https://registry.yarnpkg.com/lodash/-/lodash-4.17.21.tgz#abc123"
-"""
-        lockfile_path = tmp_path / "yarn.lock"
-        lockfile_path.write_text(yarn_lock_content)
-
-        # Mock ImportError to force custom parser
-        original_import = __import__
-        def mock_import(name, *args, **kwargs):
-            if name == "yarnlock":
-                raise ImportError("No module named 'yarnlock'")
-            return original_import(name, *args, **kwargs)
-
-        monkeypatch.setattr("builtins.__import__", mock_import)
-
-        result = parse_yarn_lock(str(lockfile_path))
-
-        # Should extract non-scoped package (line 202: else branch)
-        assert "lodash" in result
-        assert len(result) == 1
-
-    def test_parse_yarn_lock_custom_parser_scoped_package(self, tmp_path, monkeypatch):
-        """Test custom parser handles scoped packages correctly (covers line 199)."""
-        # Yarn v1 format - scoped packages can be quoted or unquoted
-        # Test with unquoted format which the regex should match
-        yarn_lock_content = """# yarn.lock
+""",
+                ["lodash"],
+            ),
+            (
+                # Yarn v1 format - scoped packages can be quoted or unquoted; this one is unquoted
+                """# yarn.lock
 
 @types/node@^18.0.0:
   version "18.0.0"
   resolved "https://registry.yarnpkg.com/@types/node/-/node-18.0.0.tgz#xyz789"
-"""
-        lockfile_path = tmp_path / "yarn.lock"
-        lockfile_path.write_text(yarn_lock_content)
-
-        # Mock ImportError to force custom parser (not library)
-        original_import = __import__
-        def mock_import(name, *args, **kwargs):
-            if name == "yarnlock":
-                raise ImportError("No module named 'yarnlock'")
-            return original_import(name, *args, **kwargs)
-
-        monkeypatch.setattr("builtins.__import__", mock_import)
+""",
+                ["@types/node"],
+            ),
+        ],
+        ids=["custom_parser_path", "non_scoped_package", "scoped_package"],
+    )
+    def test_parse_yarn_lock_without_library(self, no_yarnlock, yarn_lock_content, expected):
+        """Test that the custom parser is used when the yarnlock library is unavailable."""
+        assert parse_yarn_lock(io.BytesIO(yarn_lock_content.encode())) == expected
+
+    def test_custom_parser_quoted_and_multi_spec_headers(self, tmp_path):
+        """Test custom parser reads quoted headers and headers listing several ranges."""
+        from registry.npm.lockfile_parser import _parse_yarn_lock_custom
 
-        result = parse_yarn_lock(str(lockfile_path))
+        lockfile_path = tmp_path / "yarn.lock"
+        lockfile_path.write_text(
+            '# yarn lockfile v1\n\n'
+            '"@types/node@^18.0.0", "@types/node@^18.1.0":\n  version "18.1.0"\n\n'
+            'lodash@^4.17.0, lodash@^4.17.21:\n  version "4.17.21"\n'
+            '  dependencies:\n    "@scope/dep" "^1.0.0"\n'
+        )
 
-        # Should extract scoped package (line 199: if branch for scoped packages)
-        assert "@types/node" in result
-        assert len(result) == 1
+        assert _parse_yarn_lock_custom(str(lockfile_path)) == ["@types/node", "lodash"]
 
-    def test_parse_yarn_lock_custom_parser_io_error(self, tmp_path, monkeypatch):
+    def test_parse_yarn_lock_custom_parser_io_error(self, tmp_path, no_yarnlock):
         """Test custom parser handles IOError gracefully."""
-        # Mock ImportError to force custom parser path
-        original_import = __import__
-        def mock_import(name, *args, **kwargs):
-            if name == "yarnlock":
-                raise ImportError("No module named 'yarnlock'")
-            return original_import(name, *args, **kwargs)
-
-        monkeypatch.setattr("builtins.__import__", mock_import)
-
         # Use non-existent file to trigger IOError
         result = parse_yarn_lock(str(tmp_path / "nonexistent.lock"))
         assert result == []
@@ -737,3 +768,141 @@ class TestJsoncCommentStripper:
 }"""
         result = _strip_jsonc_comments(content)
         json.loads(result)  # Should not raise
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ('{\n  "a": "x, ]",\n  "b": [1, 2,\n  ],\n}', {"a": "x, ]", "b": [1, 2]}),
+            ('{"a": "x,}", "b": [1, 2, ], }', {"a": "x,}", "b": [1, 2]}),
+        ],
+        ids=["multiline", "single_line"],
+    )
+    def test_strip_trailing_commas_outside_strings_only(self, content, expected):
+        """Test trailing-comma removal leaves ",]" / ",}" inside string values untouched."""
+        assert json.loads(_strip_jsonc_comments(content)) == expected
+
+    def test_strip_preserves_comment_markers_inside_strings(self):
+        """Test that // and /* inside string literals (e.g. URLs, escaped quotes) are kept."""
+        content = """{
+  "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz", // trailing
+  "glob": "src/*/index.js",
+  "quote": "a\\"//b",
+  "list": [1, 2, /* last */],
+}"""
+        result = json.loads(_strip_jsonc_comments(content))
+        assert result == {
+            "resolved": "https://registry.npmjs.org/lodash/-/lodash-4.17.21.tgz",
+            "glob": "src/*/index.js",
+            "quote": 'a"//b',
+            "list": [1, 2],
+        }
+
+
+def test_parsers_cache_on_path_mtime_and_size(tmp_path, monkeypatch):
+    """Test an unchanged lockfile is parsed once and a rewritten one is parsed again."""
+    import os
+    import registry.npm.lockfile_parser as lockfile_parser
+
+    calls = []
+    real_collect = lockfile_parser._collect_package_lock
+    monkeypatch.setattr(lockfile_parser, "_msgspec", None)
+    monkeypatch.setattr(lockfile_parser, "_ijson", None)
+    monkeypatch.setattr(
+        lockfile_parser, "_collect_package_lock", lambda data: calls.append(1) or real_collect(data)
+    )
+
+    lockfile_path = tmp_path / "package-lock.json"
+    lockfile_path.write_text(json.dumps({"lockfileVersion": 1, "dependencies": {"lodash": {"version": "4.17.21"}}}))
+
+    first = parse_package_lock(str(lockfile_path))
+    first.append("mutated")
+    assert parse_package_lock(str(lockfile_path)) == ["lodash"]
+    assert len(calls) == 1
+
+    lockfile_path.write_text(json.dumps({"lockfileVersion": 1, "dependencies": {"express": {"version": "4.18.2"}}}))
+    os.utime(lockfile_path, ns=(0, 1))
+    assert parse_package_lock(str(lockfile_path)) == ["express"]
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize(
+    "lockfile_content,expected",
+    [
+        ({"name": "test-package", "lockfileVersion": 4, "dependencies": {"lodash": {}}}, []),
+        # A nested lockfileVersion is not taken for the document's own version
+        ({"meta": {"lockfileVersion": 4}, "lockfileVersion": 1, "dependencies": {"lodash": {}}}, ["lodash"]),
+    ],
+    ids=["unsupported_version", "nested_key_ignored"],
+)
+def test_parse_package_lock_peeks_top_level_version(tmp_path, lockfile_content, expected):
+    """Test the lockfileVersion prefix peek only short-circuits on the top-level key."""
+    lockfile_path = tmp_path / "package-lock.json"
+    lockfile_path.write_text(json.dumps(lockfile_content))
+
+    assert parse_package_lock(str(lockfile_path)) == expected
+
+
+@pytest.mark.parametrize("decoder", ["orjson", "jiter", "json"])
+def test_loads_decoders_agree(monkeypatch, decoder):
+    """Test each JSON decoder json_loads may pick returns the same objects and raises ValueError."""
+    import common.file_parsing as file_parsing
+
+    if decoder != "json":
+        pytest.importorskip(decoder)
+    # Disable the decoders that rank ahead of the one under test
+    for name in ["orjson", "jiter"][:["orjson", "jiter", "json"].index(decoder)]:
+        monkeypatch.setattr(file_parsing, f"_{name}", None)
+
+    data = b'{"lockfileVersion":3,"packages":{"node_modules/lodash":{"version":"4.17.21"}}}'
+    assert file_parsing.json_loads(data) == json.loads(data)
+    with pytest.raises(ValueError):
+        file_parsing.json_loads(b"invalid json {")
+
+
+def test_parser_failures_are_not_cached(tmp_path, caplog):
+    """Test a broken lockfile is reported on every read, not only the first."""
+    lockfile_path = tmp_path / "package-lock.json"
+    lockfile_path.write_text("invalid json {")
+
+    with caplog.at_level(logging.WARNING, logger="registry.npm.lockfile_parser"):
+        assert parse_package_lock(str(lockfile_path)) == []
+        assert parse_package_lock(str(lockfile_path)) == []
+
+    assert sum("Failed to parse package-lock.json" in r.getMessage() for r in caplog.records) == 2
+
+
+def test_parsers_accept_file_objects_and_leave_them_open():
+    """Test parsers read an already-open binary file object and do not close it."""
+    source = io.BytesIO(b'{\n  // bun.lock allows comments\n  "packages": {"node_modules/lodash": {"version": "4.17.21"},},\n}')
+
+    assert parse_bun_lock(source) == ["lodash"]
+    assert not source.closed
+
+
+def test_collect_package_lock_walks_mirrored_dependencies():
+    """Test v2 names only nested in the dependencies tree are collected even when the top level is mirrored."""
+    import registry.npm.lockfile_parser as lockfile_parser
+
+    data = {
+        "lockfileVersion": 2,
+        "packages": {"": {"name": "root"}, "node_modules/lodash": {"version": "4.17.21"}},
+        "dependencies": {
+            "lodash": {"version": "4.17.21", "dependencies": {"nested-only": {"version": "1.0.0"}}},
+        },
+    }
+
+    assert lockfile_parser._collect_package_lock(data) == {"lodash", "nested-only"}
+
+
+def test_parsed_names_are_interned(tmp_path):
+    """Test the same package name parsed from two lockfiles is one shared string object."""
+    names = []
+    for project in ("a", "b"):
+        lockfile_path = tmp_path / project / "package-lock.json"
+        lockfile_path.parent.mkdir()
+        # Build the name at runtime so it is not a compile-time (already interned) constant
+        _write_json(lockfile_path, {"lockfileVersion": 1, "dependencies": {"".join(["lo", "dash"]): {}}})
+        names.append(parse_package_lock(str(lockfile_path))[0])
+
+    assert names[0] == "lodash"
+    assert names[0] is names[1]
@@ -8,65 +8,42 @@ import pytest
 
 from registry.npm.scan import scan_source
 
-
-class TestNpmScanWithLockfiles:
-    """Test npm scanner with lockfile discovery and parsing."""
-
-    def test_scan_with_package_lock_json(self, tmp_path):
-        """Test scanning with package-lock.json present."""
-        # Create package.json
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            }
+# Fixture payloads serialized compactly once at import; tests write the text as-is
+_PACKAGE_JSON = json.dumps(
+    {
+        "name": "test-package",
+        "version": "1.0.0",
+        "dependencies": {
+            "lodash": "^4.17.0"
         }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
-
-        # Create package-lock.json
-        package_lock = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {
-                    "name": "test-package",
-                    "version": "1.0.0"
-                },
-                "node_modules/lodash": {
-                    "name": "lodash",
-                    "version": "4.17.21"
-                },
-                "node_modules/express": {
-                    "name": "express",
-                    "version": "4.18.2"
-                }
-            }
-        }
-        (tmp_path / "package-lock.json").write_text(json.dumps(package_lock, indent=2))
-
-        result = scan_source(str(tmp_path), recursive=False)
-
-        # Should include all packages from lockfile (transitive dependencies)
-        assert "lodash" in result
-        assert "express" in result
-        assert len(result) >= 2
-
-    def test_scan_with_yarn_lock(self, tmp_path):
-        """Test scanning with yarn.lock present."""
-        # Create package.json
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
+    },
+    separators=(",", ":"),
+)
+
+_PACKAGE_LOCK_JSON = json.dumps(
+    {
+        "name": "test-package",
+        "version": "1.0.0",
+        "lockfileVersion": 2,
+        "packages": {
+            "": {
+                "name": "test-package",
+                "version": "1.0.0"
+            },
+            "node_modules/lodash": {
+                "name": "lodash",
+                "version": "4.17.21"
+            },
+            "node_modules/express": {
+                "name": "express",
+                "version": "4.18.2"
             }
         }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
+    },
+    separators=(",", ":"),
+)
 
-        # Create yarn.lock
-        yarn_lock = """# yarn.lock
+_YARN_LOCK = """# yarn.lock
 
 lodash@^4.17.0:
   version "4.17.21"
@@ -76,29 +53,8 @@ express@^4.18.0:
   version "4.18.2"
   resolved "https://registry.yarnpkg.com/express/-/express-4.18.2.tgz#def456"
 """
-        (tmp_path / "yarn.lock").write_text(yarn_lock)
-
-        result = scan_source(str(tmp_path), recursive=False)
 
-        # Should include packages from yarn.lock
-        assert "lodash" in result
-        assert "express" in result
-        assert len(result) >= 2
-
-    def test_scan_with_bun_lock(self, tmp_path):
-        """Test scanning with bun.lock present."""
-        # Create package.json
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            }
-        }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
-
-        # Create bun.lock
-        bun_lock = """{
+_BUN_LOCK = """{
   "lockfileVersion": 6,
   "packages": {
     "": {
@@ -116,132 +72,155 @@ express@^4.18.0:
   }
 }
 """
-        (tmp_path / "bun.lock").write_text(bun_lock)
-
-        result = scan_source(str(tmp_path), recursive=False)
-
-        # Should include packages from bun.lock
-        assert "lodash" in result
-        assert "express" in result
-        assert len(result) >= 2
 
-    def test_scan_lockfile_precedence_package_lock_first(self, tmp_path):
-        """Test that package-lock.json takes precedence over yarn.lock."""
-        # Create package.json
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            }
+# package.json with dev dependencies and no lockfile beside it
+_PACKAGE_ONLY_JSON = json.dumps(
+    {
+        "name": "test-package",
+        "version": "1.0.0",
+        "dependencies": {
+            "lodash": "^4.17.0"
+        },
+        "devDependencies": {
+            "jest": "^27.0.0"
         }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
-
-        # Create both lockfiles
-        package_lock = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {"name": "test-package", "version": "1.0.0"},
-                "node_modules/express": {"name": "express", "version": "4.18.2"}
-            }
+    },
+    separators=(",", ":"),
+)
+
+# UTF-8 encodings of the payloads above, computed once for write_bytes
+_PACKAGE_JSON_BYTES = _PACKAGE_JSON.encode("utf-8")
+_PACKAGE_LOCK_JSON_BYTES = _PACKAGE_LOCK_JSON.encode("utf-8")
+_YARN_LOCK_BYTES = _YARN_LOCK.encode("utf-8")
+_BUN_LOCK_BYTES = _BUN_LOCK.encode("utf-8")
+_PACKAGE_ONLY_JSON_BYTES = _PACKAGE_ONLY_JSON.encode("utf-8")
+
+# Precedence scenario: package-lock.json names express, yarn.lock names lodash
+_PRECEDENCE_PACKAGE_LOCK_JSON_BYTES = json.dumps(
+    {
+        "name": "test-package",
+        "version": "1.0.0",
+        "lockfileVersion": 2,
+        "packages": {
+            "": {"name": "test-package", "version": "1.0.0"},
+            "node_modules/express": {"name": "express", "version": "4.18.2"}
         }
-        (tmp_path / "package-lock.json").write_text(json.dumps(package_lock, indent=2))
+    },
+    separators=(",", ":"),
+).encode("utf-8")
 
-        yarn_lock = """# yarn.lock
+_PRECEDENCE_YARN_LOCK_BYTES = b"""# yarn.lock
 lodash@^4.17.0:
   version "4.17.21"
 """
-        (tmp_path / "yarn.lock").write_text(yarn_lock)
 
-        result = scan_source(str(tmp_path), recursive=False)
+
+@pytest.fixture(scope="session")
+def npm_lockfile_dirs(tmp_path_factory, write_tree):
+    """Project directories per lockfile scenario, built once; tests only scan them, never write."""
+    scenarios = {
+        "package_lock": {"package.json": _PACKAGE_JSON_BYTES, "package-lock.json": _PACKAGE_LOCK_JSON_BYTES},
+        "yarn": {"package.json": _PACKAGE_JSON_BYTES, "yarn.lock": _YARN_LOCK_BYTES},
+        "bun": {"package.json": _PACKAGE_JSON_BYTES, "bun.lock": _BUN_LOCK_BYTES},
+        "package_only": {"package.json": _PACKAGE_ONLY_JSON_BYTES},
+        "precedence": {
+            "package.json": _PACKAGE_JSON_BYTES,
+            "package-lock.json": _PRECEDENCE_PACKAGE_LOCK_JSON_BYTES,
+            "yarn.lock": _PRECEDENCE_YARN_LOCK_BYTES,
+        },
+        "invalid_lock": {"package.json": _PACKAGE_JSON_BYTES, "package-lock.json": b"invalid json {"},
+    }
+    return {
+        name: write_tree(tmp_path_factory.mktemp(f"npm_lock_{name}"), files)
+        for name, files in scenarios.items()
+    }
+
+
+@pytest.fixture(scope="module")
+def recursive_npm_tree(tmp_path_factory, write_tree):
+    """Root package.json plus a subdir project with its own lockfile, built once per module."""
+    root_package_json = {
+        "name": "root-package",
+        "version": "1.0.0",
+        "dependencies": {
+            "lodash": "^4.17.0"
+        }
+    }
+    sub_package_json = {
+        "name": "sub-package",
+        "version": "1.0.0",
+        "dependencies": {
+            "express": "^4.18.0"
+        }
+    }
+    sub_package_lock = {
+        "name": "sub-package",
+        "version": "1.0.0",
+        "lockfileVersion": 2,
+        "packages": {
+            "": {"name": "sub-package", "version": "1.0.0"},
+            "node_modules/express": {"name": "express", "version": "4.18.2"},
+            "node_modules/axios": {"name": "axios", "version": "1.0.0"}
+        }
+    }
+    return write_tree(tmp_path_factory.mktemp("rec"), {
+        "package.json": json.dumps(root_package_json, separators=(",", ":")).encode("utf-8"),
+        "subdir/package.json": json.dumps(sub_package_json, separators=(",", ":")).encode("utf-8"),
+        "subdir/package-lock.json": json.dumps(sub_package_lock, separators=(",", ":")).encode("utf-8"),
+    })
+
+
+@pytest.fixture(scope="session")
+def empty_dir(tmp_path_factory):
+    """Directory with no package.json, created once; tests must leave it empty."""
+    return tmp_path_factory.mktemp("empty")
+
+
+class TestNpmScanWithLockfiles:
+    """Test npm scanner with lockfile discovery and parsing."""
+
+    @pytest.mark.parametrize(
+        "scenario",
+        ["package_lock", "yarn", "bun"],
+        ids=["package-lock.json", "yarn.lock", "bun.lock"],
+    )
+    def test_scan_with_lockfile(self, npm_lockfile_dirs, scenario):
+        """Test scanning with each supported lockfile present beside package.json."""
+        result = scan_source(str(npm_lockfile_dirs[scenario]), recursive=False)
+
+        # Should include all packages from the lockfile (transitive dependencies)
+        assert "lodash" in result
+        assert "express" in result
+        assert len(result) >= 2
+
+    def test_scan_lockfile_precedence_package_lock_first(self, npm_lockfile_dirs):
+        """Test that package-lock.json takes precedence over yarn.lock."""
+        result = scan_source(str(npm_lockfile_dirs["precedence"]), recursive=False)
 
         # Should use package-lock.json (express), not yarn.lock (lodash)
         assert "express" in result
         # lodash might be in result if package.json is used as fallback, but express should be from lockfile
 
-    def test_scan_fallback_to_package_json(self, tmp_path):
+    def test_scan_fallback_to_package_json(self, npm_lockfile_dirs):
         """Test fallback to package.json when no lockfile present."""
-        # Create package.json only
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            },
-            "devDependencies": {
-                "jest": "^27.0.0"
-            }
-        }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
-
-        result = scan_source(str(tmp_path), recursive=False)
+        result = scan_source(str(npm_lockfile_dirs["package_only"]), recursive=False)
 
         # Should include direct dependencies from package.json
         assert "lodash" in result
         assert "jest" in result
         assert len(result) == 2
 
-    def test_scan_fallback_on_lockfile_parse_failure(self, tmp_path):
+    def test_scan_fallback_on_lockfile_parse_failure(self, npm_lockfile_dirs):
         """Test fallback to package.json when lockfile parsing fails."""
-        # Create package.json
-        package_json = {
-            "name": "test-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            }
-        }
-        (tmp_path / "package.json").write_text(json.dumps(package_json, indent=2))
-
-        # Create invalid package-lock.json
-        (tmp_path / "package-lock.json").write_text("invalid json {")
-
-        result = scan_source(str(tmp_path), recursive=False)
+        result = scan_source(str(npm_lockfile_dirs["invalid_lock"]), recursive=False)
 
         # Should fallback to package.json
         assert "lodash" in result
         assert len(result) == 1
 
-    def test_scan_recursive_with_lockfiles(self, tmp_path):
+    def test_scan_recursive_with_lockfiles(self, recursive_npm_tree):
         """Test recursive scanning with lockfiles in subdirectories."""
-        # Create root package.json
-        root_package_json = {
-            "name": "root-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "lodash": "^4.17.0"
-            }
-        }
-        (tmp_path / "package.json").write_text(json.dumps(root_package_json, indent=2))
-
-        # Create subdirectory with package.json and lockfile
-        subdir = tmp_path / "subdir"
-        subdir.mkdir()
-
-        sub_package_json = {
-            "name": "sub-package",
-            "version": "1.0.0",
-            "dependencies": {
-                "express": "^4.18.0"
-            }
-        }
-        (subdir / "package.json").write_text(json.dumps(sub_package_json, indent=2))
-
-        sub_package_lock = {
-            "name": "sub-package",
-            "version": "1.0.0",
-            "lockfileVersion": 2,
-            "packages": {
-                "": {"name": "sub-package", "version": "1.0.0"},
-                "node_modules/express": {"name": "express", "version": "4.18.2"},
-                "node_modules/axios": {"name": "axios", "version": "1.0.0"}
-            }
-        }
-        (subdir / "package-lock.json").write_text(json.dumps(sub_package_lock, indent=2))
-
-        result = scan_source(str(tmp_path), recursive=True)
+        result = scan_source(str(recursive_npm_tree), recursive=True)
 
         # Should include packages from both directories
         assert "lodash" in result  # From root package.json
@@ -249,9 +228,7 @@ lodash@^4.17.0:
         assert "axios" in result  # From subdir lockfile
         assert len(result) >= 3
 
-    def test_scan_missing_package_json_error(self, tmp_path):
+    def test_scan_missing_package_json_error(self, empty_dir):
         """Test that missing package.json causes error."""
-        # Don't create package.json
-
         with pytest.raises(SystemExit):
-            scan_source(str(tmp_path), recursive=False)
+            scan_source(str(empty_dir), recursive=False)
@@ -1,7 +1,8 @@
 """Tests for NuGet client functionality."""
 
 import json
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 import pytest
 
 from metapackage import MetaPackage
@@ -16,32 +17,70 @@ from registry.nuget.client import (
 )
 from registry.nuget.enrich import _enrich_with_repo
 
+# Network is mocked throughout; ignore warnings rather than collecting them per test
+pytestmark = pytest.mark.filterwarnings("ignore")
+
+# Static response bodies serialized once at import
+_V3_SERVICE_INDEX = json.dumps({
+    "version": "3.0.0",
+    "resources": []
+})
+
+
+# Hand-serialized catalog entry; spliced into the registration envelope without json.dumps
+_CATALOG_ENTRY = (
+    '{"version":"1.0.0","published":"2020-01-01T00:00:00Z",'
+    '"projectUrl":"https://github.com/test/repo",'
+    '"repository":{"url":"https://github.com/test/repo.git"}}'
+)
+
+
+def _v3_reg_response(catalog_entries):
+    """Registration index body with one page holding the pre-serialized *catalog_entries* in order."""
+    leaves = ",".join('{"catalogEntry":' + entry + "}" for entry in catalog_entries)
+    return f'{{"items":[{{"items":[{leaves}]}}]}}'
+
+
+_V3_REG_RESPONSE = _v3_reg_response([_CATALOG_ENTRY])
+
+_V2_RESPONSE = json.dumps({
+    "d": {
+        "results": [
+            {
+                "Id": "TestPackage",
+                "Version": "1.0.0",
+                "Published": "2020-01-01T00:00:00Z",
+                "ProjectUrl": "https://github.com/test/repo",
+                "LicenseUrl": "https://opensource.org/licenses/MIT"
+            }
+        ]
+    }
+})
+
+# monkeypatch target for the HTTP layer used by the NuGet client
+_SAFE_GET = "registry.nuget.client.nuget_pkg.safe_get"
+
+
+def _resp(status, text=""):
+    """Minimal stand-in for an HTTP response: only status_code and text are read."""
+    return SimpleNamespace(status_code=status, text=text)
+
 
 class TestFetchV3ServiceIndex:
     """Test V3 service index fetching."""
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_fetches_service_index_successfully(self, mock_safe_get):
+    def test_fetches_service_index_successfully(self, monkeypatch):
         """Test successful service index fetch."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps({
-            "version": "3.0.0",
-            "resources": []
-        })
-        mock_safe_get.return_value = mock_response
+        monkeypatch.setattr(_SAFE_GET, lambda *args, **kwargs: _resp(200, _V3_SERVICE_INDEX))
 
         result = _fetch_v3_service_index()
 
         assert result is not None
         assert result["version"] == "3.0.0"
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_handles_service_index_failure(self, mock_safe_get):
+    def test_handles_service_index_failure(self, monkeypatch):
         """Test handling of service index fetch failure."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_safe_get.return_value = mock_response
+        monkeypatch.setattr(_SAFE_GET, lambda *args, **kwargs: _resp(404))
 
         result = _fetch_v3_service_index()
 
@@ -96,22 +135,19 @@ class TestFetchRepositorySignaturePolicy:
         ]
     }
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_returns_none_on_system_exit(self, mock_safe_get):
+    def test_returns_none_on_system_exit(self, monkeypatch):
         """SystemExit from safe_get must not propagate — the signal is best-effort."""
-        mock_safe_get.side_effect = SystemExit(1)
+        def exit_get(*args, **kwargs):
+            raise SystemExit(1)
+        monkeypatch.setattr(_SAFE_GET, exit_get)
 
         result = _fetch_repository_signature_policy(self.SERVICE_INDEX_WITH_REPO_SIGS)
 
         assert result is None
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_returns_bool_on_success(self, mock_safe_get):
+    def test_returns_bool_on_success(self, monkeypatch):
         """Happy path: allRepositorySigned is extracted."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps({"allRepositorySigned": True})
-        mock_safe_get.return_value = mock_response
+        monkeypatch.setattr(_SAFE_GET, lambda *args, **kwargs: _resp(200, json.dumps({"allRepositorySigned": True})))
 
         result = _fetch_repository_signature_policy(self.SERVICE_INDEX_WITH_REPO_SIGS)
 
@@ -127,11 +163,17 @@ class TestFetchRepositorySignaturePolicy:
 class TestFetchV3PackageMetadata:
     """Test V3 package metadata fetching."""
 
-    @patch('registry.nuget.client._fetch_v3_service_index')
-    @patch('registry.nuget.client._get_v3_registration_url')
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_fetches_metadata_successfully(self, mock_safe_get, mock_get_url, mock_get_index):
+    @pytest.fixture
+    def v3_mocks(self):
+        """Patch the V3 lookup chain once; yields (safe_get, get_url, get_index)."""
+        with patch('registry.nuget.client.nuget_pkg.safe_get') as mock_safe_get, \
+                patch('registry.nuget.client._get_v3_registration_url') as mock_get_url, \
+                patch('registry.nuget.client._fetch_v3_service_index') as mock_get_index:
+            yield mock_safe_get, mock_get_url, mock_get_index
+
+    def test_fetches_metadata_successfully(self, v3_mocks):
         """Test successful metadata fetch via V3."""
+        mock_safe_get, mock_get_url, mock_get_index = v3_mocks
         mock_get_index.return_value = {
             "resources": [
                 {
@@ -142,27 +184,7 @@ class TestFetchV3PackageMetadata:
         }
         mock_get_url.return_value = "https://api.nuget.org/v3/registration5-gz-semver2/testpackage/index.json"
 
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps({
-            "items": [
-                {
-                    "items": [
-                        {
-                            "catalogEntry": {
-                                "version": "1.0.0",
-                                "published": "2020-01-01T00:00:00Z",
-                                "projectUrl": "https://github.com/test/repo",
-                                "repository": {
-                                    "url": "https://github.com/test/repo.git"
-                                }
-                            }
-                        }
-                    ]
-                }
-            ]
-        })
-        mock_safe_get.return_value = mock_response
+        mock_safe_get.return_value = _resp(200, _V3_REG_RESPONSE)
 
         metadata, api_version = _fetch_v3_package_metadata("TestPackage")
 
@@ -171,10 +193,9 @@ class TestFetchV3PackageMetadata:
         assert metadata["latest_version"] == "1.0.0"
         assert metadata["repositoryUrl"] == "https://github.com/test/repo.git"
 
-    @patch('registry.nuget.client._fetch_v3_service_index')
-    def test_falls_back_to_v2_when_v3_unavailable(self, mock_get_index):
+    def test_falls_back_to_v2_when_v3_unavailable(self, monkeypatch):
         """Test fallback to V2 when V3 is unavailable."""
-        mock_get_index.return_value = None
+        monkeypatch.setattr("registry.nuget.client._fetch_v3_service_index", lambda: None)
 
         metadata, api_version = _fetch_v3_package_metadata("TestPackage")
 
@@ -185,25 +206,9 @@ class TestFetchV3PackageMetadata:
 class TestFetchV2PackageMetadata:
     """Test V2 package metadata fetching."""
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_fetches_metadata_via_v2_json(self, mock_safe_get):
+    def test_fetches_metadata_via_v2_json(self, monkeypatch):
         """Test successful metadata fetch via V2 JSON."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps({
-            "d": {
-                "results": [
-                    {
-                        "Id": "TestPackage",
-                        "Version": "1.0.0",
-                        "Published": "2020-01-01T00:00:00Z",
-                        "ProjectUrl": "https://github.com/test/repo",
-                        "LicenseUrl": "https://opensource.org/licenses/MIT"
-                    }
-                ]
-            }
-        })
-        mock_safe_get.return_value = mock_response
+        monkeypatch.setattr(_SAFE_GET, lambda *args, **kwargs: _resp(200, _V2_RESPONSE))
 
         metadata = _fetch_v2_package_metadata("TestPackage")
 
@@ -211,12 +216,9 @@ class TestFetchV2PackageMetadata:
         assert metadata["latest_version"] == "1.0.0"
         assert metadata["projectUrl"] == "https://github.com/test/repo"
 
-    @patch('registry.nuget.client.nuget_pkg.safe_get')
-    def test_handles_v2_failure(self, mock_safe_get):
+    def test_handles_v2_failure(self, monkeypatch):
         """Test handling of V2 fetch failure."""
-        mock_response = MagicMock()
-        mock_response.status_code = 404
-        mock_safe_get.return_value = mock_response
+        monkeypatch.setattr(_SAFE_GET, lambda *args, **kwargs: _resp(404))
 
         metadata = _fetch_v2_package_metadata("TestPackage")
 
@@ -264,10 +266,17 @@ class TestNormalizeMetadata:
 class TestRecvPkgInfo:
     """Test recv_pkg_info function."""
 
-    @patch('registry.nuget.client._fetch_v3_package_metadata')
-    @patch('registry.nuget.client._enrich_with_repo')
-    def test_processes_packages_successfully(self, mock_enrich, mock_fetch):
+    @pytest.fixture
+    def recv_mocks(self):
+        """Patch metadata fetches and enrichment; yields (fetch_v3, fetch_v2, enrich)."""
+        with patch('registry.nuget.client._fetch_v3_package_metadata') as mock_fetch_v3, \
+                patch('registry.nuget.client._fetch_v2_package_metadata') as mock_fetch_v2, \
+                patch('registry.nuget.client._enrich_with_repo') as mock_enrich:
+            yield mock_fetch_v3, mock_fetch_v2, mock_enrich
+
+    def test_processes_packages_successfully(self, recv_mocks, nuget_pkg):
         """Test successful package processing."""
+        mock_fetch, _, mock_enrich = recv_mocks
         mock_fetch.return_value = ({
             "id": "TestPackage",
             "versions": ["1.0.0"],
@@ -280,17 +289,15 @@ class TestRecvPkgInfo:
             "api_version": "v3"
         }, "v3")
 
-        pkg = MetaPackage("TestPackage", "nuget")
-        recv_pkg_info([pkg])
+        recv_pkg_info([nuget_pkg])
 
-        assert pkg.exists is True
-        assert pkg.version_count == 1
+        assert nuget_pkg.exists is True
+        assert nuget_pkg.version_count == 1
         mock_enrich.assert_called_once()
 
-    @patch('registry.nuget.client._fetch_v3_package_metadata')
-    @patch('registry.nuget.client._fetch_v2_package_metadata')
-    def test_falls_back_to_v2(self, mock_fetch_v2, mock_fetch_v3):
+    def test_falls_back_to_v2(self, recv_mocks, nuget_pkg):
         """Test fallback to V2 when V3 fails."""
+        mock_fetch_v3, mock_fetch_v2, _ = recv_mocks
         mock_fetch_v3.return_value = (None, "v2")
         mock_fetch_v2.return_value = {
             "id": "TestPackage",
@@ -303,16 +310,14 @@ class TestRecvPkgInfo:
             "license": None
         }
 
-        pkg = MetaPackage("TestPackage", "nuget")
-        recv_pkg_info([pkg])
+        recv_pkg_info([nuget_pkg])
 
-        assert pkg.exists is True
+        assert nuget_pkg.exists is True
         mock_fetch_v2.assert_called_once()
 
-    @patch('registry.nuget.client._fetch_v3_package_metadata')
-    @patch('registry.nuget.client._fetch_v2_package_metadata')
-    def test_handles_package_not_found(self, mock_fetch_v2, mock_fetch_v3):
+    def test_handles_package_not_found(self, recv_mocks):
         """Test handling when package is not found."""
+        mock_fetch_v3, mock_fetch_v2, _ = recv_mocks
         mock_fetch_v3.return_value = (None, "v2")
         mock_fetch_v2.return_value = None
 
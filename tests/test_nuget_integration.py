@@ -8,7 +8,26 @@ from registry.nuget import recv_pkg_info, scan_source
 from cli_registry import check_against, scan_source as cli_scan_source
 from constants import PackageManagers
 
+# Network is mocked throughout; ignore warnings rather than collecting them per test
+pytestmark = pytest.mark.filterwarnings("ignore")
 
+_V3_METADATA = {
+    "id": "TestPackage",
+    "versions": ["1.0.0"],
+    "latest_version": "1.0.0",
+    "published": "2020-01-01T00:00:00Z",
+    "api_version": "v3"
+}
+
+_V2_METADATA = {
+    "id": "TestPackage",
+    "versions": ["1.0.0"],
+    "latest_version": "1.0.0",
+    "published": "2020-01-01T00:00:00Z"
+}
+
+
+@pytest.mark.integration
 class TestNuGetIntegration:
     """Integration tests for NuGet functionality."""
 
@@ -44,42 +63,23 @@ class TestNuGetIntegration:
         assert hasattr(PackageManagers, 'NUGET')
         assert PackageManagers.NUGET.value == "nuget"
 
+    @pytest.mark.parametrize(
+        "v3_result,v2_result,expect_v2",
+        [
+            ((_V3_METADATA, "v3"), None, False),  # V3 succeeds, no fallback
+            ((None, "v2"), _V2_METADATA, True),  # V3 fails, V2 succeeds
+        ],
+        ids=["v3_primary", "v2_fallback"],
+    )
     @patch('registry.nuget.client._fetch_v3_package_metadata')
     @patch('registry.nuget.client._fetch_v2_package_metadata')
-    def test_v3_primary_v2_fallback(self, mock_v2, mock_v3):
-        """Test V3 primary with V2 fallback."""
-        # V3 succeeds
-        mock_v3.return_value = ({
-            "id": "TestPackage",
-            "versions": ["1.0.0"],
-            "latest_version": "1.0.0",
-            "published": "2020-01-01T00:00:00Z",
-            "api_version": "v3"
-        }, "v3")
-
-        pkg = MetaPackage("TestPackage", "nuget")
-        recv_pkg_info([pkg])
-
-        assert pkg.exists is True
-        mock_v3.assert_called_once()
-        mock_v2.assert_not_called()  # Should not fallback when V3 succeeds
-
-    @patch('registry.nuget.client._fetch_v3_package_metadata')
-    @patch('registry.nuget.client._fetch_v2_package_metadata')
-    def test_v2_fallback_when_v3_fails(self, mock_v2, mock_v3):
-        """Test V2 fallback when V3 fails."""
-        # V3 fails, V2 succeeds
-        mock_v3.return_value = (None, "v2")
-        mock_v2.return_value = {
-            "id": "TestPackage",
-            "versions": ["1.0.0"],
-            "latest_version": "1.0.0",
-            "published": "2020-01-01T00:00:00Z"
-        }
+    def test_v3_primary_v2_fallback(self, mock_v2, mock_v3, v3_result, v2_result, expect_v2, nuget_pkg):
+        """Test V3 primary with V2 fallback only when V3 yields nothing."""
+        mock_v3.return_value = v3_result
+        mock_v2.return_value = v2_result
 
-        pkg = MetaPackage("TestPackage", "nuget")
-        recv_pkg_info([pkg])
+        recv_pkg_info([nuget_pkg])
 
-        assert pkg.exists is True
+        assert nuget_pkg.exists is True
         mock_v3.assert_called_once()
-        mock_v2.assert_called_once()  # Should fallback to V2
+        assert mock_v2.called == expect_v2
@@ -94,6 +94,224 @@ def test_nuget_scan_recursive():
         assert "Serilog" in deps
 
 
+def test_nuget_scan_recursive_parallel_parse():
+    """Trees above the thread-pool threshold yield the same union of package ids."""
+    from registry.nuget import scan as nuget_scan
+
+    count = nuget_scan._PARALLEL_PARSE_MIN_FILES + 2
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(count):
+            project_dir = os.path.join(tmpdir, f"Project{i}")
+            os.makedirs(project_dir)
+            with open(os.path.join(project_dir, f"Project{i}.csproj"), "w") as f:
+                f.write(
+                    '<Project><ItemGroup>'
+                    f'<PackageReference Include="Package.{i}" />'
+                    '<PackageReference Include="Shared.Package" />'
+                    '</ItemGroup></Project>'
+                )
+
+        deps = nuget_scan_source(tmpdir, recursive=True, direct_only=False, require_lockfile=False)
+        assert sorted(deps) == sorted([f"Package.{i}" for i in range(count)] + ["Shared.Package"])
+
+
+@pytest.mark.parametrize("use_lxml", [True, False], ids=["lxml", "stdlib"])
+def test_nuget_xml_parser_backends_agree(tmp_path, monkeypatch, use_lxml):
+    """Test that the optional lxml parser and the ElementTree fallback yield the same ids."""
+    import common.file_parsing as file_parsing
+    from registry.nuget import scan as nuget_scan
+
+    if use_lxml:
+        pytest.importorskip("lxml")
+    else:
+        monkeypatch.setattr(file_parsing, "_lxml_etree", None)
+
+    csproj = tmp_path / "App.csproj"
+    csproj.write_bytes(b"""<?xml version="1.0" encoding="utf-8"?>
+<Project xmlns="http://schemas.microsoft.com/developer/msbuild/2003">
+  <ItemGroup>
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.1" />
+    <PackageReference Include="" Version="1.0.0" />
+    <Reference Include="System.Xml" />
+  </ItemGroup>
+  <ItemGroup>
+    <PackageReference Include="Serilog" Version="3.0.0" />
+  </ItemGroup>
+</Project>
+""")
+    assert nuget_scan._parse_csproj(str(csproj)) == ["Newtonsoft.Json", "Serilog"]
+
+    broken = tmp_path / "Broken.csproj"
+    broken.write_bytes(b'<Project><PackageReference Include="Newtonsoft.Json" /><Invalid XML>')
+    assert nuget_scan._parse_csproj(str(broken)) == []
+
+
+def test_nuget_xml_manifest_without_references_skips_parser(tmp_path, monkeypatch):
+    """Test that manifests never mentioning the element are answered without the XML parser."""
+    from registry.nuget import scan as nuget_scan
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("XML parser should not run")
+
+    props = tmp_path / "Directory.Build.props"
+    props.write_bytes(b"<Project><PropertyGroup><LangVersion>latest</LangVersion></PropertyGroup></Project>")
+    config = tmp_path / "packages.config"
+    config.write_bytes(b"<packages></packages>")
+    monkeypatch.setattr(nuget_scan, "_iter_xml_attr", fail_parse)
+
+    assert nuget_scan._parse_directory_build_props(str(props)) == []
+    assert nuget_scan._parse_packages_config(str(config)) == []
+
+
+def test_nuget_xml_manifest_mmap_path(tmp_path, monkeypatch):
+    """Test that manifests above the mmap threshold parse the same as small ones."""
+    from registry.nuget import scan as nuget_scan
+
+    monkeypatch.setattr(nuget_scan, "_MMAP_MIN_BYTES", 1)
+    csproj = tmp_path / "App.csproj"
+    csproj.write_bytes(b'<Project><ItemGroup><PackageReference Include="Serilog" /></ItemGroup></Project>')
+    props = tmp_path / "Directory.Build.props"
+    props.write_bytes(b"<Project><PropertyGroup /></Project>")
+    broken = tmp_path / "Broken.csproj"
+    broken.write_bytes(b'<Project><PackageReference Include="Serilog" /><Invalid XML>')
+
+    assert nuget_scan._parse_csproj(str(csproj)) == ["Serilog"]
+    assert nuget_scan._parse_directory_build_props(str(props)) == []
+    assert nuget_scan._parse_csproj(str(broken)) == []
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-16-be", "utf-16-le", "utf-32", "utf-32-be"])
+@pytest.mark.parametrize("mmap_min_bytes", [64 * 1024, 1], ids=["read", "mmap"])
+@pytest.mark.parametrize("use_lxml", [True, False], ids=["lxml", "stdlib"])
+def test_nuget_xml_manifest_non_ascii_encoding_is_parsed(tmp_path, monkeypatch, encoding, mmap_min_bytes, use_lxml):
+    """Test that UTF-16/UTF-32 manifests are transcoded and parsed by either XML backend."""
+    import common.file_parsing as file_parsing
+    from registry.nuget import scan as nuget_scan
+
+    if use_lxml:
+        pytest.importorskip("lxml")
+    else:
+        monkeypatch.setattr(file_parsing, "_lxml_etree", None)
+    monkeypatch.setattr(nuget_scan, "_MMAP_MIN_BYTES", mmap_min_bytes)
+    csproj = tmp_path / "App.csproj"
+    text = (
+        f'<?xml version="1.0" encoding="{encoding}"?>\n'
+        '<Project><ItemGroup><PackageReference Include="Newtonsoft.Json" /></ItemGroup></Project>'
+    )
+    data = text.encode(encoding)
+    csproj.write_bytes(data)
+
+    assert nuget_scan._parse_csproj(str(csproj)) == ["Newtonsoft.Json"]
+
+
+def test_nuget_xml_manifest_invalid_utf16_is_skipped(tmp_path):
+    """Test that a manifest that is not valid in its detected encoding is logged and skipped."""
+    from registry.nuget.scan import _parse_csproj
+
+    csproj = tmp_path / "App.csproj"
+    # UTF-16 BOM followed by an unpaired high surrogate
+    csproj.write_bytes(b"\xff\xfe<\x00\x00\xd8")
+
+    assert _parse_csproj(str(csproj)) == []
+
+
+def test_nuget_xml_manifest_ignores_commented_references(tmp_path):
+    """Test that references inside XML comments are not reported."""
+    from registry.nuget.scan import _parse_csproj
+
+    csproj = tmp_path / "App.csproj"
+    csproj.write_bytes(b"""<Project>
+  <ItemGroup>
+    <!-- <PackageReference Include="Old.Package" Version="1.0.0" /> -->
+    <PackageReference Include="Newtonsoft.Json" Version="13.0.1" />
+  </ItemGroup>
+</Project>
+""")
+    assert _parse_csproj(str(csproj)) == ["Newtonsoft.Json"]
+
+
+def test_nuget_manifest_parse_cached_until_file_changes(tmp_path, monkeypatch):
+    """Test that unchanged manifests reuse cached ids and edited manifests are re-parsed."""
+    from registry.nuget import scan as nuget_scan
+
+    calls = []
+    real_iter = nuget_scan._iter_xml_attr
+    monkeypatch.setattr(nuget_scan, "_iter_xml_attr", lambda *args: calls.append(1) or real_iter(*args))
+
+    config = tmp_path / "packages.config"
+    config.write_bytes(b'<packages><package id="Newtonsoft.Json" version="13.0.1" /></packages>')
+    st = config.stat()
+    assert nuget_scan._parse_packages_config(str(config)) == ["Newtonsoft.Json"]
+    assert nuget_scan._parse_packages_config(str(config)) == ["Newtonsoft.Json"]
+    assert len(calls) == 1
+
+    config.write_bytes(b'<packages><package id="Serilog" version="3.0.0" /></packages>')
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert nuget_scan._parse_packages_config(str(config)) == ["Serilog"]
+    assert len(calls) == 2
+
+
+def test_nuget_manifest_parse_failures_are_not_cached(tmp_path, caplog):
+    """Test a broken manifest is reported on every scan, not only the first."""
+    from registry.nuget.scan import _parse_csproj
+
+    broken = tmp_path / "Broken.csproj"
+    broken.write_bytes(b'<Project><PackageReference Include="Serilog" /><Invalid XML>')
+
+    with caplog.at_level(logging.WARNING, logger="registry.nuget.scan"):
+        assert _parse_csproj(str(broken)) == []
+        assert _parse_csproj(str(broken)) == []
+
+    assert sum("Couldn't parse .csproj file" in r.getMessage() for r in caplog.records) == 2
+
+
+def test_nuget_scan_ids_are_interned(tmp_path):
+    """Test the same package id declared by two projects is one shared string object."""
+    from registry.nuget.scan import _parse_packages_config
+
+    ids = []
+    for project in ("a", "b"):
+        config = tmp_path / project / "packages.config"
+        config.parent.mkdir()
+        config.write_bytes(b'<packages><package id="Newtonsoft.Json" version="13.0.1" /></packages>')
+        ids.append(_parse_packages_config(str(config))[0])
+
+    assert ids[0] == "Newtonsoft.Json"
+    assert ids[0] is ids[1]
+
+
+def test_nuget_scan_recursive_skips_hidden_directories():
+    """Manifests under dot-directories are not scanned, matching the former glob patterns."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "packages.config"), "w") as f:
+            f.write('<packages><package id="Visible.Package" version="1.0.0" /></packages>')
+        hidden = os.path.join(tmpdir, ".cache")
+        os.makedirs(hidden)
+        with open(os.path.join(hidden, "packages.config"), "w") as f:
+            f.write('<packages><package id="Hidden.Package" version="1.0.0" /></packages>')
+
+        deps = nuget_scan_source(tmpdir, recursive=True, direct_only=False, require_lockfile=False)
+        assert deps == ["Visible.Package"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink") or sys.platform == "win32", reason="needs POSIX symlinks")
+def test_nuget_scan_recursive_follows_directory_symlinks(tmp_path):
+    """Symlinked directories are descended into like glob's "**", and link loops terminate."""
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "packages.config").write_text('<packages><package id="Linked.Package" version="1.0.0" /></packages>')
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "packages.config").write_text('<packages><package id="Root.Package" version="1.0.0" /></packages>')
+    os.symlink(shared, root / "linked")
+    # A directory link named like a manifest is a directory, not a file to parse
+    os.symlink(shared, root / "Directory.Build.props")
+    os.symlink(root, root / "loop")
+
+    deps = nuget_scan_source(str(root), recursive=True, direct_only=False, require_lockfile=False)
+    assert sorted(deps) == ["Linked.Package", "Root.Package"]
+
+
 def test_nuget_scan_recursive_require_lockfile():
     """Test recursive scanning with require_lockfile."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -127,6 +345,22 @@ def test_nuget_scan_recursive_require_lockfile():
         assert "Serilog" in deps
 
 
+def test_nuget_scan_recursive_require_lockfile_in_hidden_directory():
+    """The lockfile counts under a hidden directory; manifests there are still ignored."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "packages.config"), "w") as f:
+            f.write('<packages><package id="Visible.Package" version="1.0.0" /></packages>')
+        hidden = os.path.join(tmpdir, ".build")
+        os.makedirs(hidden)
+        with open(os.path.join(hidden, "packages.lock.json"), "w") as f:
+            f.write('{"version": 1, "dependencies": {}}')
+        with open(os.path.join(hidden, "packages.config"), "w") as f:
+            f.write('<packages><package id="Hidden.Package" version="1.0.0" /></packages>')
+
+        deps = nuget_scan_source(tmpdir, recursive=True, direct_only=False, require_lockfile=True)
+        assert deps == ["Visible.Package"]
+
+
 def test_nuget_scan_no_files_found():
     """Test error when no NuGet files are found."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -148,6 +382,16 @@ def test_nuget_scan_invalid_csproj():
         assert deps == []
 
 
+def test_nuget_scan_truncated_csproj_drops_partial_references():
+    """A parse error after valid references discards the whole file, as a DOM parse did."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "truncated.csproj"), "w") as f:
+            f.write('<Project><ItemGroup><PackageReference Include="Newtonsoft.Json" /><Invalid XML>')
+
+        deps = nuget_scan_source(tmpdir, recursive=False, direct_only=False, require_lockfile=False)
+        assert deps == []
+
+
 def test_nuget_scan_invalid_packages_config():
     """Test handling of invalid packages.config files."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -172,6 +416,28 @@ def test_nuget_scan_invalid_project_json():
         assert deps == []
 
 
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_nuget_project_json_decoders_agree(tmp_path, monkeypatch, use_orjson):
+    """Test that the optional orjson decoder and json.loads yield the same dependency names."""
+    import common.file_parsing as file_parsing
+    from registry.nuget import scan as nuget_scan
+
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(file_parsing, "_orjson", None)
+        monkeypatch.setattr(file_parsing, "_jiter", None)
+
+    project_json = tmp_path / "project.json"
+    project_json.write_bytes(
+        b'{"dependencies": {"Newtonsoft.Json": "9.0.1", "System.Net.Http": {"version": "4.3.0"}}}'
+    )
+    assert nuget_scan._parse_project_json(str(project_json)) == ["Newtonsoft.Json", "System.Net.Http"]
+
+    project_json.write_bytes(b"{ invalid json }")
+    assert nuget_scan._parse_project_json(str(project_json)) == []
+
+
 def test_nuget_scan_project_json_no_dependencies():
     """Test project.json without dependencies key."""
     with tempfile.TemporaryDirectory() as tmpdir:
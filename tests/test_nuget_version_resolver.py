@@ -152,6 +152,79 @@ class TestNuGetVersionResolver:
         assert count == 2
         assert error is None
 
+    @patch('src.versioning.resolvers.nuget.get_json')
+    def test_v3_service_index_fetched_once(self, mock_get_json, resolver):
+        """Test that the service index is cached across packages resolved with one cache."""
+        service_index = (200, {}, {
+            "resources": [
+                {
+                    "@id": "https://api.nuget.org/v3/registration5-gz-semver2/",
+                    "@type": "RegistrationsBaseUrl/3.6.0"
+                }
+            ]
+        })
+        mock_get_json.side_effect = [
+            service_index,
+            (200, {}, {"items": [{"items": [{"catalogEntry": {"version": "1.0.0"}}]}]}),
+            (200, {}, {"items": [{"items": [{"catalogEntry": {"version": "2.0.0"}}]}]}),
+        ]
+
+        assert resolver.fetch_candidates(create_request("PackageA")) == ["1.0.0"]
+        assert resolver.fetch_candidates(create_request("PackageB")) == ["2.0.0"]
+
+        urls = [call.args[0] for call in mock_get_json.call_args_list]
+        assert len(urls) == 3
+        assert urls[1].endswith("/packagea/index.json")
+        assert urls[2].endswith("/packageb/index.json")
+
+    @patch('src.versioning.resolvers.nuget.get_json')
+    def test_v3_registration_pages_fetched_by_reference(self, mock_get_json, resolver):
+        """Test that non-inlined registration pages are fetched and merged in order."""
+        page_url = "https://api.nuget.org/v3/registration5-gz-semver2/bigpackage/page/2.0.0/3.0.0.json"
+        mock_get_json.side_effect = [
+            (200, {}, {
+                "resources": [
+                    {
+                        "@id": "https://api.nuget.org/v3/registration5-gz-semver2/",
+                        "@type": "RegistrationsBaseUrl/3.6.0"
+                    }
+                ]
+            }),
+            (200, {}, {
+                "items": [
+                    {"items": [{"catalogEntry": {"version": "1.0.0"}}]},
+                    {"@id": page_url, "lower": "2.0.0", "upper": "3.0.0"},
+                ]
+            }),
+            (200, {}, {
+                "items": [
+                    {"catalogEntry": {"version": "2.0.0"}},
+                    {"catalogEntry": {"version": "3.0.0"}},
+                ]
+            }),
+        ]
+
+        candidates = resolver.fetch_candidates(create_request("BigPackage"))
+
+        assert candidates == ["1.0.0", "2.0.0", "3.0.0"]
+        assert mock_get_json.call_args_list[2].args[0] == page_url
+
+    @patch('src.versioning.resolvers.nuget.get_json')
+    def test_requests_share_one_session(self, mock_get_json, resolver):
+        """Test that every registry request goes through the module's pooled session."""
+        from src.versioning.resolvers import nuget as nuget_resolver
+
+        mock_get_json.side_effect = [
+            (404, {}, None),  # V3 service index fails
+            (200, {}, {"d": {"results": [{"Version": "1.0.0"}]}}),
+        ]
+
+        resolver.fetch_candidates(create_request("TestPackage"))
+
+        assert mock_get_json.call_count == 2
+        for call in mock_get_json.call_args_list:
+            assert call.kwargs["session"] is nuget_resolver._SESSION
+
     def test_pick_latest_excludes_prerelease(self, resolver):
         """Test that latest mode excludes prerelease versions."""
         candidates = ["1.0.0", "1.1.0-beta", "2.0.0", "2.1.0-alpha"]
@@ -191,6 +264,40 @@ class TestNuGetVersionResolver:
         assert count == 4
         assert error is None
 
+    def test_pick_range_unsorted_candidates_parsed_once(self, resolver):
+        """Range picks over unsorted candidates reuse one parsed, sorted view."""
+        from src.versioning.resolvers import nuget as nuget_resolver
+
+        nuget_resolver._sorted_versions.cache_clear()
+        candidates = ["1.2.0", "2.0.0", "not-a-version", "1.0.0", "1.3.0-rc.1", "1.1.0"]
+        for spec, expected in ((None, "2.0.0"), ("^1.0.0", "1.2.0"), ("<1.2.0", "1.1.0")):
+            version, count, error = resolver.pick(create_request("TestPackage", spec), candidates)
+            assert (version, count, error) == (expected, 6, None)
+
+        info = nuget_resolver._sorted_versions.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_version_key_orders_like_semantic_version(self):
+        """The tuple sort key agrees with semantic_version on order and validity."""
+        import semantic_version
+
+        from src.versioning.resolvers import nuget as nuget_resolver
+
+        candidates = [
+            "1.0.0", "1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta.2",
+            "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0-1", "1.0.0+build.5", "10.0.0", "2.0.0",
+            "1.0", "1.0.0.0", "01.0.0", "1.0.0-01", "1.0.0-a..b", "v1.0.0",
+        ]
+        valid = []
+        for v in candidates:
+            try:
+                valid.append(semantic_version.Version(v))
+            except ValueError:
+                assert nuget_resolver._version_key(v) is None
+        expected = [str(ver) for ver in sorted(valid, reverse=True)]
+
+        assert list(nuget_resolver._sorted_versions(tuple(candidates))) == expected
+
     def test_no_candidates(self, resolver):
         """Test handling when no candidates are available."""
         req = create_request("TestPackage")
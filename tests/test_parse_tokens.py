@@ -162,3 +162,17 @@ class TestParseManifestEntry:
     def test_manifest_none_spec(self):
         req = parse_manifest_entry("package", None, Ecosystem.PYPI, "manifest")
         assert req.requested_spec is None
+
+
+class TestLoadPyproject:
+    """Test the cached pyproject.toml loader."""
+
+    def test_callers_get_independent_copies(self, tmp_path):
+        from src.versioning.parser import _load_pyproject, parse_pyproject_tools
+
+        manifest = tmp_path / "pyproject.toml"
+        manifest.write_text('[project]\nname = "demo"\n\n[tool.uv]\ndev-dependencies = []\n', encoding="utf-8")
+        data = _load_pyproject(str(manifest))
+        data["tool"].clear()
+        assert _load_pyproject(str(manifest))["tool"] == {"uv": {"dev-dependencies": []}}
+        assert parse_pyproject_tools(str(manifest))["tool_uv"] is True